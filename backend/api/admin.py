@@ -1,7 +1,10 @@
 from django.contrib import admin
-from .models import Participant, Receipt, ReceiptInfo, Settlement
+from .models import Participant, Receipt, ReceiptInfo, Settlement, AnalyzeJob, OcrCacheEntry, DictionaryChange
 
 admin.site.register(Participant)
 admin.site.register(Receipt)
 admin.site.register(ReceiptInfo)
-admin.site.register(Settlement)
\ No newline at end of file
+admin.site.register(Settlement)
+admin.site.register(AnalyzeJob)
+admin.site.register(OcrCacheEntry)
+admin.site.register(DictionaryChange)
@@ -0,0 +1,286 @@
+import os
+import threading
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .models import Receipt, ReceiptInfo, AnalyzeJob
+from .serializers import ReceiptInfoSerializer
+from . import ocr_cache, store_dictionary
+from api.ocr_pipeline.analyze import iter_analyze_images, pipeline_version
+
+def _mark_receipt(receipt, analysis_status, version):
+    receipt.analysis_status = analysis_status
+    receipt.analyzed_at = timezone.now()
+    receipt.pipeline_version = version
+    receipt.save(update_fields=['analysis_status', 'analyzed_at', 'pipeline_version'])
+
+def _build_items(receipt, store_name, items):
+    """
+    추출된 품목들을 저장 전 ReceiptInfo 객체로 만들고 모델 필드 기준으로 검증합니다.
+    영수증은 이미 가지고 있으므로 외래키 존재 확인 쿼리 없이 메모리에서만 검증합니다.
+    """
+    rows = []
+    for item in items:
+        row = ReceiptInfo(
+            receipt=receipt,
+            store_name=store_name,
+            item_name=item["item_name"].strip(),  # 품목 이름 양쪽 공백 제거
+            quantity=item["quantity"],
+            unit_price=item["unit_price"],
+            total_amount=item["total_amount"],
+        )
+        row.full_clean(exclude=['receipt'], validate_unique=False, validate_constraints=False)
+        rows.append(row)
+    return rows
+
+def _save_items(receipt, rows):
+    """영수증 하나의 품목을 bulk_create 한 번으로 저장하고, 응답에 쓸 id를 채웁니다."""
+    if not rows:
+        return
+    ReceiptInfo.objects.bulk_create(rows)
+    if rows[0].pk is None:
+        # MySQL은 bulk_create로 생성된 id를 돌려주지 않으므로 영수증 단위로 한 번 조회
+        # (분석 전 이전 품목을 삭제하므로 영수증의 품목은 방금 저장한 행들이며, id 순서가 저장 순서와 같음)
+        ids = ReceiptInfo.objects.filter(receipt=receipt).order_by('id').values_list('id', flat=True)
+        for row, pk in zip(rows, ids):
+            row.pk = pk
+
+def run_receipt_analysis(receipts, on_progress=None, force=False, sources=None):
+    """
+    영수증들을 OCR 분석하여 추출된 품목을 ReceiptInfo로 저장하고,
+    직렬화된 품목 리스트(이미 분석된 영수증의 저장된 품목 포함)를 영수증 순서대로 반환합니다.
+
+    기본적으로 분석 전/실패 상태이거나 파이프라인 버전이 바뀐 영수증만 다시 분석하며,
+    force=True이면 모든 영수증을 다시 분석합니다.
+    sources({receipt_id: 이미지 바이트})가 주어지면 해당 영수증은 파일 대신 메모리의 이미지를 분석합니다.
+    on_progress(receipt, status, item_count)는 영수증 하나의 처리가 끝날 때마다 호출됩니다.
+    """
+    receipts = list(receipts)
+    sources = sources or {}
+    use_cache = ocr_cache.is_enabled()
+    # 다른 프로세스가 관리 API로 바꾼 가게/메뉴 사전 반영 (파이프라인 버전에 리비전이 포함됨)
+    store_dictionary.sync()
+    version = pipeline_version(settings.OCR_STORE_HEADER_LINES, settings.OCR_DETECT_WIDTH)
+
+    stale = [
+        receipt for receipt in receipts
+        if force or receipt.analysis_status != 'done' or receipt.pipeline_version != version
+    ]
+    stale_ids = {receipt.id for receipt in stale}
+
+    # 이미 분석된 영수증은 저장된 품목을 그대로 사용
+    items_by_receipt = {receipt.id: [] for receipt in receipts}
+    stored = ReceiptInfo.objects.filter(
+        receipt__in=[receipt for receipt in receipts if receipt.id not in stale_ids]
+    ).order_by('id')
+    for data in ReceiptInfoSerializer(stored, many=True).data:
+        items_by_receipt[data['receipt']].append(data)
+    for receipt in receipts:
+        if receipt.id not in stale_ids and on_progress:
+            on_progress(receipt, 'done', len(items_by_receipt[receipt.id]))
+
+    # 다시 분석할 영수증의 이전 분석 결과 삭제
+    ReceiptInfo.objects.filter(receipt__in=stale).delete()
+
+    # 이미지 파일이 있는 영수증만 분석
+    targets = []
+    for receipt in stale:
+        image_path = os.path.join(settings.MEDIA_ROOT, receipt.image_path)
+        if receipt.id in sources:
+            # 업로드 직후 메모리에 있는 이미지를 그대로 사용 (파일 재읽기 생략)
+            source = sources[receipt.id]
+            digest = ocr_cache.bytes_digest(source) if use_cache else None
+        elif os.path.exists(image_path):
+            source = image_path
+            digest = ocr_cache.file_digest(image_path) if use_cache else None
+        else:
+            # 이미지 파일이 없으면 건너뜀
+            _mark_receipt(receipt, 'failed', version)
+            if on_progress:
+                on_progress(receipt, 'skipped', 0)
+            continue
+        print(f"🔎 [{receipt.id}] 이미지 처리 시작: {image_path}")
+        targets.append((receipt, image_path, source, digest))
+
+    # 캐시에 없는 이미지만 OCR 대상 (같은 이미지가 여러 번 업로드되면 한 번만 처리)
+    cached = ocr_cache.lookup(digest for _, _, _, digest in targets) if use_cache else {}
+    if use_cache and targets:
+        stats = ocr_cache.get_stats()
+        print(f"♻️ OCR 캐시 적중 {stats['hits']}회 / 미스 {stats['misses']}회 (적중률 {stats['hit_rate']:.0%}, 프로세스 누적)")
+    pending_sources = {}
+    for _, image_path, source, digest in targets:
+        key = digest or image_path
+        if key not in cached and key not in pending_sources:
+            pending_sources[key] = source
+
+    # 1~4. 전처리 → OCR → 후처리 → 품목 추출 (OCR_MAX_WORKERS > 1이면 병렬 처리)
+    fresh_results = zip(
+        pending_sources.keys(),
+        iter_analyze_images(
+            pending_sources.values(),
+            max_workers=settings.OCR_MAX_WORKERS,
+            images_per_batch=settings.OCR_IMAGES_PER_BATCH,
+            batch_size=settings.OCR_BATCH_SIZE,
+            header_lines=settings.OCR_STORE_HEADER_LINES,
+            detect_width=settings.OCR_DETECT_WIDTH,
+        ),
+    )
+    analyzed = {}
+    stored_new = False
+
+    for receipt, image_path, _, digest in targets:
+        key = digest or image_path
+        if key in cached:
+            result = ocr_cache.cached_result(cached[key])
+            ocr_succeeded = True
+            print(f"♻️ [{receipt.id}] OCR 캐시 사용")
+        else:
+            # 결과는 pending_sources 순서대로 나오므로 필요한 키가 나올 때까지 받아 둠
+            while key not in analyzed:
+                fresh_key, fresh = next(fresh_results)
+                analyzed[fresh_key] = fresh
+                # OCR 실패(빈 결과)는 캐시하지 않음
+                if use_cache and fresh.get('lines'):
+                    ocr_cache.store(fresh_key, fresh.get('lines', []), {
+                        'store_name': fresh.get('store_name'),
+                        'items': fresh.get('items') or [],
+                    })
+                    stored_new = True
+            result = analyzed[key]
+            ocr_succeeded = bool(result.get('lines'))
+
+        # 5. 가게명/품목 저장 (영수증별로 한 번에 INSERT)
+        store_name = result.get("store_name", "")
+        items = result.get("items") or []  # None이면 빈 리스트로 대체
+        rows = _build_items(receipt, store_name, items)
+
+        with transaction.atomic():
+            _save_items(receipt, rows)
+            # OCR이 실패한 영수증은 다음 분석 때 다시 시도
+            _mark_receipt(receipt, 'done' if ocr_succeeded else 'failed', version)
+        items_by_receipt[receipt.id].extend(ReceiptInfoSerializer(rows, many=True).data)
+        if on_progress:
+            on_progress(receipt, 'done', len(items))
+
+    # 새 항목을 저장했을 때만 최대 개수 확인 (캐시만 사용한 분석에서는 항목 수가 늘지 않음)
+    if stored_new:
+        ocr_cache.evict()
+
+    return [item for receipt in receipts for item in items_by_receipt[receipt.id]]
+
+def claim_next_job(timeout=None, max_attempts=None):
+    """
+    대기 중인 분석 작업 하나를 running 상태로 바꾸고 반환합니다.
+    조건부 UPDATE로 선점하므로 여러 워커가 동시에 실행돼도 같은 작업을 중복 처리하지 않습니다.
+
+    running 상태지만 timeout초(기본값: ANALYZE_JOB_TIMEOUT) 넘게 진행 기록(heartbeat_at)이 없는 작업은
+    워커가 죽은 것으로 보고 다시 가져갑니다. 이미 max_attempts번(기본값: ANALYZE_JOB_MAX_ATTEMPTS) 가져간
+    작업은 다시 가져가지 않고 failed로 바꿉니다.
+    """
+    if timeout is None:
+        timeout = settings.ANALYZE_JOB_TIMEOUT
+    if max_attempts is None:
+        max_attempts = settings.ANALYZE_JOB_MAX_ATTEMPTS
+
+    while True:
+        now = timezone.now()
+        stale = Q(status='running', heartbeat_at__lt=now - timedelta(seconds=timeout))
+        abandoned = AnalyzeJob.objects.filter(stale, attempts__gte=max_attempts).update(
+            status='failed', error=f'워커가 {max_attempts}번 응답 없이 중단되어 작업을 포기했습니다.', finished_at=now
+        )
+        if abandoned:
+            print(f"❌ 응답 없는 분석 작업 {abandoned}개를 실패 처리했습니다.")
+
+        job = AnalyzeJob.objects.filter(Q(status='pending') | stale).order_by('created_at', 'id').first()
+        if job is None:
+            return None
+        # 다른 워커가 먼저 가져갔거나 원래 워커가 진행 기록을 남겼으면 선점 실패
+        claimed = AnalyzeJob.objects.filter(id=job.id, status=job.status, heartbeat_at=job.heartbeat_at).update(
+            status='running', started_at=now, heartbeat_at=now, attempts=F('attempts') + 1
+        )
+        if claimed:
+            if job.status == 'running':
+                print(f"⚠️ 응답 없는 워커의 분석 작업 {job.id}을 다시 가져갑니다.")
+            job.refresh_from_db()
+            return job
+
+class JobReclaimed(Exception):
+    """다른 워커가 분석 작업을 다시 가져가 이 워커가 더 이상 작업을 소유하지 않음"""
+
+def _owned_job(job):
+    # 이 워커가 가져간 시도(attempts)일 때만 갱신되도록 하는 조건
+    return AnalyzeJob.objects.filter(id=job.id, status='running', attempts=job.attempts)
+
+def _keep_heartbeat(job, stop, lost, interval):
+    """작업이 끝날 때까지 interval초마다 heartbeat_at을 갱신합니다. (백그라운드 스레드)"""
+    try:
+        while not stop.wait(interval):
+            if not _owned_job(job).update(heartbeat_at=timezone.now()):
+                lost.set()
+                return
+    finally:
+        # 스레드마다 따로 열린 DB 연결 정리
+        connection.close()
+
+def process_analyze_job(job, heartbeat_interval=None):
+    """
+    분석 작업 하나를 실행하고 영수증별 진행 상황과 결과를 작업에 기록합니다.
+
+    실행 중에는 백그라운드 스레드가 heartbeat_interval초(기본값: ANALYZE_JOB_HEARTBEAT_INTERVAL)마다
+    heartbeat_at을 갱신하므로 OCR이 오래 걸려도 다른 워커가 작업을 다시 가져가지 않습니다.
+    진행/결과는 이 워커가 가져간 시도(attempts)일 때만 저장하며, 그 사이 다른 워커가 작업을 다시 가져갔으면
+    분석을 멈추고 작업 기록은 건드리지 않습니다. (반환된 job의 status는 running으로 남음)
+    """
+    if heartbeat_interval is None:
+        heartbeat_interval = settings.ANALYZE_JOB_HEARTBEAT_INTERVAL
+    progress = {entry['receipt']: entry for entry in job.progress}
+    stop, lost = threading.Event(), threading.Event()
+
+    def set_progress(receipt_id, status, item_count):
+        progress[receipt_id] = {'receipt': receipt_id, 'status': status, 'item_count': item_count}
+        job.progress = [progress[rid] for rid in job.receipt_ids if rid in progress]
+
+    def on_progress(receipt, status, item_count):
+        set_progress(receipt.id, status, item_count)
+        job.heartbeat_at = timezone.now()
+        if lost.is_set() or not _owned_job(job).update(progress=job.progress, heartbeat_at=job.heartbeat_at):
+            raise JobReclaimed()
+
+    heartbeat = threading.Thread(target=_keep_heartbeat, args=(job, stop, lost, heartbeat_interval), daemon=True)
+    heartbeat.start()
+    try:
+        receipts = Receipt.objects.in_bulk(job.receipt_ids)
+        for receipt_id in job.receipt_ids:
+            if receipt_id not in receipts:
+                # 작업 생성 이후 삭제된 영수증
+                set_progress(receipt_id, 'skipped', 0)
+
+        job.results = run_receipt_analysis(
+            [receipts[receipt_id] for receipt_id in job.receipt_ids if receipt_id in receipts],
+            on_progress=on_progress,
+            force=job.force,
+        )
+        job.status = 'done'
+
+    except JobReclaimed:
+        print(f"⚠️ 다른 워커가 분석 작업 {job.id}을 다시 가져가 이 워커는 중단합니다.")
+        return job
+
+    except Exception as e:
+        job.status = 'failed'
+        job.error = str(e)
+
+    finally:
+        stop.set()
+        heartbeat.join()
+
+    job.finished_at = timezone.now()
+    finished = _owned_job(job).update(
+        status=job.status, progress=job.progress, results=job.results, error=job.error, finished_at=job.finished_at
+    )
+    if not finished:
+        print(f"⚠️ 다른 워커가 분석 작업 {job.id}을 다시 가져가 결과를 저장하지 않았습니다.")
+        job.status = 'running'
+    return job
@@ -1,6 +1,7 @@
 import os
 import sys
 from django.apps import AppConfig
+from django.conf import settings
 from django.core.management import call_command
 
 class ApiConfig(AppConfig):
@@ -11,6 +12,8 @@ class ApiConfig(AppConfig):
         # runserver 시에만 실행 (migrate, shell 등에서는 실행 안 됨)
         if 'runserver' in sys.argv and not self._is_reloading():
             self.reset_database_on_startup()
+        # OCR 모델은 여기서 로드하지 않음 (migrate 등 모든 관리 명령에서도 실행되므로)
+        # 요청/작업을 처리하는 진입점(wsgi.py, asgi.py, run_analyze_jobs)에서 warm_ocr_on_boot()를 호출
 
     def _is_reloading(self):
         """Django autoreload로 인한 재시작인지 확인"""
@@ -25,4 +28,18 @@ class ApiConfig(AppConfig):
             call_command('reset_local_db')
             
         except Exception as e:
-            print(f'❌ 자동 초기화 실패: {e}')
\ No newline at end of file
+            print(f'❌ 자동 초기화 실패: {e}')
+
+def warm_ocr_on_boot():
+    """
+    OCR_WARM_ON_BOOT 설정 시 warm_ocr 명령어로 EasyOCR 모델을 미리 로드합니다.
+    요청을 처리하는 프로세스(wsgi.py/asgi.py, runserver도 wsgi.py를 불러옴)와 분석 워커 시작 시에만 호출합니다.
+    """
+    if not getattr(settings, 'OCR_WARM_ON_BOOT', False):
+        return
+    try:
+        print('🔄 서버 시작 시 OCR 모델 미리 로드...')
+        call_command('warm_ocr')
+
+    except Exception as e:
+        print(f'❌ OCR 모델 로드 실패: {e}')
\ No newline at end of file
@@ -0,0 +1,31 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from api.ocr_pipeline.analyze import DICT_PATH
+from api.ocr_pipeline.extract_item2 import STORE_ITEM_DICT_PATH
+from api.ocr_pipeline.compiled_dictionary import compile_dictionary, compiled_dir
+
+class Command(BaseCommand):
+    help = '후처리 사전을 메모리 맵으로 바로 여는 바이너리 형식으로 컴파일 (사전 수정 후 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths', nargs='*', default=[DICT_PATH, STORE_ITEM_DICT_PATH],
+            help='컴파일할 사전 파일 (기본값: 파이프라인에서 사용하는 dictionary.txt, dictionary_store_item.json)'
+        )
+
+    def handle(self, *args, **options):
+        for path in options['paths']:
+            self.stdout.write(f'🔄 사전 컴파일 중... ({path})')
+            started = time.perf_counter()
+            try:
+                manifest = compile_dictionary(path)
+            except OSError as e:
+                raise CommandError(f'사전 컴파일 실패: {e}')
+            elapsed = time.perf_counter() - started
+
+            counts = ', '.join(f'{name} {count}개' for name, count in manifest['counts'].items())
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'🎉 컴파일 완료! {counts} → {compiled_dir(path)} (버전 {manifest["version"]}, {elapsed:.1f}초)'
+                )
+            )
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Sum
+from api import ocr_cache
+from api.models import OcrCacheEntry
+
+class Command(BaseCommand):
+    help = 'OCR 결과 캐시 상태 확인 및 정리'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--evict', action='store_true', help='오래된/다른 버전 캐시 항목 정리')
+        parser.add_argument('--clear', action='store_true', help='캐시 전체 삭제')
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            deleted, _ = OcrCacheEntry.objects.all().delete()
+            self.stdout.write(self.style.SUCCESS(f'🗑️ OCR 캐시 {deleted}개 삭제 완료'))
+            return
+
+        if options['evict']:
+            evicted = ocr_cache.evict()
+            self.stdout.write(self.style.SUCCESS(f'🧹 오래된 OCR 캐시 {evicted}개 정리 완료'))
+
+        total_hits = OcrCacheEntry.objects.aggregate(total=Sum('hit_count'))['total'] or 0
+        self.stdout.write(f'📦 캐시 항목 수: {OcrCacheEntry.objects.count()}')
+        self.stdout.write(f'♻️ 누적 적중 횟수: {total_hits}')
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models
+from django.db.models import Count
+from api.models import SettlementParticipant
+
+# 모임(정산) 안에서 참가자 이름이 겹치지 않도록 하는 유일 색인 (선택 사항이라 모델/마이그레이션에는 없음)
+INDEX_NAME = 'settlement_participant_name_uniq'
+CONSTRAINT = models.UniqueConstraint(fields=['settlement', 'name'], name=INDEX_NAME)
+
+def is_enabled():
+    table = SettlementParticipant._meta.db_table
+    with connection.cursor() as cursor:
+        return INDEX_NAME in connection.introspection.get_constraints(cursor, table)
+
+def duplicate_names():
+    """같은 정산에 같은 이름으로 두 번 이상 연결된 (정산 id, 이름, 개수) 리스트"""
+    return list(
+        SettlementParticipant.objects.exclude(name=None)
+        .values_list('settlement_id', 'name')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+        .order_by('settlement_id', 'name')
+    )
+
+class Command(BaseCommand):
+    help = '정산(모임) 안 참가자 이름 유일 제약 확인/적용/해제 (선택 사항)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'action', nargs='?', choices=['status', 'enable', 'disable'], default='status',
+            help='status: 상태와 중복 확인 (기본값), enable: 제약 적용, disable: 제약 해제'
+        )
+
+    def handle(self, *args, **options):
+        action = options['action']
+        enabled = is_enabled()
+
+        if action == 'enable' and not enabled:
+            duplicates = duplicate_names()
+            if duplicates:
+                # 데이터는 건드리지 않고 운영자가 정리하도록 안내
+                lines = '\n'.join(f'  정산 {sid}: {name} ({count}번)' for sid, name, count in duplicates)
+                raise CommandError(f'같은 정산에 이름이 겹치는 참가자가 있어 제약을 적용할 수 없습니다:\n{lines}')
+            with connection.schema_editor() as editor:
+                editor.execute(CONSTRAINT.create_sql(SettlementParticipant, editor))
+            self.stdout.write(self.style.SUCCESS('🔒 정산 안 참가자 이름 유일 제약 적용 완료'))
+
+        elif action == 'disable' and enabled:
+            with connection.schema_editor() as editor:
+                editor.execute(CONSTRAINT.remove_sql(SettlementParticipant, editor))
+            self.stdout.write(self.style.SUCCESS('🔓 정산 안 참가자 이름 유일 제약 해제 완료'))
+
+        else:
+            # status, 또는 이미 원하는 상태라 할 일이 없을 때
+            self.stdout.write(f'📋 정산 안 참가자 이름 유일 제약: {"적용됨" if enabled else "적용 안 됨"}')
+            duplicates = duplicate_names()
+            if duplicates:
+                self.stdout.write(f'⚠️ 이름이 겹치는 정산 연결 {len(duplicates)}건')
@@ -0,0 +1,42 @@
+import time
+from django.core.management.base import BaseCommand
+from api.analysis import claim_next_job, process_analyze_job
+from api.apps import warm_ocr_on_boot
+
+class Command(BaseCommand):
+    help = '대기 중인 영수증 분석 작업을 DB 큐에서 꺼내 처리하는 워커'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='대기 중인 작업을 모두 처리한 뒤 종료'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=1.0,
+            help='대기 작업이 없을 때 다시 확인하기까지의 간격(초, 기본값: 1.0)'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('🔄 영수증 분석 워커 시작...')
+        # OCR_WARM_ON_BOOT 설정 시 첫 작업을 받기 전에 OCR 모델 로드
+        warm_ocr_on_boot()
+
+        while True:
+            job = claim_next_job()
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            self.stdout.write(f'🔎 분석 작업 {job.id} 시작 (영수증 {len(job.receipt_ids)}개)')
+            job = process_analyze_job(job)
+
+            if job.status == 'done':
+                self.stdout.write(self.style.SUCCESS(f'✅ 분석 작업 {job.id} 완료'))
+            elif job.status == 'failed':
+                self.stdout.write(self.style.ERROR(f'❌ 분석 작업 {job.id} 실패: {job.error}'))
+            else:
+                self.stdout.write(self.style.WARNING(f'⚠️ 분석 작업 {job.id}은 다른 워커가 이어서 처리합니다'))
+
+        self.stdout.write(self.style.SUCCESS('🎉 대기 중인 분석 작업 처리 완료!'))
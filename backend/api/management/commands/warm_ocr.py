@@ -0,0 +1,25 @@
+import time
+from django.core.management.base import BaseCommand
+from api.ocr_pipeline.image_to_text import DEFAULT_LANGUAGES, warm_reader
+
+class Command(BaseCommand):
+    help = 'EasyOCR 모델 미리 로드 (워커가 트래픽을 받기 전 워밍업)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--languages', nargs='+', default=list(DEFAULT_LANGUAGES),
+            help='로드할 OCR 언어 목록 (기본값: en ko)'
+        )
+        parser.add_argument('--gpu', action='store_true', help='GPU 사용 여부')
+
+    def handle(self, *args, **options):
+        languages = options['languages']
+        self.stdout.write(f'🔄 OCR 모델 로드 중... ({", ".join(languages)})')
+
+        started = time.perf_counter()
+        warm_reader(languages, gpu=options['gpu'])
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(f'🎉 OCR 모델 로드 완료! ({elapsed:.1f}초)')
+        )
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_settlement_item_assignments_data'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyzeJob',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('pending', '대기'), ('running', '진행 중'), ('done', '완료'), ('failed', '실패')], default='pending', max_length=10)),
+                ('receipt_ids', models.JSONField(default=list)),
+                ('progress', models.JSONField(default=list)),
+                ('results', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'analyze_job',
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:03
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_analyzejob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OcrCacheEntry',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('digest', models.CharField(max_length=64)),
+                ('ocr_version', models.CharField(max_length=64)),
+                ('postprocess_version', models.CharField(max_length=64)),
+                ('lines', models.JSONField(default=list)),
+                ('result', models.JSONField(default=dict)),
+                ('hit_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_used_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'ocr_cache',
+                'constraints': [models.UniqueConstraint(fields=('digest', 'ocr_version'), name='ocr_cache_digest_version_uniq')],
+            },
+        ),
+    ]
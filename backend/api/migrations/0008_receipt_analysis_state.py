@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_ocrcacheentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='receipt',
+            name='analysis_status',
+            field=models.CharField(choices=[('pending', '분석 전'), ('done', '분석 완료'), ('failed', '분석 실패')], default='pending', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='receipt',
+            name='analyzed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='receipt',
+            name='pipeline_version',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='analyzejob',
+            name='force',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-18 23:06
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_receipt_analysis_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DictionaryChange',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('action', models.CharField(choices=[('add_store', '가게 추가'), ('remove_store', '가게 삭제'), ('add_item', '메뉴 추가'), ('remove_item', '메뉴 삭제')], max_length=20)),
+                ('store_name', models.CharField(max_length=255)),
+                ('item_name', models.CharField(blank=True, default='', max_length=255)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'dictionary_change',
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-18 23:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_dictionarychange'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='receiptinfo',
+            index=models.Index(fields=['receipt', 'item_name'], name='receipt_info_receipt_item_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='participant',
+            index=models.Index(fields=['name'], name='participant_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='settlement',
+            index=models.Index(fields=['created_at'], name='settlement_created_at_idx'),
+        ),
+    ]
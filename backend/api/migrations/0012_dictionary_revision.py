@@ -0,0 +1,47 @@
+# Generated by Django 5.2.1 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+def backfill_revisions(apps, schema_editor):
+    """기존 변경 기록에 id 순서대로 1부터 리비전을 매기고 마지막 리비전을 저장합니다."""
+    DictionaryChange = apps.get_model('api', 'DictionaryChange')
+    DictionaryRevision = apps.get_model('api', 'DictionaryRevision')
+
+    revision = 0
+    for change in DictionaryChange.objects.order_by('id'):
+        revision += 1
+        change.revision = revision
+        change.save(update_fields=['revision'])
+    DictionaryRevision.objects.update_or_create(id=1, defaults={'revision': revision})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DictionaryRevision',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('revision', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'dictionary_revision',
+            },
+        ),
+        migrations.AddField(
+            model_name='dictionarychange',
+            name='revision',
+            field=models.PositiveIntegerField(null=True),
+        ),
+        migrations.RunPython(backfill_revisions, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='dictionarychange',
+            name='revision',
+            field=models.PositiveIntegerField(unique=True),
+        ),
+    ]
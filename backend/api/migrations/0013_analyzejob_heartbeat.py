@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-19 10:05
+
+from django.db import migrations, models
+
+
+def backfill_heartbeats(apps, schema_editor):
+    """이미 진행 중인 작업은 시작 시각을 마지막 기록 시각으로 사용하고, 한 번 가져간 것으로 셉니다."""
+    AnalyzeJob = apps.get_model('api', 'AnalyzeJob')
+    AnalyzeJob.objects.exclude(started_at=None).update(heartbeat_at=models.F('started_at'), attempts=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_dictionary_revision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analyzejob',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='analyzejob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_heartbeats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.1 on 2026-10-19 11:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_names(apps, schema_editor):
+    """기존 정산 ↔ 참가자 연결에 현재 참가자 이름을 기록합니다. (데이터는 삭제하지 않음)"""
+    SettlementParticipant = apps.get_model('api', 'SettlementParticipant')
+    for link in SettlementParticipant.objects.select_related('participant').iterator():
+        link.name = link.participant.name
+        link.save(update_fields=['name'])
+
+
+class Migration(migrations.Migration):
+    """
+    정산 ↔ 참가자 중간 테이블(settlement_participants)을 SettlementParticipant 모델로 꺼내고 name 열을 추가합니다.
+    테이블과 기존 열은 그대로 사용하므로 DB에서는 name 열 추가와 값 채우기만 실행됩니다.
+    """
+
+    dependencies = [
+        ('api', '0013_analyzejob_heartbeat'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='SettlementParticipant',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('participant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='api.participant')),
+                        ('settlement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='api.settlement')),
+                    ],
+                    options={
+                        'db_table': 'settlement_participants',
+                        'unique_together': {('settlement', 'participant')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='settlement',
+                    name='participants',
+                    field=models.ManyToManyField(through='api.SettlementParticipant', to='api.participant'),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name='settlementparticipant',
+            name='name',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.RunPython(backfill_names, migrations.RunPython.noop),
+    ]
@@ -8,10 +8,19 @@ class Receipt(models.Model):
     
     업로드된 영수증 이미지 정보를 저장합니다.
     """
+    ANALYSIS_STATUS_CHOICES = [
+        ('pending', '분석 전'),
+        ('done', '분석 완료'),
+        ('failed', '분석 실패'),
+    ]
+
     id = models.AutoField(primary_key=True)
     file_name = models.CharField(max_length=255)
     upload_time = models.DateTimeField(default=timezone.now)
     image_path = models.CharField(max_length=500)
+    analysis_status = models.CharField(max_length=10, choices=ANALYSIS_STATUS_CHOICES, default='pending')
+    analyzed_at = models.DateTimeField(blank=True, null=True)
+    pipeline_version = models.CharField(max_length=64, blank=True, default='')  # 분석 시점의 OCR 파이프라인 버전
     
     class Meta:
         db_table = 'receipt'  # MySQL 테이블 이름 지정
@@ -35,6 +44,10 @@ class ReceiptInfo(models.Model):
     
     class Meta:
         db_table = 'receipt_info'  # MySQL 테이블 이름 지정
+        indexes = [
+            # 영수증별 품목 이름 조회 (항목별 정산)
+            models.Index(fields=['receipt', 'item_name'], name='receipt_info_receipt_item_idx'),
+        ]
         
     def __str__(self):
         return f"{self.item_name} - {self.quantity}개, {self.total_amount}원 (영수증 ID: {self.id})"
@@ -50,6 +63,10 @@ class Participant(models.Model):
     
     class Meta:
         db_table = 'participant'  # MySQL 테이블 이름 지정
+        indexes = [
+            # 정산 저장 시 참가자 이름 조회 (name__in)
+            models.Index(fields=['name'], name='participant_name_idx'),
+        ]
         
     def __str__(self):
         return f"Participant {self.id}: {self.name}"
@@ -61,7 +78,7 @@ class Settlement(models.Model):
     ]
     
     receipts = models.ManyToManyField('Receipt')  # 기존 ForeignKey → ManyToMany로 수정
-    participants = models.ManyToManyField('Participant')
+    participants = models.ManyToManyField('Participant', through='SettlementParticipant')
     result = models.JSONField()  # {'홍길동': 3000, '김철수': 3000}
     item_assignments_data = models.JSONField(blank=True, null=True) # 품목별 참가자 할당 정보
     method = models.CharField(max_length=10, choices=METHOD_CHOICES, default='equal') 
@@ -69,7 +86,127 @@ class Settlement(models.Model):
 
     class Meta:
         db_table = 'settlement'
+        indexes = [
+            models.Index(fields=['created_at'], name='settlement_created_at_idx'),
+        ]
 
     def __str__(self):
         return f"Settlement with {self.receipts.count()} receipts - {self.method}"
 
+class SettlementParticipant(models.Model):
+    """
+    정산 ↔ 참가자 연결 모델
+
+    정산 하나가 한 모임이므로, 정산 시점의 참가자 이름을 함께 저장해 모임 안에서 이름이 겹치는지 확인합니다.
+    (정산, 이름) 유일 제약은 선택 사항이며 participant_name_constraint 명령어로 켜고 끕니다.
+    """
+    settlement = models.ForeignKey(Settlement, on_delete=models.CASCADE)
+    participant = models.ForeignKey(Participant, on_delete=models.CASCADE)
+    name = models.CharField(max_length=100, blank=True, null=True)  # 정산 시점의 참가자 이름
+
+    class Meta:
+        db_table = 'settlement_participants'
+        unique_together = [('settlement', 'participant')]
+
+
+class AnalyzeJob(models.Model):
+    """
+    영수증 분석 작업 모델
+
+    비동기로 실행되는 OCR 분석 요청과 영수증별 진행 상황을 저장합니다.
+    """
+    STATUS_CHOICES = [
+        ('pending', '대기'),
+        ('running', '진행 중'),
+        ('done', '완료'),
+        ('failed', '실패'),
+    ]
+
+    id = models.AutoField(primary_key=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    receipt_ids = models.JSONField(default=list)  # 분석 대상 영수증 ID 목록 (업로드 순)
+    force = models.BooleanField(default=False)  # True이면 이미 분석된 영수증도 다시 분석
+    progress = models.JSONField(default=list)  # [{'receipt': 1, 'status': 'done', 'item_count': 3}, ...]
+    results = models.JSONField(blank=True, null=True)  # 완료 시 추출된 품목 리스트
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    heartbeat_at = models.DateTimeField(blank=True, null=True)  # 워커가 마지막으로 진행 상황을 기록한 시각
+    attempts = models.PositiveIntegerField(default=0)  # 워커가 작업을 가져간 횟수 (응답 없는 워커의 작업을 다시 가져가면 증가)
+
+    class Meta:
+        db_table = 'analyze_job'
+
+    def __str__(self):
+        return f"AnalyzeJob {self.id} ({self.status})"
+
+class OcrCacheEntry(models.Model):
+    """
+    OCR 결과 캐시 모델
+
+    이미지 바이트의 SHA-256과 OCR 파이프라인 버전을 키로 OCR 원본 줄과 추출된 품목을 저장합니다.
+    """
+    id = models.AutoField(primary_key=True)
+    digest = models.CharField(max_length=64)  # 이미지 바이트의 SHA-256
+    ocr_version = models.CharField(max_length=64)  # 전처리/OCR 설정 해시
+    postprocess_version = models.CharField(max_length=64)  # 후처리/사전 해시
+    lines = models.JSONField(default=list)  # OCR 원본 줄 리스트
+    result = models.JSONField(default=dict)  # {'store_name': ..., 'items': [...]}
+    hit_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+    last_used_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'ocr_cache'
+        constraints = [
+            models.UniqueConstraint(fields=['digest', 'ocr_version'], name='ocr_cache_digest_version_uniq'),
+        ]
+
+    def __str__(self):
+        return f"OcrCacheEntry {self.digest[:12]} (hits: {self.hit_count})"
+
+class DictionaryChange(models.Model):
+    """
+    가게/메뉴 사전 변경 기록 모델
+
+    관리 API로 추가/삭제한 가게와 메뉴를 순서대로 저장합니다.
+    revision은 DictionaryRevision을 잠근 트랜잭션에서 빈 번호 없이 1씩 증가하도록 매기며,
+    각 프로세스는 마지막으로 반영한 revision 이후의 변경만 읽어 매칭 색인에 반영합니다.
+    (id는 커밋 순서와 다르게 보일 수 있어 리비전으로 쓰지 않음)
+    """
+    ACTION_CHOICES = [
+        ('add_store', '가게 추가'),
+        ('remove_store', '가게 삭제'),
+        ('add_item', '메뉴 추가'),
+        ('remove_item', '메뉴 삭제'),
+    ]
+
+    id = models.AutoField(primary_key=True)
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    store_name = models.CharField(max_length=255)
+    item_name = models.CharField(max_length=255, blank=True, default='')  # 가게 추가/삭제는 빈 값
+    revision = models.PositiveIntegerField(unique=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'dictionary_change'
+
+    def __str__(self):
+        return f"DictionaryChange {self.id}: {self.action} {self.store_name} {self.item_name}".rstrip()
+
+class DictionaryRevision(models.Model):
+    """
+    가게/메뉴 사전의 마지막 리비전 (행 하나)
+
+    변경 기록을 저장할 때 이 행을 select_for_update로 잠그고 리비전을 올리므로,
+    리비전 N+1은 항상 N이 커밋된 뒤에 매겨집니다.
+    """
+    id = models.AutoField(primary_key=True)
+    revision = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'dictionary_revision'
+
+    def __str__(self):
+        return f"DictionaryRevision {self.revision}"
@@ -0,0 +1,107 @@
+import hashlib
+import threading
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F
+from django.utils import timezone
+from .models import OcrCacheEntry
+from api.ocr_pipeline.analyze import ocr_version, postprocess_version, extract_items
+
+# 프로세스 단위 캐시 적중/미스 카운터
+_stats = {'hits': 0, 'misses': 0}
+_stats_lock = threading.Lock()
+
+def is_enabled():
+    return getattr(settings, 'OCR_CACHE_ENABLED', True)
+
+def _header_lines():
+    return getattr(settings, 'OCR_STORE_HEADER_LINES', None)
+
+def _ocr_version():
+    return ocr_version(detect_width=getattr(settings, 'OCR_DETECT_WIDTH', None))
+
+def file_digest(path):
+    """이미지 파일 바이트의 SHA-256"""
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def bytes_digest(data):
+    """이미지 바이트의 SHA-256"""
+    return hashlib.sha256(memoryview(data)).hexdigest()
+
+def lookup(digests):
+    """
+    digest 목록에 해당하는 캐시 항목을 {digest: OcrCacheEntry}로 반환하고,
+    적중한 항목의 사용 횟수와 마지막 사용 시각을 갱신합니다.
+    """
+    digests = list(digests)
+    entries = {
+        entry.digest: entry
+        for entry in OcrCacheEntry.objects.filter(digest__in=set(digests), ocr_version=_ocr_version())
+    }
+    if entries:
+        OcrCacheEntry.objects.filter(id__in=[entry.id for entry in entries.values()]).update(
+            hit_count=F('hit_count') + 1, last_used_at=timezone.now()
+        )
+
+    hits = sum(1 for digest in digests if digest in entries)
+    with _stats_lock:
+        _stats['hits'] += hits
+        _stats['misses'] += len(digests) - hits
+    return entries
+
+def cached_result(entry):
+    """
+    캐시 항목의 추출 결과를 반환합니다.
+    사전/후처리 버전이 바뀌었으면 저장된 OCR 줄로 품목 추출만 다시 수행합니다.
+    """
+    current = postprocess_version(_header_lines())
+    if entry.postprocess_version != current:
+        entry.result = extract_items(entry.lines, header_lines=_header_lines())
+        entry.postprocess_version = current
+        entry.save(update_fields=['result', 'postprocess_version'])
+    return entry.result
+
+def store(digest, lines, result):
+    """OCR 줄과 추출 결과를 캐시에 저장"""
+    defaults = {
+        'postprocess_version': postprocess_version(_header_lines()),
+        'lines': lines,
+        'result': result,
+        'last_used_at': timezone.now(),
+    }
+    try:
+        OcrCacheEntry.objects.update_or_create(digest=digest, ocr_version=_ocr_version(), defaults=defaults)
+    except IntegrityError:
+        # 다른 워커가 같은 이미지를 먼저 저장한 경우
+        pass
+
+def evict(max_entries=None):
+    """
+    다른 OCR 버전의 항목을 삭제하고, 최대 개수를 넘으면 오래 사용되지 않은 항목부터 삭제합니다.
+    """
+    if max_entries is None:
+        max_entries = settings.OCR_CACHE_MAX_ENTRIES
+
+    OcrCacheEntry.objects.exclude(ocr_version=_ocr_version()).delete()
+
+    stale_ids = list(
+        OcrCacheEntry.objects.order_by('-last_used_at', '-id').values_list('id', flat=True)[max_entries:]
+    )
+    if stale_ids:
+        OcrCacheEntry.objects.filter(id__in=stale_ids).delete()
+    return len(stale_ids)
+
+def get_stats():
+    """현재 프로세스의 캐시 적중/미스 횟수와 적중률 (DB 조회 없음)"""
+    with _stats_lock:
+        hits, misses = _stats['hits'], _stats['misses']
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / total if total else 0.0,
+    }
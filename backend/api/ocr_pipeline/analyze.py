@@ -0,0 +1,208 @@
+import os
+import math
+import hashlib
+import threading
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from .preprocessing import DETECT_WIDTH, preprocess_image_to_memory
+from .image_to_text import (
+    DEFAULT_LANGUAGES, DEFAULT_BATCH_SIZE, ocr_image_from_memory, ocr_images_from_memory, warm_reader
+)
+from .process_text import get_processor
+from .extract_item2 import STORE_ITEM_DICT_PATH, STORE_HEADER_LINES, extract_menu_items_from_lines
+from .jamo_index import SHORTLIST_SIZE
+
+DICT_PATH = os.path.join(os.path.dirname(__file__), 'dictionary.txt')
+
+# 전처리/OCR 로직이 바뀌면 올려서 캐시된 OCR 결과를 무효화
+PREPROCESS_VERSION = 'mask-crop-otsu-2'
+# 후처리/품목 추출 로직이 바뀌면 올려서 캐시된 추출 결과를 무효화
+EXTRACT_VERSION = 'extract-item2-1'
+
+# 사전 파일 경로 → (mtime, sha256)
+_file_hashes = {}
+
+# 요청 간에 재사용하는 프로세스 풀 (워커마다 OCR 모델을 한 번만 로드)
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+def _get_processor():
+    return get_processor(DICT_PATH)
+
+def _file_hash(path):
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return ''
+    cached = _file_hashes.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, 'rb') as f:
+            cached = (mtime, hashlib.sha256(f.read()).hexdigest())
+        _file_hashes[path] = cached
+    return cached[1]
+
+def ocr_version(languages=DEFAULT_LANGUAGES, detect_width=DETECT_WIDTH):
+    """
+    OCR 결과(줄 리스트)에 영향을 주는 설정(전처리 버전, 윤곽 검출 이미지 크기, OCR 언어)의 해시
+    """
+    key = f"{PREPROCESS_VERSION}|{detect_width}|{','.join(languages)}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+def postprocess_version(header_lines=STORE_HEADER_LINES):
+    """
+    후처리/품목 추출 결과에 영향을 주는 설정(추출 버전, 가게명 탐색 범위, 사전 파일 내용,
+    관리 API로 반영한 가게/메뉴 사전 리비전)의 해시
+    """
+    key = (
+        f"{EXTRACT_VERSION}|{header_lines}|{SHORTLIST_SIZE}"
+        f"|{_file_hash(DICT_PATH)}|{_file_hash(STORE_ITEM_DICT_PATH)}"
+        f"|{get_processor(STORE_ITEM_DICT_PATH).revision}"
+    )
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+def pipeline_version(header_lines=STORE_HEADER_LINES, detect_width=DETECT_WIDTH):
+    """
+    전체 분석 파이프라인(OCR + 후처리) 버전. 이 값이 바뀌면 기존 분석 결과는 다시 계산 대상입니다.
+    """
+    key = f"{ocr_version(detect_width=detect_width)}|{postprocess_version(header_lines)}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+def ocr_image(source, detect_width=DETECT_WIDTH):
+    """
+    단일 영수증 이미지(파일 경로 또는 이미지 바이트)에 대해 전처리 → OCR을 수행하여 줄 리스트를 반환합니다.
+    영수증 윤곽은 가로 detect_width로 축소한 이미지에서 찾습니다. (None이면 원본 해상도)
+    """
+    # 1. 전처리
+    bin_img = preprocess_image_to_memory(source, detect_width=detect_width)
+
+    # 2. OCR
+    return ocr_image_from_memory(bin_img)
+
+def extract_items(lines, header_lines=STORE_HEADER_LINES):
+    """
+    OCR 줄 리스트에 대해 후처리 → 품목 추출을 수행합니다. 가게명은 앞쪽 header_lines줄에서만 찾습니다.
+    """
+    # 3. 후처리
+    processed_lines = _get_processor().process_lines(lines)
+
+    # 4. 품목 추출
+    return extract_menu_items_from_lines(processed_lines, header_lines=header_lines)
+
+def analyze_image(source, header_lines=STORE_HEADER_LINES, detect_width=DETECT_WIDTH):
+    """
+    단일 영수증 이미지(파일 경로 또는 이미지 바이트)에 대해 전처리 → OCR → 후처리 → 품목 추출을 수행합니다.
+    반환값에는 캐시 저장을 위해 OCR 원본 줄 리스트(`lines`)가 함께 포함됩니다.
+    """
+    lines = ocr_image(source, detect_width=detect_width)
+    result = extract_items(lines, header_lines=header_lines)
+    return {**result, 'lines': lines}
+
+def analyze_image_batch(sources, batch_size=DEFAULT_BATCH_SIZE, header_lines=STORE_HEADER_LINES,
+                        detect_width=DETECT_WIDTH):
+    """
+    여러 영수증 이미지를 한 번에 분석합니다. 글자 인식은 모든 이미지의 글자 영역을 모아
+    batch_size 단위로 처리하며, 결과는 이미지마다 analyze_image를 호출한 것과 같습니다.
+    """
+    all_lines = ocr_image_batch(sources, batch_size=batch_size, detect_width=detect_width)
+
+    # 3~4. 후처리 → 품목 추출
+    return [{**extract_items(lines, header_lines=header_lines), 'lines': lines} for lines in all_lines]
+
+def ocr_image_batch(sources, batch_size=DEFAULT_BATCH_SIZE, detect_width=DETECT_WIDTH):
+    """
+    여러 영수증 이미지를 전처리 → 일괄 OCR하여 이미지별 줄 리스트를 반환합니다.
+    """
+    # 1. 전처리
+    bin_imgs = [preprocess_image_to_memory(source, detect_width=detect_width) for source in sources]
+
+    # 2. OCR (일괄 인식)
+    return ocr_images_from_memory(bin_imgs, batch_size=batch_size)
+
+def _init_worker(threads_per_worker):
+    """워커 시작 시 torch 스레드 수를 제한하고 OCR 모델을 미리 로드 (워커는 OCR만 수행)"""
+    try:
+        import torch
+        torch.set_num_threads(threads_per_worker)
+    except ImportError:
+        pass
+    warm_reader()
+
+def _get_pool(max_workers):
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != max_workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            threads_per_worker = max(1, (os.cpu_count() or 1) // max_workers)
+            # torch는 fork 이후 안전하지 않으므로 spawn으로 워커 생성
+            _pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(threads_per_worker,),
+            )
+            _pool_workers = max_workers
+        return _pool
+
+def _discard_pool():
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+        _pool_workers = 0
+
+def _chunk_images(image_paths, max_workers, images_per_batch):
+    """
+    이미지를 워커 수만큼 고르게 나누되 묶음 하나가 images_per_batch장을 넘지 않도록 나눕니다.
+    (이미지가 적어도 모든 워커를 사용)
+    """
+    size = max(1, min(images_per_batch, math.ceil(len(image_paths) / max(1, max_workers))))
+    return [image_paths[i:i + size] for i in range(0, len(image_paths), size)]
+
+def iter_analyze_images(image_paths, max_workers=1, images_per_batch=1, batch_size=DEFAULT_BATCH_SIZE,
+                        header_lines=STORE_HEADER_LINES, detect_width=DETECT_WIDTH):
+    """
+    여러 영수증 이미지(파일 경로 또는 이미지 바이트)를 분석하여 입력 순서대로 결과를 하나씩 반환(yield)합니다.
+    이미지는 워커마다 고르게, 최대 images_per_batch장씩 묶어 글자 인식을 일괄 처리하며,
+    max_workers가 1 이하이거나 묶음이 하나뿐이면 현재 프로세스에서 순차 처리합니다.
+    병렬 처리 시 워커는 OCR만 수행하고, 후처리/품목 추출은 관리 API의 사전 변경이 반영된
+    현재 프로세스의 사전으로 수행합니다.
+    """
+    image_paths = list(image_paths)
+    chunks = _chunk_images(image_paths, max_workers, max(1, images_per_batch))
+    analyze_chunk = functools.partial(
+        analyze_image_batch, batch_size=batch_size, header_lines=header_lines, detect_width=detect_width
+    )
+    ocr_chunk = functools.partial(ocr_image_batch, batch_size=batch_size, detect_width=detect_width)
+
+    if max_workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield from analyze_chunk(chunk)
+        return
+
+    done = 0
+    try:
+        pool = _get_pool(max_workers)
+        for all_lines in pool.map(ocr_chunk, chunks):
+            done += 1
+            yield from ({**extract_items(lines, header_lines=header_lines), 'lines': lines} for lines in all_lines)
+    except (BrokenProcessPool, OSError) as e:
+        # 워커 생성/실행 실패 시 남은 이미지는 순차 처리로 대체
+        print(f"⚠️ 병렬 분석 실패, 순차 처리로 전환: {e}")
+        _discard_pool()
+        for chunk in chunks[done:]:
+            yield from analyze_chunk(chunk)
+
+def analyze_images(image_paths, max_workers=1, images_per_batch=1, batch_size=DEFAULT_BATCH_SIZE,
+                   header_lines=STORE_HEADER_LINES, detect_width=DETECT_WIDTH):
+    """
+    여러 영수증 이미지를 분석하여 입력 순서대로 결과 리스트를 반환합니다.
+    """
+    return list(iter_analyze_images(
+        image_paths, max_workers=max_workers, images_per_batch=images_per_batch, batch_size=batch_size,
+        header_lines=header_lines, detect_width=detect_width,
+    ))
@@ -0,0 +1,369 @@
+import os
+import json
+import shutil
+import hashlib
+from collections.abc import Mapping, Sequence
+import numpy as np
+from .jamo_index import NGRAM_SIZE, DictEntry, JamoIndex, NgramIndex
+
+# 컴파일 결과 형식이 바뀌면 올려서 기존 결과를 다시 만들도록 함
+FORMAT_VERSION = 1
+
+MANIFEST_NAME = 'manifest.json'
+
+def compiled_dir(dict_path):
+    """사전 파일의 컴파일 결과 폴더 (예: dictionary.txt → dictionary.txt.compiled)"""
+    return f"{os.path.abspath(dict_path)}.compiled"
+
+def manifest_path(dict_path):
+    return os.path.join(compiled_dir(dict_path), MANIFEST_NAME)
+
+def file_sha256(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _pack_strings(strings):
+    # UTF-8 바이트를 이어 붙인 배열과 각 문자열의 시작 위치 배열 (마지막 값은 전체 길이)
+    encoded = [string.encode('utf-8') for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(data) for data in encoded])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+def _pack_entries(prefix, entries):
+    words, word_offsets = _pack_strings(entry.word for entry in entries)
+    jamos, jamo_offsets = _pack_strings(entry.jamo for entry in entries)
+    return {
+        f'{prefix}_words': words,
+        f'{prefix}_word_offsets': word_offsets,
+        f'{prefix}_jamos': jamos,
+        f'{prefix}_jamo_offsets': jamo_offsets,
+        f'{prefix}_lengths': np.array([entry.length for entry in entries], dtype=np.int64),
+    }
+
+class StringTable(Sequence):
+    """이어 붙인 UTF-8 바이트 배열에서 i번째 문자열을 필요할 때 디코딩하는 읽기 전용 시퀀스"""
+
+    def __init__(self, data, offsets):
+        self._data = data
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self._data[self._offsets[i]:self._offsets[i + 1]].tobytes().decode('utf-8')
+
+class EntryTable(Sequence):
+    """컴파일된 배열에서 DictEntry 레코드를 위치로 읽는 시퀀스"""
+
+    def __init__(self, arrays, prefix):
+        self.words = StringTable(arrays[f'{prefix}_words'], arrays[f'{prefix}_word_offsets'])
+        self.jamos = StringTable(arrays[f'{prefix}_jamos'], arrays[f'{prefix}_jamo_offsets'])
+        self.lengths = arrays[f'{prefix}_lengths']
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return DictEntry(self.words[i], self.jamos[i], int(self.lengths[i]))
+
+class StoreItems(Mapping):
+    """
+    컴파일된 가게 → 메뉴 매핑. JSON 사전의 stores_dict처럼 {가게명: {"items": [...]}}로 읽히며,
+    가게명 → 위치 dict는 처음 조회할 때 만듭니다.
+    """
+
+    def __init__(self, stores, items, indptr):
+        self._stores = stores
+        self._items = items
+        self._indptr = indptr
+        self._positions = None
+
+    def _position(self, store_name):
+        if self._positions is None:
+            self._positions = {name: i for i, name in enumerate(self._stores.words)}
+        return self._positions[store_name]
+
+    def __getitem__(self, store_name):
+        start, end = self._item_range(store_name)
+        return {"items": self._items.words[start:end]}
+
+    def __contains__(self, store_name):
+        try:
+            self._position(store_name)
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(self._stores.words)
+
+    def __len__(self):
+        return len(self._stores)
+
+    def _item_range(self, store_name):
+        i = self._position(store_name)
+        return int(self._indptr[i]), int(self._indptr[i + 1])
+
+    def item_entries(self, store_name):
+        start, end = self._item_range(store_name)
+        return self._items[start:end]
+
+class StoreOverlay(Mapping):
+    """
+    원본 가게 → 메뉴 매핑(JSON dict 또는 StoreItems) 위에 관리 API 변경분만 따로 들고 있는 매핑.
+    원본 순서에서 삭제된 가게를 빼고, 새로 추가된 가게를 추가 순서대로 뒤에 붙여 순회합니다.
+    with_store / without_store는 변경분 dict만 복사한 새 매핑을 반환하므로 원본 사전 전체를 복사하지 않습니다.
+    """
+
+    def __init__(self, base):
+        self._base = base
+        self._replaced = {}
+        self._removed = frozenset()
+        self._extra = {}
+        self._positions = None
+
+    def _copy(self, replaced, removed, extra):
+        overlay = StoreOverlay.__new__(StoreOverlay)
+        overlay._base = self._base
+        overlay._replaced = replaced
+        overlay._removed = removed
+        overlay._extra = extra
+        # 원본 위치 dict는 원본이 바뀌지 않으므로 같이 사용
+        overlay._positions = self._positions
+        return overlay
+
+    def _in_base(self, store_name):
+        return store_name not in self._removed and store_name in self._base
+
+    def __getitem__(self, store_name):
+        if store_name in self._extra:
+            return self._extra[store_name]
+        if store_name in self._replaced:
+            return self._replaced[store_name]
+        if not self._in_base(store_name):
+            raise KeyError(store_name)
+        return self._base[store_name]
+
+    def __contains__(self, store_name):
+        return store_name in self._extra or self._in_base(store_name)
+
+    def __iter__(self):
+        for store_name in self._base:
+            if store_name not in self._removed:
+                yield store_name
+        yield from self._extra
+
+    def __len__(self):
+        return len(self._base) - len(self._removed) + len(self._extra)
+
+    def base_position(self, store_name):
+        """원본 매핑에서 store_name의 위치 (원본 순서대로 만든 가게명 색인의 행 번호와 같음)"""
+        if isinstance(self._base, StoreItems):
+            return self._base._position(store_name)
+        if self._positions is None:
+            self._positions = {name: i for i, name in enumerate(self._base)}
+        return self._positions[store_name]
+
+    def item_entries(self, store_name):
+        """변경되지 않은 컴파일 사전 가게의 메뉴 레코드. 변경되었거나 원본이 JSON이면 None"""
+        if store_name in self._extra or store_name in self._replaced or not isinstance(self._base, StoreItems):
+            return None
+        return self._base.item_entries(store_name)
+
+    def with_store(self, store_name, value):
+        """store_name의 값을 value로 바꾸거나 (없으면) 맨 뒤에 추가한 새 매핑"""
+        if store_name in self._extra or store_name not in self:
+            return self._copy(self._replaced, self._removed, {**self._extra, store_name: value})
+        return self._copy({**self._replaced, store_name: value}, self._removed, self._extra)
+
+    def without_store(self, store_name):
+        """store_name을 뺀 새 매핑"""
+        if store_name in self._extra:
+            extra = dict(self._extra)
+            del extra[store_name]
+            return self._copy(self._replaced, self._removed, extra)
+        replaced = {name: value for name, value in self._replaced.items() if name != store_name}
+        return self._copy(replaced, self._removed | {store_name}, self._extra)
+
+class LazyIndexMap(Mapping):
+    """키별 색인을 처음 조회할 때 만들어 두는 매핑 (가게별 메뉴 색인용)"""
+
+    def __init__(self, keys, factory):
+        self._keys = keys
+        self._factory = factory
+        self._cache = {}
+
+    def __getitem__(self, key):
+        index = self._cache.get(key)
+        if index is None:
+            if key not in self._keys:
+                raise KeyError(key)
+            index = self._cache.setdefault(key, self._factory(key))
+        return index
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def updated(self, keys, changed_key):
+        """키 목록을 바꾼 새 매핑. changed_key와 없어진 키의 색인만 버리고 나머지는 그대로 사용합니다."""
+        index_map = LazyIndexMap(keys, self._factory)
+        index_map._cache = {
+            key: index for key, index in self._cache.items() if key != changed_key and key in keys
+        }
+        return index_map
+
+class CompiledDictionary:
+    """
+    build_dictionary 명령으로 만든 사전 컴파일 결과.
+    모든 배열은 읽기 전용 메모리 맵으로 열기 때문에 로딩 시 파일을 읽거나 파싱하지 않으며,
+    같은 파일을 여는 워커 프로세스들은 운영체제 페이지 캐시를 공유합니다.
+    """
+
+    def __init__(self, manifest, arrays):
+        self.manifest = manifest
+        self.arrays = arrays
+        self.kind = manifest['kind']
+        self.version = manifest['version']
+
+    @property
+    def dictionary(self):
+        if self.kind != 'text':
+            return []
+        return EntryTable(self.arrays, 'dictionary').words
+
+    @property
+    def stores_dict(self):
+        if self.kind != 'store_item':
+            return {}
+        return StoreItems(EntryTable(self.arrays, 'store'), EntryTable(self.arrays, 'item'), self.arrays['store_item_indptr'])
+
+    def _section(self, prefix):
+        # 'index_order' → 'order'처럼 접두어를 뗀 배열 묶음
+        prefix = f'{prefix}_'
+        return {name[len(prefix):]: array for name, array in self.arrays.items() if name.startswith(prefix)}
+
+    def dictionary_index(self):
+        entries = EntryTable(self.arrays, 'dictionary') if self.kind == 'text' else []
+        if 'index_order' in self.arrays:
+            return JamoIndex.from_arrays(entries, self._section('index'))
+        # 작은 사전은 색인 없이 전체를 비교하므로 레코드를 바로 읽어 둠
+        return JamoIndex(list(entries))
+
+    def store_index(self):
+        if self.kind != 'store_item':
+            return NgramIndex([])
+        return NgramIndex.from_arrays(EntryTable(self.arrays, 'store'), self._section('ngram'))
+
+def compile_dictionary(dict_path):
+    """
+    사전 파일을 자모 분해 레코드, 길이 버킷/자모 색인, 가게명 n-gram 역색인, 가게 → 메뉴 매핑 배열로 컴파일해
+    compiled_dir(dict_path)에 저장하고 manifest를 반환합니다.
+
+    결과는 버전별 하위 폴더에 쓴 뒤 manifest를 원자적으로 교체하므로,
+    이미 이전 결과를 메모리 맵으로 열어 둔 프로세스는 계속 이전 파일을 읽을 수 있습니다.
+    """
+    # process_text가 이 모듈을 import하므로 함수 안에서 import
+    from .process_text import TextPostProcessor
+
+    # 해시 전에 stat을 기록해야 그 사이 파일이 바뀌어도 로딩 시 해시로 다시 확인함
+    source_stat = os.stat(dict_path)
+    source_sha256 = file_sha256(dict_path)
+    processor = TextPostProcessor(dict_path)
+    version = hashlib.sha256(f"{FORMAT_VERSION}|{NGRAM_SIZE}|{source_sha256}".encode('utf-8')).hexdigest()[:16]
+
+    if processor.store_item_path:
+        kind = 'store_item'
+        stores = list(processor.store_entries.entries)
+        items = [entry for store in stores for entry in processor.store_item_entries[store.word].entries]
+        arrays = {
+            **_pack_entries('store', stores),
+            **_pack_entries('item', items),
+            'store_item_indptr': np.concatenate(
+                [[0], np.cumsum([len(processor.store_item_entries[store.word]) for store in stores])]
+            ).astype(np.int64),
+            **{f'ngram_{name}': array for name, array in processor.store_entries.arrays().items()},
+        }
+        counts = {'stores': len(stores), 'items': len(items)}
+    else:
+        kind = 'text'
+        index = processor.dictionary_entries
+        arrays = _pack_entries('dictionary', index.entries)
+        if index.indexed:
+            arrays.update({f'index_{name}': array for name, array in index.arrays().items()})
+        counts = {'words': len(index)}
+
+    base = compiled_dir(dict_path)
+    target = os.path.join(base, version)
+    staging = f"{target}.tmp-{os.getpid()}"
+    os.makedirs(staging, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(staging, f'{name}.npy'), np.ascontiguousarray(array))
+    if os.path.isdir(target):
+        shutil.rmtree(target)
+    os.replace(staging, target)
+
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'ngram_size': NGRAM_SIZE,
+        'kind': kind,
+        'version': version,
+        'source': os.path.basename(dict_path),
+        'source_sha256': source_sha256,
+        'source_mtime_ns': source_stat.st_mtime_ns,
+        'source_size': source_stat.st_size,
+        'arrays': sorted(arrays),
+        'counts': counts,
+    }
+    manifest_tmp = os.path.join(base, f'{MANIFEST_NAME}.tmp-{os.getpid()}')
+    with open(manifest_tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(manifest_tmp, os.path.join(base, MANIFEST_NAME))
+
+    # 이전 버전 폴더 정리 (이미 메모리 맵으로 연 파일은 삭제 후에도 계속 읽을 수 있음)
+    for name in os.listdir(base):
+        path = os.path.join(base, name)
+        if name != version and os.path.isdir(path) and '.tmp-' not in name:
+            shutil.rmtree(path, ignore_errors=True)
+    return manifest
+
+def load_compiled(dict_path):
+    """
+    사전 파일의 컴파일 결과를 메모리 맵으로 열어 CompiledDictionary를 반환합니다.
+    결과가 없거나, 형식 버전이 다르거나, 원본 사전 파일 내용과 다르면 None을 반환합니다.
+    원본의 수정 시각(mtime_ns)과 크기가 manifest와 같으면 내용 해시는 생략합니다.
+    """
+    try:
+        with open(manifest_path(dict_path), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('format_version') != FORMAT_VERSION or manifest.get('ngram_size') != NGRAM_SIZE:
+        return None
+    try:
+        stat = os.stat(dict_path)
+        unchanged = (manifest.get('source_mtime_ns'), manifest.get('source_size')) == (stat.st_mtime_ns, stat.st_size)
+        if not unchanged and manifest.get('source_sha256') != file_sha256(dict_path):
+            print(f"⚠️ 사전 컴파일 결과가 원본과 달라 원본을 사용합니다: {dict_path} (build_dictionary로 다시 생성)")
+            return None
+        folder = os.path.join(compiled_dir(dict_path), manifest['version'])
+        # memmap 하위 클래스는 인덱싱마다 비용이 커서, 같은 메모리 맵을 가리키는 일반 ndarray 뷰로 사용
+        arrays = {
+            name: np.load(os.path.join(folder, f'{name}.npy'), mmap_mode='r').view(np.ndarray)
+            for name in manifest['arrays']
+        }
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️ 사전 컴파일 결과 로딩 실패, 원본을 사용합니다: {e}")
+        return None
+    return CompiledDictionary(manifest, arrays)
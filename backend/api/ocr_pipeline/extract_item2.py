@@ -1,7 +1,13 @@
 import re
 import math
 import os
-from .process_text import TextPostProcessor
+from .process_text import get_processor
+
+STORE_ITEM_DICT_PATH = os.path.join(os.path.dirname(__file__), 'dictionary_store_item.json')
+
+# 가게명을 찾을 때 확인할 최대 줄 수 기본값 (None이면 영수증 전체)
+# 사전에 없는 가게의 영수증에서 전체 줄을 비교하지 않도록 제한 (서버에서는 settings.OCR_STORE_HEADER_LINES 사용)
+STORE_HEADER_LINES = 10
 
 def normalize_number(text):
     if not text:
@@ -29,14 +35,14 @@ def extract_numbers_from_line(words):
                 continue
     return numbers
 
-def extract_menu_items_from_lines(lines):
+def extract_menu_items_from_lines(lines, header_lines=STORE_HEADER_LINES):
     """
     사전 기반 유사도 매칭을 사용한 메뉴 항목 추출
-    TextPostProcessor를 사용해서 dictionary_store_item.json 로드
+    dictionary_store_item.json을 사용하는 공유 TextPostProcessor 사용
+    가게명은 앞에서부터 header_lines줄 안에서만 찾습니다. (None이면 전체)
     """
-    # JSON 사전 파일을 사용하는 TextPostProcessor 생성
-    dict_path = os.path.join(os.path.dirname(__file__), 'dictionary_store_item.json')
-    processor = TextPostProcessor(dict_path=dict_path)
+    # JSON 사전 파일을 사용하는 TextPostProcessor (프로세스에서 한 번만 로드)
+    processor = get_processor(STORE_ITEM_DICT_PATH)
     
     menu_items = []
     store_name = None
@@ -45,6 +51,8 @@ def extract_menu_items_from_lines(lines):
     
     # 1) 맨 위부터 읽으면서 가게명 찾기
     for i, line in enumerate(lines):
+        if header_lines is not None and i >= header_lines:
+            break
         line = line.strip()
         if not line:
             continue
@@ -88,33 +96,18 @@ def extract_menu_items_from_lines(lines):
                 break
             
             # 4) 첫 번째 단어부터 시작해서 누적적으로 확장하며 최고 유사도 찾기
-            best_match = None
-            best_score = 0
-            best_end_index = -1
-            best_test_phrase = None  # 실제 매칭된 구문 저장
-            
-            # 첫 번째 단어부터만 시작
-            for k in range(0, len(words)):
-                # 0부터 k까지의 단어들을 합침
-                if k == 0:
-                    # 첫 번째 단어만
-                    test_phrase = words[0]
-                else:
-                    # 여러 단어를 띄어쓰기로 연결
-                    test_phrase = " ".join(words[0:k+1])
-                
-                # 메뉴 사전과 비교
-                match, score = processor.find_best_item_match(test_phrase, store_name)
-                
-                if match and score > best_score:
-                    best_match = match
-                    best_score = score
-                    best_end_index = k
-                    best_test_phrase = test_phrase  # 실제 매칭된 구문 저장
-                
-                # 숫자가 나타나면 더 이상 확장하지 않음
-                if k < len(words) - 1 and is_number_format(words[k+1]):
+            # 숫자가 나타나면 더 이상 확장하지 않음
+            last_index = len(words) - 1
+            for k in range(len(words) - 1):
+                if is_number_format(words[k + 1]):
+                    last_index = k
                     break
+
+            # 모든 누적 구문(words[0:k+1])을 메뉴 사전과 한 번에 비교
+            best_match, best_score, best_end_index = processor.find_best_item_prefix_match(
+                words[:last_index + 1], store_name
+            )
+            best_test_phrase = " ".join(words[:best_end_index + 1]) if best_match else None  # 실제 매칭된 구문
             
             # 최고 매칭이 있다면 처리
             if best_match and best_score >= 0.4:  # 임계값
@@ -1,58 +1,223 @@
-import easyocr
 import re
+import bisect
+import threading
 import numpy as np
 
-# EasyOCR 모델 전역 초기화
-reader = easyocr.Reader(['en', 'ko'], gpu=False)
+DEFAULT_LANGUAGES = ('en', 'ko')
+# 글자 영역 인식(recognizer) 배치 크기
+DEFAULT_BATCH_SIZE = 32
+
+_BARCODE_PATTERN = re.compile(r'\b\d{10,}\b')
+
+# 언어 조합별 EasyOCR Reader 레지스트리 (프로세스 전역, 최초 사용 시 생성)
+_readers = {}
+_readers_lock = threading.Lock()
+
+def get_reader(languages=DEFAULT_LANGUAGES, gpu=False):
+    """
+    언어 조합에 해당하는 EasyOCR Reader를 반환합니다.
+    모델은 처음 요청될 때 한 번만 로드되며, 이후에는 같은 인스턴스를 공유합니다.
+    """
+    key = (tuple(languages), gpu)
+    reader = _readers.get(key)
+    if reader is not None:
+        return reader
+    with _readers_lock:
+        reader = _readers.get(key)
+        if reader is None:
+            import easyocr  # 모델 로드 비용이 크므로 실제로 필요할 때만 import
+            reader = easyocr.Reader(list(languages), gpu=gpu)
+            _readers[key] = reader
+    return reader
+
+def warm_reader(languages=DEFAULT_LANGUAGES, gpu=False):
+    """
+    트래픽을 받기 전에 Reader를 미리 로드합니다.
+    """
+    return get_reader(languages, gpu=gpu)
+
+def _box_arrays(result):
+    """
+    OCR 결과의 bbox들을 (N, 점 개수, 2) 배열로 한 번만 만들어
+    y중심, x최소/최대, y최소/최대 좌표 배열을 반환합니다.
+    """
+    boxes = np.asarray([item[0] for item in result], dtype=np.float64).reshape(len(result), -1, 2)
+    xs, ys = boxes[:, :, 0], boxes[:, :, 1]
+    y_centers = ys.sum(axis=1) / ys.shape[1]
+    return y_centers, xs.min(axis=1), xs.max(axis=1), ys.min(axis=1), ys.max(axis=1)
+
+def _group_starts(sorted_y, threshold):
+    """
+    정렬된 y중심 리스트에서 각 줄이 시작하는 위치를 반환합니다.
+    각 줄의 첫 항목 y중심과의 차이가 threshold 이하인 항목까지 같은 줄입니다.
+    """
+    n = len(sorted_y)
+    starts = []
+    start = 0
+    while start < n:
+        starts.append(start)
+        anchor = sorted_y[start]
+        end = bisect.bisect_right(sorted_y, anchor + threshold, start + 1)
+        # 부동소수점 경계 보정 (|y - anchor| <= threshold 조건과 정확히 일치시키기)
+        while end < n and sorted_y[end] - anchor <= threshold:
+            end += 1
+        while end > start + 1 and sorted_y[end - 1] - anchor > threshold:
+            end -= 1
+        start = end
+    return starts
+
+def _line_order(y_centers, x_min, threshold):
+    """
+    (줄 번호, x최소) 순으로 정렬된 인덱스와 각 줄의 시작 위치를 반환합니다.
+    """
+    order = np.argsort(y_centers, kind='stable')
+    starts = _group_starts(y_centers[order].tolist(), threshold)
+    labels = np.zeros(len(order), dtype=np.intp)
+    labels[starts[1:]] = 1
+    labels = np.cumsum(labels)
+    # lexsort는 안정 정렬이므로 x최소가 같으면 y순서가 유지됨
+    order = order[np.lexsort((x_min[order], labels))]
+    return order, starts
 
 def group_by_y_coordinates(result, threshold=15):
+    """
+    EasyOCR 결과를 y좌표로 묶어 줄별 항목 리스트([[(bbox, text, confidence), ...], ...])로 반환합니다.
+    줄 안의 항목은 group_lines와 같이 왼쪽(x최소)부터 정렬됩니다.
+    """
     if not result:
         return []
-    def get_y_center(item):
-        bbox = item[0]
-        y_values = [point[1] for point in bbox]
-        return sum(y_values) / len(y_values)
-    sorted_result = sorted(result, key=get_y_center)
-    groups = []
-    current_group = [sorted_result[0]]
-    current_y = get_y_center(sorted_result[0])
-    for item in sorted_result[1:]:
-        y_center = get_y_center(item)
-        if abs(y_center - current_y) <= threshold:
-            current_group.append(item)
-        else:
-            groups.append(current_group)
-            current_group = [item]
-            current_y = y_center
-    if current_group:
-        groups.append(current_group)
-    return groups
+    y_centers, x_min = _box_arrays(result)[:2]
+    order, starts = _line_order(y_centers, x_min, threshold)
+    ordered = [result[i] for i in order.tolist()]
+    bounds = starts + [len(order)]
+    return [ordered[bounds[k]:bounds[k + 1]] for k in range(len(starts))]
+
+def group_lines(result, threshold=15):
+    """
+    EasyOCR 결과([(bbox, text, confidence), ...])를 줄 단위로 묶어
+    [{'text': ..., 'bbox': (x_min, y_min, x_max, y_max), 'confidence': 평균 신뢰도}, ...]로 반환합니다.
+    줄 안의 항목은 왼쪽(x최소)부터 정렬되며, 빈 줄은 제외됩니다.
+    """
+    if not result:
+        return []
+    y_centers, x_min, x_max, y_min, y_max = _box_arrays(result)
+    confidences = np.asarray([item[2] if len(item) > 2 else 1.0 for item in result], dtype=np.float64)
+    order, starts = _line_order(y_centers, x_min, threshold)
+
+    # 줄별 bbox와 평균 신뢰도를 한 번에 계산
+    line_x_min = np.minimum.reduceat(x_min[order], starts).tolist()
+    line_y_min = np.minimum.reduceat(y_min[order], starts).tolist()
+    line_x_max = np.maximum.reduceat(x_max[order], starts).tolist()
+    line_y_max = np.maximum.reduceat(y_max[order], starts).tolist()
+    counts = np.diff(starts + [len(order)])
+    line_conf = (np.add.reduceat(confidences[order], starts) / counts).tolist()
+
+    texts = [result[i][1] for i in order.tolist()]
+    bounds = starts + [len(order)]
+    lines = []
+    for k in range(len(starts)):
+        line_text = " ".join(texts[bounds[k]:bounds[k + 1]])
+        line_text = _BARCODE_PATTERN.sub('', line_text)  # 바코드 등 긴 숫자 제거
+        if not line_text.strip():
+            continue
+        lines.append({
+            'text': line_text.strip(),
+            'bbox': (line_x_min[k], line_y_min[k], line_x_max[k], line_y_max[k]),
+            'confidence': line_conf[k],
+        })
+    return lines
+
+def lines_from_ocr_result(ocr_result):
+    """
+    EasyOCR 결과([(bbox, text, confidence), ...])를 y좌표로 묶어 줄 단위 텍스트 리스트로 변환
+    """
+    return [line['text'] for line in group_lines(ocr_result)]
 
 def ocr_image_from_memory(np_img):
     """
     단일 numpy 이미지에 대해 줄 단위 텍스트 리스트 반환
     """
     try:
-        ocr_result = reader.readtext(np_img)
-        grouped = group_by_y_coordinates(ocr_result)
-        lines = []
-        for group in grouped:
-            sorted_group = sorted(group, key=lambda x: min(point[0] for point in x[0]))
-            line_text = " ".join(item[1] for item in sorted_group)
-            line_text = re.sub(r'\b\d{10,}\b', '', line_text)  # 바코드 등 긴 숫자 제거
-            if line_text.strip():
-                lines.append(line_text.strip())
+        ocr_result = get_reader().readtext(np_img)
+        lines = lines_from_ocr_result(ocr_result)
         print(f"✅ OCR 완료")
         return lines
     except Exception as e:
         print(f"OCR 실패: {e}")
         return []
 
+def readtext_batched(reader, np_imgs, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    여러 이미지에 대해 reader.readtext와 같은 형식의 결과 리스트를 이미지별로 반환합니다.
+
+    텍스트 영역 검출은 이미지별로 수행하고, 인식(recognizer)은 모든 이미지의 글자 영역을
+    모아 batch_size 단위로 한 번에 처리합니다. 글자 영역은 readtext가 영역 하나씩 인식할 때와
+    같은 폭으로 패딩되도록 폭별로 묶어 처리하므로 결과가 readtext와 동일합니다.
+    """
+    from easyocr.config import imgH
+    from easyocr.recognition import get_text
+    from easyocr.utils import get_image_list, reformat_input
+
+    ignore_char = ''.join(set(reader.character) - set(reader.lang_char))
+
+    # 1) 이미지별 텍스트 영역 검출 후, 글자 영역 crop을 패딩 폭별로 모음
+    buckets = {}  # max_width → [(이미지 번호, 영역 순서, (box, crop)), ...]
+    for img_idx, np_img in enumerate(np_imgs):
+        img, img_cv_grey = reformat_input(np_img)
+        horizontal_list, free_list = reader.detect(img, reformat=False)
+        boxes = [([bbox], []) for bbox in horizontal_list[0]] + [([], [bbox]) for bbox in free_list[0]]
+        for box_idx, (h_list, f_list) in enumerate(boxes):
+            image_list, max_width = get_image_list(h_list, f_list, img_cv_grey, model_height=imgH)
+            for entry in image_list:
+                buckets.setdefault(int(max_width), []).append((img_idx, box_idx, entry))
+
+    # 2) 같은 폭의 crop끼리 큰 배치로 인식
+    recognized = [[] for _ in np_imgs]
+    for max_width, entries in buckets.items():
+        # readtext 기본값과 같은 인식 옵션 (easyocr 1.7 get_text 시그니처 기준)
+        texts = get_text(
+            reader.character, imgH, max_width, reader.recognizer, reader.converter,
+            [entry for _, _, entry in entries],
+            ignore_char=ignore_char, decoder='greedy', beamWidth=5, batch_size=batch_size,
+            contrast_ths=0.1, adjust_contrast=0.5, filter_ths=0.003, workers=0, device=reader.device,
+        )
+        for (img_idx, box_idx, _), text in zip(entries, texts):
+            recognized[img_idx].append((box_idx, text))
+
+    # 3) 이미지별로 readtext와 같은 순서(검출 순서)로 정렬
+    return [[text for _, text in sorted(items, key=lambda x: x[0])] for items in recognized]
+
+def ocr_images_from_memory(np_imgs, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    여러 numpy 이미지에 대해 이미지별 줄 단위 텍스트 리스트를 반환합니다.
+    결과는 이미지마다 ocr_image_from_memory를 호출한 것과 같으며, None인 이미지는 빈 리스트입니다.
+    batch_size가 1 이하이면 이미지마다 readtext를 호출합니다.
+    """
+    np_imgs = list(np_imgs)
+    valid = [i for i, np_img in enumerate(np_imgs) if np_img is not None]
+    results = [[] for _ in np_imgs]
+    if batch_size <= 1:
+        for i in valid:
+            results[i] = ocr_image_from_memory(np_imgs[i])
+        return results
+
+    try:
+        ocr_results = readtext_batched(get_reader(), [np_imgs[i] for i in valid], batch_size=batch_size)
+        for i, ocr_result in zip(valid, ocr_results):
+            results[i] = lines_from_ocr_result(ocr_result)
+        print(f"✅ OCR 완료 ({len(valid)}장 일괄 처리)")
+    except Exception as e:
+        # 일괄 처리 실패 시 이미지별 처리로 대체 (실패한 이미지만 빈 결과)
+        print(f"⚠️ 일괄 OCR 실패, 이미지별 처리로 전환: {e}")
+        for i in valid:
+            results[i] = ocr_image_from_memory(np_imgs[i])
+    return results
+
 # 사용 예시:
-# from preprocessing import preprocess_folder_to_memory
-# bin_imgs = preprocess_folder_to_memory('media/receipts/')
-# text_results = ocr_images_from_memory(bin_imgs)
-# for base_name, lines in text_results:
-#     print(f"{base_name}:")
+# from preprocessing import preprocess_image_to_memory
+# bin_imgs = [preprocess_image_to_memory(path) for path in image_paths]
+# text_results = ocr_images_from_memory(bin_imgs, batch_size=32)
+# for path, lines in zip(image_paths, text_results):
+#     print(f"{path}:")
 #     for line in lines:
 #         print(line)
\ No newline at end of file
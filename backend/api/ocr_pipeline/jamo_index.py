@@ -0,0 +1,595 @@
+from collections import Counter, namedtuple
+from collections.abc import Sequence
+import numpy as np
+import Levenshtein
+from rapidfuzz.process import cdist
+from rapidfuzz.distance import Indel, Jaro
+
+# 사전 단어 레코드: 원문, 자모 분해 문자열, 원문 길이 (사전 로딩 시 한 번만 계산)
+DictEntry = namedtuple('DictEntry', ['word', 'jamo', 'length'])
+
+# 이보다 작은 사전은 색인 없이 전체를 비교하는 편이 빠름
+INDEX_MIN_ENTRIES = 128
+
+# 상한값 비교 시 부동소수점 오차 여유
+_EPS = 1e-9
+
+def jamo_similarity(len1, jamo1, entry):
+    """
+    이미 분해된 질의(jamo1, 원문 길이 len1)와 사전 레코드 간 유사도.
+    두 단어 중 하나라도 2글자 이하이면 Jaro, 아니면 Levenshtein ratio를 사용하고,
+    사전 단어가 질의보다 짧으면 글자 수 차이만큼 감점합니다.
+    """
+    if len1 <= 2 or entry.length <= 2:
+        similarity = Levenshtein.jaro(jamo1, entry.jamo)
+    else:
+        similarity = Levenshtein.ratio(jamo1, entry.jamo)
+    len_diff = entry.length - len1
+    if len_diff < 0:
+        similarity += 0.1 * len_diff
+    return max(0, min(1, similarity))
+
+def _is_better(similarity, length, rank, best_similarity, best_length, best_rank):
+    # 선형 탐색과 같은 우선순위: 유사도 → 긴 단어 → 사전에서 먼저 나온 단어
+    if similarity != best_similarity:
+        return similarity > best_similarity
+    if length != best_length:
+        return length > best_length
+    return rank < best_rank
+
+def linear_best_match(entries, target, target_jamo, threshold):
+    """
+    레코드를 순서대로 모두 비교하여 가장 유사한 레코드의 (단어, 유사도)를 반환하고,
+    기준값 미만이면 (None, 0)을 반환합니다.
+    """
+    target_len = len(target)
+    best_match = None
+    best_len = 0
+    max_similarity = 0
+
+    for entry in entries:
+        if abs(target_len - entry.length) > target_len / 2:
+            continue
+        similarity = jamo_similarity(target_len, target_jamo, entry)
+        if similarity > max_similarity:
+            max_similarity = similarity
+            best_match = entry.word
+            best_len = entry.length
+        elif similarity == max_similarity and entry.length > best_len:
+            best_match = entry.word
+            best_len = entry.length
+
+    return (best_match, max_similarity) if max_similarity >= threshold else (None, 0)
+
+# 질의 하나를 비교할 때 이보다 작은 후보 목록은 cdist보다 하나씩 비교하는 편이 빠름
+# (여러 질의를 행렬로 비교할 때는 크기와 관계없이 cdist가 빠름)
+BATCH_MIN_ENTRIES = 48
+
+def _best_columns(scores, lengths):
+    """
+    유사도 행렬(후보가 아닌 칸은 -1)의 행마다 최고 유사도와 그 열을 반환합니다.
+    선형 탐색과 같은 우선순위: 유사도 → 긴 단어 → 사전에서 먼저 나온 단어
+    """
+    row_max = scores.max(axis=1)
+    tied_lengths = np.where(scores == row_max[:, None], lengths, -1)
+    return row_max.tolist(), tied_lengths.argmax(axis=1).tolist()
+
+class BatchScorer:
+    """
+    후보 레코드 배열 전체와의 유사도를 rapidfuzz cdist 호출로 한 번에 계산합니다.
+    유사도 규칙(2글자 이하는 Jaro, 나머지는 Levenshtein ratio, 짧은 사전 단어 감점)은 jamo_similarity와 같습니다.
+    """
+
+    def __init__(self, entries):
+        self.entries = list(entries)
+        self._jamos = [entry.jamo for entry in self.entries]
+        self._lengths = np.array([entry.length for entry in self.entries], dtype=np.int64)
+        self._short = np.flatnonzero(self._lengths <= 2)
+        self._short_jamos = [self._jamos[i] for i in self._short.tolist()]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def matrix(self, targets, target_jamos):
+        """질의 × 후보 유사도 행렬 (여러 질의를 한 번에 비교)"""
+        target_jamos = list(target_jamos)
+        target_lengths = np.array([len(target) for target in targets], dtype=np.int64)[:, None]
+        scores = cdist(target_jamos, self._jamos, scorer=Indel.normalized_similarity, dtype=np.float64)
+
+        # 두 단어 중 하나라도 2글자 이하이면 Jaro
+        short_rows = np.flatnonzero(target_lengths[:, 0] <= 2).tolist()
+        if short_rows:
+            scores[short_rows] = cdist(
+                [target_jamos[i] for i in short_rows], self._jamos,
+                scorer=Jaro.normalized_similarity, dtype=np.float64,
+            )
+        if len(self._short):
+            scores[:, self._short] = cdist(
+                target_jamos, self._short_jamos, scorer=Jaro.normalized_similarity, dtype=np.float64
+            )
+        return np.clip(scores + 0.1 * np.minimum(self._lengths - target_lengths, 0), 0, 1)
+
+    def scores(self, target, target_jamo):
+        """질의 하나와 모든 후보의 유사도 배열"""
+        return self.matrix([target], [target_jamo])[0]
+
+    def best_matches(self, targets, target_jamos, threshold):
+        """
+        질의마다 가장 유사한 레코드의 (단어, 유사도)를 반환하고, 기준값 미만이면 (None, 0)을 반환합니다.
+        결과는 질의마다 linear_best_match를 호출한 것과 같습니다.
+        """
+        if not len(targets):
+            return []
+        if not self.entries:
+            return [(None, 0)] * len(targets)
+        scores = self.matrix(targets, target_jamos)
+        target_lengths = np.array([len(target) for target in targets], dtype=np.int64)[:, None]
+        scores[np.abs(target_lengths - self._lengths) > target_lengths / 2] = -1
+
+        results = []
+        for max_similarity, column in zip(*_best_columns(scores, self._lengths)):
+            if max_similarity >= threshold and max_similarity >= 0:
+                results.append((self.entries[column].word, max_similarity))
+            else:
+                results.append((None, 0))
+        return results
+
+    def best_match(self, target, target_jamo, threshold):
+        return self.best_matches([target], [target_jamo], threshold)[0]
+
+class JamoIndex:
+    """
+    사전 레코드의 후보 색인.
+
+    레코드를 원문 길이 순으로 정렬해(길이 버킷) 길이 조건을 만족하는 구간만 보고,
+    자모 문자별 등장 횟수 색인으로 질의와 공통 자모 수를 구해 각 후보 유사도의 상한을 계산합니다.
+    (Levenshtein ratio와 Jaro 모두 공통 자모 수 이상으로 일치할 수 없음)
+    상한이 기준값이나 현재 최고 유사도보다 낮은 후보는 비교하지 않으므로
+    결과는 전체를 순서대로 비교한 것과 같습니다.
+    """
+
+    def __init__(self, entries, min_entries=INDEX_MIN_ENTRIES):
+        self.entries = list(entries)
+        self.indexed = len(self.entries) >= min_entries
+        # 색인 없이 전체를 비교할 때는 cdist 호출로 한 번에 계산
+        self.scorer = None if self.indexed else BatchScorer(self.entries)
+        if self.indexed:
+            self._build()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _build(self):
+        order = sorted(range(len(self.entries)), key=lambda i: self.entries[i].length)
+        # 길이 순 위치 → 원래 레코드 위치
+        self._order = np.array(order, dtype=np.int64)
+        self._length_array = np.array([self.entries[i].length for i in order], dtype=np.int64)
+        self._jamo_lengths = np.array([len(self.entries[i].jamo) for i in order], dtype=np.float64)
+
+        # 자모 문자 → (정렬된 레코드 위치 배열, 등장 횟수 배열)
+        postings = {}
+        for pos, i in enumerate(order):
+            for char, count in Counter(self.entries[i].jamo).items():
+                rows, counts = postings.setdefault(char, ([], []))
+                rows.append(pos)
+                counts.append(count)
+        self._postings = {
+            char: (np.array(rows, dtype=np.int64), np.array(counts, dtype=np.int64))
+            for char, (rows, counts) in postings.items()
+        }
+
+    def arrays(self):
+        """
+        색인을 {이름: NumPy 배열}로 반환합니다. (자모 문자별 색인은 CSR 형식으로 이어 붙임)
+        from_arrays로 같은 색인을 복원할 수 있습니다.
+        """
+        if not self.indexed:
+            raise ValueError("색인이 없는 JamoIndex입니다")
+        chars = sorted(self._postings)
+        rows = [self._postings[char][0] for char in chars]
+        return {
+            'order': self._order,
+            'lengths': self._length_array,
+            'jamo_lengths': self._jamo_lengths,
+            'posting_chars': np.array([ord(char) for char in chars], dtype=np.int32),
+            'posting_indptr': np.concatenate([[0], np.cumsum([len(r) for r in rows])]).astype(np.int64),
+            'posting_rows': np.concatenate(rows or [np.empty(0, dtype=np.int64)]),
+            'posting_counts': np.concatenate(
+                [self._postings[char][1] for char in chars] or [np.empty(0, dtype=np.int64)]
+            ),
+        }
+
+    @classmethod
+    def from_arrays(cls, entries, arrays):
+        """
+        arrays()로 만든 배열에서 색인을 복원합니다.
+        배열은 복사하지 않으므로 메모리 맵 배열을 그대로 사용할 수 있고,
+        entries는 레코드를 위치로 읽을 수 있는 시퀀스면 됩니다.
+        """
+        index = cls.__new__(cls)
+        index.entries = entries
+        index.indexed = True
+        index.scorer = None
+        index._order = arrays['order']
+        index._length_array = arrays['lengths']
+        index._jamo_lengths = arrays['jamo_lengths']
+        indptr = arrays['posting_indptr'].tolist()
+        rows, counts = arrays['posting_rows'], arrays['posting_counts']
+        index._postings = {
+            chr(char): (rows[start:end], counts[start:end])
+            for char, start, end in zip(arrays['posting_chars'].tolist(), indptr, indptr[1:])
+        }
+        return index
+
+    def best_match(self, target, target_jamo, threshold):
+        """
+        가장 유사한 레코드의 (단어, 유사도)를 반환하고, 기준값 미만이면 (None, 0)을 반환합니다.
+        """
+        if self.scorer is not None and len(self.entries) >= BATCH_MIN_ENTRIES:
+            return self.scorer.best_match(target, target_jamo, threshold)
+        if not self.indexed or threshold <= 0:
+            return linear_best_match(self.entries, target, target_jamo, threshold)
+
+        target_len = len(target)
+        # abs(target_len - length) <= target_len / 2 인 구간
+        lo = int(np.searchsorted(self._length_array, target_len / 2, side='left'))
+        hi = int(np.searchsorted(self._length_array, target_len * 1.5, side='right'))
+        if lo >= hi:
+            return None, 0
+
+        common = np.zeros(hi - lo, dtype=np.float64)
+        for char, query_count in Counter(target_jamo).items():
+            posting = self._postings.get(char)
+            if posting is None:
+                continue
+            rows, counts = posting
+            start, end = np.searchsorted(rows, (lo, hi))
+            common[rows[start:end] - lo] += np.minimum(counts[start:end], query_count)
+
+        lengths = self._length_array[lo:hi]
+        len1 = float(len(target_jamo))
+        len2 = self._jamo_lengths[lo:hi]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio_bound = 2 * common / (len1 + len2)
+            jaro_bound = np.where(common > 0, (common / len1 + common / len2 + 1) / 3, 0.0)
+        bounds = np.where((target_len <= 2) | (lengths <= 2), jaro_bound, ratio_bound)
+        bounds = bounds + 0.1 * np.minimum(lengths - target_len, 0)
+        bounds = np.clip(bounds, 0, 1)
+
+        candidates = np.flatnonzero(bounds >= threshold - _EPS)
+        candidates = candidates[np.argsort(-bounds[candidates], kind='stable')]
+
+        best_match = None
+        best_len = 0
+        best_rank = len(self.entries)
+        max_similarity = 0
+        for pos in candidates.tolist():
+            if bounds[pos] < max_similarity - _EPS:
+                break
+            rank = int(self._order[lo + pos])
+            entry = self.entries[rank]
+            similarity = jamo_similarity(target_len, target_jamo, entry)
+            if _is_better(similarity, entry.length, rank, max_similarity, best_len, best_rank):
+                max_similarity = similarity
+                best_match = entry.word
+                best_len = entry.length
+                best_rank = rank
+
+        return (best_match, max_similarity) if max_similarity >= threshold else (None, 0)
+
+    def best_matches(self, targets, target_jamos, threshold):
+        """
+        여러 질의의 best_match 결과 리스트. 색인 없이 전체를 비교하는 사전은 행렬 한 번으로 계산합니다.
+        """
+        if self.scorer is not None and (len(targets) > 1 or len(self.entries) >= BATCH_MIN_ENTRIES):
+            return self.scorer.best_matches(targets, target_jamos, threshold)
+        return [
+            self.best_match(target, target_jamo, threshold)
+            for target, target_jamo in zip(targets, target_jamos)
+        ]
+
+# 가게명 후보를 고를 때 사용하는 자모 n-gram 길이와 후보 수
+NGRAM_SIZE = 2
+SHORTLIST_SIZE = 20
+
+def _ngrams(jamo, n=NGRAM_SIZE):
+    # 앞뒤 경계 문자를 붙여 짧은 단어도 n-gram을 갖도록 함
+    padded = f"\0{jamo}\0"
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+class _AppendedEntries(Sequence):
+    # 원본 레코드 시퀀스 뒤에 추가된 레코드를 이어 붙인 읽기 전용 시퀀스 (원본은 복사하지 않음)
+
+    def __init__(self, base, extra):
+        self._base = base
+        self._extra = extra
+
+    def __len__(self):
+        return len(self._base) + len(self._extra)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if i < len(self._base):
+            return self._base[i]
+        return self._extra[i - len(self._base)]
+
+class NgramIndex:
+    """
+    자모 n-gram 역색인. 질의와 공통 n-gram 비율(Dice 계수)이 높은 상위 k개 레코드만 후보로 골라 비교합니다.
+    레코드가 k개 이하이면 전체를 비교하므로 결과가 선형 탐색과 같습니다.
+
+    with_entry / without_entry로 만든 색인은 원본 역색인을 그대로 두고, 추가된 레코드의 역색인과
+    삭제된 행 번호만 따로 들고 있습니다. 삭제된 행은 후보에서 빠질 뿐 뒤쪽 행 번호는 바뀌지 않습니다.
+    """
+
+    def __init__(self, entries, n=NGRAM_SIZE, shortlist_size=SHORTLIST_SIZE):
+        self.entries = list(entries)
+        self.n = n
+        self.shortlist_size = shortlist_size
+
+        postings = {}
+        gram_counts = []
+        for i, entry in enumerate(self.entries):
+            grams = _ngrams(entry.jamo, n)
+            gram_counts.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(i)
+        self._postings = {gram: np.array(rows, dtype=np.int64) for gram, rows in postings.items()}
+        self._gram_counts = np.array(gram_counts, dtype=np.float64)
+        self._init_overlay()
+
+    def _init_overlay(self):
+        self._base_entries = self.entries
+        self._base_size = len(self.entries)
+        self._extra_entries = ()
+        self._extra_postings = {}
+        self._extra_counts = {}
+        self._extra_rows = {}
+        self._removed = frozenset()
+
+    def arrays(self):
+        """
+        색인을 {이름: NumPy 배열}로 반환합니다. (n-gram은 글자 코드 행렬, 역색인은 CSR 형식)
+        from_arrays로 같은 색인을 복원할 수 있습니다.
+        """
+        if self._extra_entries or self._removed:
+            raise ValueError("레코드가 추가/삭제된 색인은 배열로 저장할 수 없습니다. 사전에서 다시 만들어 주세요.")
+        grams = sorted(self._postings)
+        rows = [self._postings[gram] for gram in grams]
+        return {
+            'gram_codes': np.array([[ord(char) for char in gram] for gram in grams], dtype=np.int32).reshape(-1, self.n),
+            'gram_indptr': np.concatenate([[0], np.cumsum([len(r) for r in rows])]).astype(np.int64),
+            'gram_rows': np.concatenate(rows or [np.empty(0, dtype=np.int64)]),
+            'gram_counts': self._gram_counts,
+        }
+
+    @classmethod
+    def from_arrays(cls, entries, arrays, shortlist_size=SHORTLIST_SIZE):
+        """arrays()로 만든 배열(메모리 맵 배열 가능)에서 복사 없이 색인을 복원합니다."""
+        index = cls.__new__(cls)
+        index.entries = entries
+        index.n = arrays['gram_codes'].shape[1]
+        index.shortlist_size = shortlist_size
+        indptr = arrays['gram_indptr'].tolist()
+        rows = arrays['gram_rows']
+        index._postings = {
+            ''.join(map(chr, codes)): rows[start:end]
+            for codes, start, end in zip(arrays['gram_codes'].tolist(), indptr, indptr[1:])
+        }
+        index._gram_counts = arrays['gram_counts']
+        index._init_overlay()
+        return index
+
+    def __len__(self):
+        """삭제되지 않은 레코드 수"""
+        return len(self.entries) - len(self._removed)
+
+    def _copy(self, **overlay):
+        index = NgramIndex.__new__(NgramIndex)
+        index.__dict__.update(self.__dict__)
+        index.__dict__.update(overlay)
+        index.entries = _AppendedEntries(self._base_entries, index._extra_entries) if index._extra_entries else self._base_entries
+        return index
+
+    def with_entry(self, entry):
+        """
+        entry를 맨 뒤에 추가한 새 색인을 반환합니다. (기존 색인은 그대로 두므로 검색 중인 스레드에 안전)
+        새 레코드의 n-gram만 추가 역색인에 넣으므로 원본 역색인은 복사하지 않습니다.
+        """
+        row = len(self.entries)
+        grams = _ngrams(entry.jamo, self.n)
+        extra_postings = dict(self._extra_postings)
+        for gram in grams:
+            extra_postings[gram] = extra_postings.get(gram, ()) + (row,)
+        return self._copy(
+            _extra_entries=self._extra_entries + (entry,),
+            _extra_postings=extra_postings,
+            _extra_counts={**self._extra_counts, row: float(len(grams))},
+            _extra_rows={**self._extra_rows, entry.word: row},
+        )
+
+    def without_entry(self, row):
+        """row번째 레코드를 뺀 새 색인을 반환합니다. (행 번호는 그대로 두고 후보에서만 제외)"""
+        extra_rows = {word: r for word, r in self._extra_rows.items() if r != row}
+        return self._copy(_removed=self._removed | {row}, _extra_rows=extra_rows)
+
+    def added_row(self, word):
+        """with_entry로 추가된 레코드 중 word의 행 번호 (없으면 None)"""
+        return self._extra_rows.get(word)
+
+    def _live_rows(self):
+        return [row for row in range(len(self.entries)) if row not in self._removed]
+
+    def shortlist(self, target_jamo):
+        """공통 n-gram 비율 상위 후보 레코드들의 위치 (사전 순서)"""
+        if len(self) <= self.shortlist_size:
+            return self._live_rows() if self._removed else range(len(self.entries))
+
+        grams = _ngrams(target_jamo, self.n)
+        # 질의 n-gram의 역색인 목록만 모아 레코드별 공통 n-gram 수를 셈 (사전 크기만큼의 배열을 만들지 않음)
+        matched = [rows for rows in map(self._postings.get, grams) if rows is not None]
+        if self._extra_postings:
+            matched += [np.array(rows, dtype=np.int64) for rows in map(self._extra_postings.get, grams) if rows]
+        if not matched:
+            return []
+        candidates, shared = np.unique(np.concatenate(matched), return_counts=True)
+        if self._removed:
+            keep = ~np.isin(candidates, list(self._removed))
+            candidates, shared = candidates[keep], shared[keep]
+        if len(candidates) > self.shortlist_size:
+            # 원본 레코드는 원본 배열에서, 추가된 레코드는 추가분 dict에서 n-gram 수를 읽음
+            split = np.searchsorted(candidates, self._base_size)
+            counts = np.empty(len(candidates), dtype=np.float64)
+            counts[:split] = self._gram_counts[candidates[:split]]
+            counts[split:] = [self._extra_counts[row] for row in candidates[split:].tolist()]
+            dice = 2 * shared / (counts + len(grams))
+            # 비율이 같으면 사전에서 먼저 나온 레코드 우선
+            top = np.argsort(-dice, kind='stable')[:self.shortlist_size]
+            candidates = np.sort(candidates[top])
+        return candidates.tolist()
+
+    def best_match(self, target, target_jamo, threshold):
+        """
+        후보 레코드 중 가장 유사한 레코드의 (단어, 유사도)를 반환하고, 기준값 미만이면 (None, 0)을 반환합니다.
+        """
+        entries = [self.entries[i] for i in self.shortlist(target_jamo)]
+        return linear_best_match(entries, target, target_jamo, threshold)
+
+# 비트 병렬 LCS에서 레코드 하나가 차지하는 비트 수 (최상위 비트는 자리올림 차단용)
+_SLOT_BITS = 64
+
+# 누적 구문 일괄 비교가 구문별 비교보다 빠른 메뉴 크기 구간
+# (더 작으면 NumPy 호출 비용이, 더 크면 JamoIndex의 후보 제외 효과가 더 큼)
+PREFIX_MATCH_MIN_ENTRIES = 32
+PREFIX_MATCH_MAX_ENTRIES = 2048
+
+class PrefixMatcher:
+    """
+    한 줄의 누적 구문(첫 단어, 첫 두 단어, ...)을 사전 레코드 전체와 한 번에 비교하는 매처.
+
+    Levenshtein ratio는 최장 공통 부분 수열(LCS) 길이로 정해지므로,
+    모든 레코드의 비트 병렬 LCS 상태(Hyyrö)를 64비트 칸으로 나눠 정수 하나에 담고
+    구문의 자모를 한 글자씩 한 번만 읽으며 갱신합니다.
+    단어 경계마다 저장한 상태에서 모든 누적 구문 × 레코드의 유사도 행렬을 계산하므로
+    구문마다 전체 레코드를 다시 비교하지 않습니다.
+    결과는 누적 구문마다 JamoIndex.best_match를 호출한 것과 같으며,
+    메뉴 크기가 일괄 비교에 유리한 구간을 벗어나면 실제로 구문마다 index.best_match를 호출합니다.
+    """
+
+    def __init__(self, index, min_entries=PREFIX_MATCH_MIN_ENTRIES, max_entries=PREFIX_MATCH_MAX_ENTRIES):
+        self.index = index
+        self.entries = index.entries
+        self.bit_parallel = min_entries <= len(self.entries) < max_entries
+        if self.bit_parallel:
+            self._build()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _build(self):
+        self._lengths = np.array([entry.length for entry in self.entries], dtype=np.int64)
+        self._jamo_lengths = np.array([len(entry.jamo) for entry in self.entries], dtype=np.int64)
+
+        # 자모가 63자 이하인 레코드만 비트 칸에 담고, 더 긴 레코드는 직접 비교
+        self._slots = [i for i, entry in enumerate(self.entries) if len(entry.jamo) < _SLOT_BITS]
+        self._long = [i for i, entry in enumerate(self.entries) if len(entry.jamo) >= _SLOT_BITS]
+
+        masks = {}
+        guards = 0
+        for slot, i in enumerate(self._slots):
+            offset = slot * _SLOT_BITS
+            for j, char in enumerate(self.entries[i].jamo):
+                masks[char] = masks.get(char, 0) | (1 << (offset + j))
+            guards |= 1 << (offset + _SLOT_BITS - 1)
+        self._masks = masks
+        self._clear_guards = ((1 << (len(self._slots) * _SLOT_BITS)) - 1) ^ guards
+        self._low_masks = np.array(
+            [(1 << len(self.entries[i].jamo)) - 1 for i in self._slots], dtype=np.uint64
+        )
+        self._jamos = [entry.jamo for entry in self.entries]
+        self._long_jamos = [self._jamos[i] for i in self._long]
+        # 2글자 이하 레코드는 항상 Jaro로 비교
+        self._short = [i for i, entry in enumerate(self.entries) if entry.length <= 2]
+        self._short_jamos = [self._jamos[i] for i in self._short]
+
+    def _lcs_rows(self, jamo, boundaries):
+        """각 경계(누적 구문의 자모 길이)까지 읽었을 때 레코드별 LCS 길이 행렬"""
+        slots = len(self._slots)
+        state = self._clear_guards
+        states = []
+        position = 0
+        for boundary in boundaries:
+            for char in jamo[position:boundary]:
+                mask = self._masks.get(char)
+                if mask:
+                    matched = state & mask
+                    state = ((state + matched) | (state - matched)) & self._clear_guards
+            position = boundary
+            states.append(state)
+        data = b''.join(state.to_bytes(slots * 8, 'little') for state in states)
+        rows = np.frombuffer(data, dtype='<u8').reshape(len(states), slots)
+        return np.bitwise_count(~rows & self._low_masks).astype(np.int64)
+
+    def best_prefix_match(self, words, word_jamos, threshold):
+        """
+        words[:k+1]을 띄어쓰기로 이은 누적 구문들 중 유사도가 가장 높은 매치를 (단어, 유사도, k)로 반환합니다.
+        word_jamos는 각 단어의 자모 분해 문자열입니다.
+        유사도가 같으면 짧은 구문을 우선하며, 기준값 이상인 매치가 없으면 (None, 0, -1)을 반환합니다.
+        """
+        if not words or not self.entries:
+            return None, 0, -1
+        if not self.bit_parallel:
+            return self._per_prefix_match(words, word_jamos, threshold)
+
+        jamo = ' '.join(word_jamos)
+        boundaries = (np.cumsum([len(word_jamo) for word_jamo in word_jamos]) + np.arange(len(words))).tolist()
+        prefixes = [jamo[:boundary] for boundary in boundaries]
+        target_lengths = (np.cumsum([len(word) for word in words]) + np.arange(len(words)))[:, None]
+
+        # 누적 구문 × 레코드 유사도 행렬 (Levenshtein ratio)
+        scores = np.empty((len(words), len(self.entries)), dtype=np.float64)
+        if self._slots:
+            lcs = self._lcs_rows(jamo, boundaries)
+            lensum = np.array(boundaries, dtype=np.int64)[:, None] + self._jamo_lengths[self._slots]
+            scores[:, self._slots] = 1.0 - (lensum - 2 * lcs) / lensum
+        if self._long:
+            scores[:, self._long] = cdist(prefixes, self._long_jamos, scorer=Indel.normalized_similarity, dtype=np.float64)
+
+        # 두 단어 중 하나라도 2글자 이하이면 Jaro (길이 조건을 만족하는 후보만 계산)
+        in_window = np.abs(target_lengths - self._lengths) <= target_lengths / 2
+        if self._short:
+            scores[:, self._short] = cdist(prefixes, self._short_jamos, scorer=Jaro.normalized_similarity, dtype=np.float64)
+        for k in np.flatnonzero(target_lengths[:, 0] <= 2).tolist():
+            columns = np.flatnonzero(in_window[k])
+            if len(columns):
+                scores[k, columns] = cdist(
+                    prefixes[k:k + 1], [self._jamos[i] for i in columns.tolist()],
+                    scorer=Jaro.normalized_similarity, dtype=np.float64,
+                )[0]
+        scores = np.clip(scores + 0.1 * np.minimum(self._lengths - target_lengths, 0), 0, 1)
+        scores[~in_window] = -1
+
+        # 누적 구문별 최고 매치
+        row_max, best_columns = _best_columns(scores, self._lengths)
+
+        best_match, best_score, best_end_index = None, 0, -1
+        for k, (max_similarity, column) in enumerate(zip(row_max, best_columns)):
+            if max_similarity < threshold:
+                continue
+            match = self.entries[column].word
+            if match and max_similarity > best_score:
+                best_match, best_score, best_end_index = match, max_similarity, k
+        return best_match, best_score, best_end_index
+
+    def _per_prefix_match(self, words, word_jamos, threshold):
+        best_match, best_score, best_end_index = None, 0, -1
+        for k in range(len(words)):
+            match, score = self.index.best_match(
+                " ".join(words[:k + 1]), " ".join(word_jamos[:k + 1]), threshold
+            )
+            if match and score > best_score:
+                best_match, best_score, best_end_index = match, score, k
+        return best_match, best_score, best_end_index
@@ -2,6 +2,9 @@ import cv2
 import numpy as np
 import os
 
+# 영수증 윤곽 검출에 사용할 축소 이미지의 가로 크기 (None이면 원본 해상도에서 검출)
+DETECT_WIDTH = 1000
+
 def four_point_transform(image, pts):
     rect = np.zeros((4, 2), dtype="float32")
     s = pts.sum(axis=1)
@@ -27,25 +30,19 @@ def four_point_transform(image, pts):
     M = cv2.getPerspectiveTransform(rect, dst)
     return cv2.warpPerspective(image, M, (maxW, maxH))
 
-def detect_and_crop_mask(org_path):
+def find_receipt_corners(image):
     """
-    마스크 기반으로 영수증을 크롭한 컬러 이미지를 리턴합니다.
+    마스크 기반으로 영수증(종이) 영역의 네 꼭짓점을 찾아 (4, 2) float32 배열로 리턴합니다.
     """
-    org = cv2.imread(org_path)
-    if org is None:
-        raise FileNotFoundError(f"이미지를 찾을 수 없습니다: {org_path}")
-
-    base_name = os.path.splitext(os.path.basename(org_path))[0]
-
     # 1) 그레이스케일 → OTSU 역이진화로 종이 마스크 생성
-    gray_full = cv2.cvtColor(org, cv2.COLOR_BGR2GRAY)
+    gray_full = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     _, mask = cv2.threshold(
         gray_full, 0, 255,
         cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU
     )
 
     # 2) 모폴로지 Closing → 틈·구멍 메우기
-    h, w = org.shape[:2]
+    h, w = image.shape[:2]
     kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (w//20, h//20))
     mask_closed = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
 
@@ -65,6 +62,50 @@ def detect_and_crop_mask(org_path):
     else:
         rect = cv2.minAreaRect(c)
         pts = cv2.boxPoints(rect).astype("float32")
+    return pts
+
+def load_image(source):
+    """
+    이미지 파일 경로, 인코딩된 이미지 바이트(bytes/bytearray/memoryview) 또는
+    이미 디코딩된 numpy 이미지를 받아 BGR 컬러 이미지로 리턴합니다.
+    """
+    if isinstance(source, np.ndarray):
+        return source
+    if isinstance(source, (str, os.PathLike)):
+        org = cv2.imread(os.fspath(source))
+        if org is None:
+            raise FileNotFoundError(f"이미지를 찾을 수 없습니다: {source}")
+        return org
+
+    # 업로드된 바이트를 복사 없이 디코딩
+    buf = np.frombuffer(memoryview(source), dtype=np.uint8)
+    org = cv2.imdecode(buf, cv2.IMREAD_COLOR)
+    if org is None:
+        raise ValueError("이미지를 디코딩할 수 없습니다.")
+    return org
+
+def detect_and_crop_mask(source, detect_width=DETECT_WIDTH):
+    """
+    마스크 기반으로 영수증을 크롭한 컬러 이미지를 리턴합니다.
+    source는 이미지 파일 경로, 이미지 바이트, numpy 이미지 중 하나입니다.
+    영수증 윤곽은 가로 detect_width로 축소한 이미지에서 찾고,
+    크롭(원근 변환)만 원본 해상도에서 수행합니다.
+    """
+    org = load_image(source)
+
+    if isinstance(source, (str, os.PathLike)):
+        base_name = os.path.splitext(os.path.basename(source))[0]
+    else:
+        base_name = None
+
+    # 1~4) 축소 이미지에서 꼭짓점 검출 → 원본 좌표로 환산
+    h, w = org.shape[:2]
+    if detect_width and w > detect_width:
+        small_h = max(1, round(h * detect_width / w))
+        small = cv2.resize(org, (detect_width, small_h), interpolation=cv2.INTER_AREA)
+        pts = find_receipt_corners(small) * np.array([w / detect_width, h / small_h], dtype="float32")
+    else:
+        pts = find_receipt_corners(org)
 
     # 5) 컬러 크롭
     cropped_color = four_point_transform(org, pts)
@@ -83,17 +124,18 @@ def binarize_for_ocr(cropped_color):
     )
     return cropped_bin
 
-def preprocess_image_to_memory(img_path):
+def preprocess_image_to_memory(source, detect_width=DETECT_WIDTH):
     """
-    단일 이미지 파일을 전처리하여 binarized_image만 반환
+    단일 이미지(파일 경로 또는 이미지 바이트)를 전처리하여 binarized_image만 반환
     """
+    label = source if isinstance(source, (str, os.PathLike)) else "메모리 이미지"
     try:
-        cropped_color, _ = detect_and_crop_mask(img_path)
+        cropped_color, _ = detect_and_crop_mask(source, detect_width=detect_width)
         cropped_bin = binarize_for_ocr(cropped_color)
-        print(f"✅ OCR용 이진화 크롭 완료 → {img_path}")
+        print(f"✅ OCR용 이진화 크롭 완료 → {label}")
         return cropped_bin
     except Exception as e:
-        print(f"❌ {img_path} 처리 실패: {e}")
+        print(f"❌ {label} 처리 실패: {e}")
         return None
 
 # 사용 예시:
@@ -1,24 +1,86 @@
+import os
 import re
 import json
-import Levenshtein
+import threading
+import functools
+from collections import OrderedDict
+from .jamo_index import DictEntry, JamoIndex, NgramIndex, PrefixMatcher, jamo_similarity
+from .compiled_dictionary import LazyIndexMap, StoreItems, StoreOverlay, load_compiled, manifest_path
+
+CHOSUNG_LIST = ['ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ', 
+                'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+JUNGSUNG_LIST = ['ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅘ', 
+                 'ㅙ', 'ㅚ', 'ㅛ', 'ㅜ', 'ㅝ', 'ㅞ', 'ㅟ', 'ㅠ', 'ㅡ', 'ㅢ', 'ㅣ']
+JONGSUNG_LIST = ['', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 
+                 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 
+                 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+
+# 한글 음절(가~힣, 11,172자) → 자모 문자열 변환표 (str.translate용)
+_JAMO_TABLE = {
+    ord('가') + code: CHOSUNG_LIST[code // (21 * 28)] + JUNGSUNG_LIST[(code % (21 * 28)) // 28] + JONGSUNG_LIST[code % 28]
+    for code in range(11172)
+}
+
+@functools.lru_cache(maxsize=8192)
+def decompose_hangul(text):
+    """한글 음절을 초성/중성/종성 자모로 분해 (한글 외 문자는 그대로)"""
+    return text.translate(_JAMO_TABLE)
+
+# 숫자 정규화 패턴 (미리 컴파일)
+# 기존의 O/U/E → 0 치환과 괄호 제거 규칙은 앞뒤 숫자를 그대로 두고 해당 글자만 바꾸므로 글자 단위 치환과 같음
+_NUMBER_CHAR_TABLE = str.maketrans({'O': '0', 'U': '0', 'E': '0', '(': None, ')': None})
+_DIGIT = re.compile(r'\d')
+_HANGUL = re.compile(r'[가-힣]')
+_COMMA_SPACING = re.compile(r'(\d+)\s*,\s*(\d+)')
+_DOT_SPACING = re.compile(r'(\d+)\s*\.\s*(\d+)')
+_DOT_THOUSANDS = re.compile(r'(\d{1,3})\.(\d{3})(?!\d)')
+_NUMBER_SPACING = re.compile(r'(\d{1,3})\s+(\d{3})(?!\d)')
+_DIGIT_L_DIGIT = re.compile(r'(\d+)l(\d+)')
+_DIGIT_I_DIGIT = re.compile(r'(\d+)I(\d+)')
+_COLON_BETWEEN = re.compile(r'([^\s]):([^\s])')
+_COLON_AFTER = re.compile(r'([^\s]):')
+_COLON_BEFORE = re.compile(r':([^\s])')
+
+def _handle_number_spacing(match):
+    num1 = match.group(1)
+    num2 = match.group(2)
+    # 세 자리 숫자 두 개(끝이 000이 아닌 경우)는 별개의 숫자로 보고 공백 하나로, 나머지는 천 단위 쉼표로 연결
+    if len(num1) == 3 and num2 != "000":
+        return f"{num1} {num2}"
+    return f"{num1},{num2}"
+
+# 단어 보정 결과(보정 없음 포함) LRU 캐시 크기
+CORRECTION_CACHE_SIZE = 4096
 
 class TextPostProcessor:
-    def __init__(self, dict_path="dictionary.txt"):
+    def __init__(self, dict_path="dictionary.txt", correction_cache_size=CORRECTION_CACHE_SIZE, compiled=None):
         self.dict_path = dict_path
         self.store_item_path = dict_path.endswith('.json')
-        
+        self.chosung_list = CHOSUNG_LIST
+        self.jungsung_list = JUNGSUNG_LIST
+        self.jongsung_list = JONGSUNG_LIST
+        # build_dictionary로 컴파일한 사전 (CompiledDictionary, 없으면 원본 파일을 읽음)
+        self.compiled = compiled
+
         # 파일 타입에 따라 다른 로딩 방식 사용
-        if self.store_item_path:
+        if compiled is not None:
+            self.dictionary = compiled.dictionary
+            self.stores_dict = compiled.stores_dict
+        elif self.store_item_path:
             self._load_json_dictionary()
         else:
             self._load_text_dictionary()
-        self.chosung_list = ['ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ', 
-                             'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
-        self.jungsung_list = ['ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅘ', 
-                              'ㅙ', 'ㅚ', 'ㅛ', 'ㅜ', 'ㅝ', 'ㅞ', 'ㅟ', 'ㅠ', 'ㅡ', 'ㅢ', 'ㅣ']
-        self.jongsung_list = ['', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 
-                              'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 
-                              'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+        # 사전이 바뀔 때마다 올라가는 버전 (단어 보정 캐시 키에 포함)
+        self.dictionary_version = 0
+        # {(사전 버전, 단어): 보정 결과 또는 None} (가장 최근에 사용한 항목이 뒤쪽)
+        self._corrections = OrderedDict()
+        self._corrections_lock = threading.Lock()
+        self._correction_cache_size = correction_cache_size
+        self._correction_hits = 0
+        self._correction_misses = 0
+        # 사전 파일 이후에 반영한 외부 사전 변경 기록의 마지막 리비전 (가게/메뉴 관리 API가 갱신)
+        self.revision = 0
+        self._build_entries()
 
     def _load_text_dictionary(self):
         """텍스트 파일 로딩 - dictionary만 생성"""
@@ -39,140 +101,247 @@ class TextPostProcessor:
         except Exception:
             self.stores_dict = {}
 
+    def _make_entry(self, word):
+        # 사전 단어는 한 번만 분해하므로 LRU 캐시를 거치지 않음
+        return DictEntry(word, word.translate(_JAMO_TABLE), len(word))
+
+    def _build_entries(self):
+        """사전 단어들을 자모 분해 레코드로 미리 변환하고 후보 색인 생성"""
+        self.dictionary_version += 1
+        if self.compiled is not None:
+            # 컴파일된 사전은 메모리 맵 배열에서 색인을 복원
+            self.dictionary_entries = self.compiled.dictionary_index()
+            self.store_entries = self.compiled.store_index()
+        else:
+            self.dictionary_entries = JamoIndex(self._make_entry(word) for word in self.dictionary)
+            # 가게명은 n-gram 색인으로 후보를 줄인 뒤 비교
+            self.store_entries = NgramIndex(self._make_entry(store_name) for store_name in self.stores_dict.keys())
+        # 가게별 메뉴 색인은 처음 사용할 때 생성 (메뉴가 바뀌면 해당 가게만 다시 생성)
+        self.store_item_entries = LazyIndexMap(self.stores_dict, self._build_store_item_index)
+        self.store_item_matchers = LazyIndexMap(self.stores_dict, self._build_store_item_matcher)
+
+    def _build_store_item_index(self, store_name):
+        stores = self.stores_dict
+        if isinstance(stores, (StoreItems, StoreOverlay)):
+            # 컴파일된 사전은 미리 분해해 둔 메뉴 레코드를 사용 (관리 API로 바뀐 가게는 제외)
+            entries = stores.item_entries(store_name)
+            if entries is not None:
+                return JamoIndex(entries)
+        return JamoIndex(self._make_entry(item) for item in stores[store_name].get("items", []))
+
+    def _build_store_item_matcher(self, store_name):
+        return PrefixMatcher(self.store_item_entries[store_name])
+
+    def _store_overlay(self):
+        # 관리 API 변경분은 원본 사전 위의 StoreOverlay에만 기록 (원본 dict/메모리 맵은 복사하지 않음)
+        stores = self.stores_dict
+        return stores if isinstance(stores, StoreOverlay) else StoreOverlay(stores)
+
+    def _update_stores(self, stores_dict, store_entries, changed_store):
+        # 새 dict/색인을 만든 뒤 교체하므로 검색 중인 스레드는 이전 사전을 끝까지 사용
+        self.store_entries = store_entries
+        self.stores_dict = stores_dict
+        self.store_item_entries = self.store_item_entries.updated(stores_dict, changed_store)
+        self.store_item_matchers = self.store_item_matchers.updated(stores_dict, changed_store)
+        self.dictionary_version += 1
+
+    def add_store(self, store_name, items=()):
+        """
+        가게와 메뉴를 사전에 추가합니다. (JSON 전용, 이미 있는 가게면 새 메뉴만 추가)
+        가게명 n-gram 색인에는 새 가게만 더하고 메뉴 색인은 해당 가게만 다시 만들므로 전체를 다시 만들지 않습니다.
+        사전 자체도 변경분만 StoreOverlay에 기록하므로 가게 수와 관계없이 바뀐 가게의 메뉴만 복사합니다.
+        사전이 바뀌었으면 True를 반환합니다.
+        """
+        if store_name in self.stores_dict:
+            return self.add_items(store_name, items)
+        stores = self._store_overlay().with_store(store_name, {"items": list(dict.fromkeys(items))})
+        self._update_stores(stores, self.store_entries.with_entry(self._make_entry(store_name)), store_name)
+        return True
+
+    def remove_store(self, store_name):
+        """가게와 메뉴를 사전에서 삭제합니다. (JSON 전용) 사전이 바뀌었으면 True를 반환합니다."""
+        if store_name not in self.stores_dict:
+            return False
+        overlay = self._store_overlay()
+        # 가게명 색인의 행 번호는 원본 사전 순서 뒤에 추가된 가게를 이어 붙인 순서와 같음
+        row = self.store_entries.added_row(store_name)
+        if row is None:
+            row = overlay.base_position(store_name)
+        self._update_stores(overlay.without_store(store_name), self.store_entries.without_entry(row), store_name)
+        return True
+
+    def add_items(self, store_name, items):
+        """가게에 메뉴를 추가합니다. (JSON 전용, 없는 가게면 가게도 추가) 사전이 바뀌었으면 True를 반환합니다."""
+        if store_name not in self.stores_dict:
+            return self.add_store(store_name, items)
+        current = list(self.stores_dict[store_name].get("items", []))
+        added = [item for item in dict.fromkeys(items) if item not in current]
+        if not added:
+            return False
+        stores = self._store_overlay()
+        stores = stores.with_store(store_name, {**stores[store_name], "items": current + added})
+        self._update_stores(stores, self.store_entries, store_name)
+        return True
+
+    def remove_items(self, store_name, items):
+        """가게의 메뉴를 삭제합니다. (JSON 전용) 사전이 바뀌었으면 True를 반환합니다."""
+        if store_name not in self.stores_dict:
+            return False
+        current = list(self.stores_dict[store_name].get("items", []))
+        removed = set(items)
+        remaining = [item for item in current if item not in removed]
+        if len(remaining) == len(current):
+            return False
+        stores = self._store_overlay()
+        stores = stores.with_store(store_name, {**stores[store_name], "items": remaining})
+        self._update_stores(stores, self.store_entries, store_name)
+        return True
+
     def find_best_store_match(self, target, threshold=0.4):
         """가게명에서 가장 유사한 매치 찾기 (JSON 전용)"""
         if not self.store_item_path or not self.stores_dict:
             return None, 0
             
-        best_match = None
-        max_similarity = 0
-        
-        for store_name in self.stores_dict.keys():
-            if abs(len(target) - len(store_name)) > len(target) / 2:
-                continue
-
-            similarity = self.calculate_jamo_similarity(target, store_name)
-            if similarity > max_similarity:
-                max_similarity = similarity
-                best_match = store_name
-            elif similarity == max_similarity and len(store_name) > len(best_match or ""):
-                best_match = store_name
-        
-        return (best_match, max_similarity) if max_similarity >= threshold else (None, 0)
+        return self.store_entries.best_match(target, self.decompose_hangul(target), threshold)
 
     def find_best_item_match(self, target, store_name, threshold=0.4):
         """특정 가게의 메뉴에서 가장 유사한 매치 찾기 (JSON 전용)"""
         if not self.store_item_path or not self.stores_dict or store_name not in self.stores_dict:
             return None, 0
             
-        items_list = self.stores_dict[store_name].get("items", [])
-        best_match = None
-        max_similarity = 0
-        
-        for item in items_list:
-            if abs(len(target) - len(item)) > len(target) / 2:
-                continue
-            similarity = self.calculate_jamo_similarity(target, item)
-            if similarity > max_similarity:
-                max_similarity = similarity
-                best_match = item
-            elif similarity == max_similarity and len(item) > len(best_match or ""):
-                best_match = item
-        
-        return (best_match, max_similarity) if max_similarity >= threshold else (None, 0)
+        return self.store_item_entries[store_name].best_match(target, self.decompose_hangul(target), threshold)
+
+    def find_best_item_prefix_match(self, words, store_name, threshold=0.4):
+        """
+        특정 가게의 메뉴에서 words의 누적 구문(words[:k+1]) 중 가장 유사한 매치 찾기 (JSON 전용)
+        누적 구문마다 find_best_item_match를 호출한 결과 중 최고 매치를 (단어, 유사도, k)로 반환합니다.
+        """
+        if not self.store_item_path or not self.stores_dict or store_name not in self.stores_dict:
+            return None, 0, -1
+
+        word_jamos = [self.decompose_hangul(word) for word in words]
+        return self.store_item_matchers[store_name].best_prefix_match(words, word_jamos, threshold)
         
     def decompose_hangul(self, text):
-        result = []
-        for char in text:
-            if '가' <= char <= '힣':
-                char_code = ord(char) - ord('가')
-                cho = char_code // (21 * 28)
-                jung = (char_code % (21 * 28)) // 28
-                jong = char_code % 28
-                result.append(self.chosung_list[cho])
-                result.append(self.jungsung_list[jung])
-                if jong > 0:
-                    result.append(self.jongsung_list[jong])
-            else:
-                result.append(char)
-        return ''.join(result)
+        return decompose_hangul(text)
 
     def calculate_jamo_similarity(self, word1, word2):
-        jamo1 = self.decompose_hangul(word1)
-        jamo2 = self.decompose_hangul(word2)
-        if len(word1) <= 2 or len(word2) <= 2:
-            similarity = Levenshtein.jaro(jamo1, jamo2)
-        else:
-            similarity = Levenshtein.ratio(jamo1, jamo2)
-        len_diff = len(word2) - len(word1)
-        if len_diff < 0:
-            similarity += 0.1 * len_diff
-        return max(0, min(1, similarity))
+        return jamo_similarity(len(word1), self.decompose_hangul(word1), self._make_entry(word2))
 
     def find_closest_word(self, word, threshold=0.70):
-        best_match = None
-        max_similarity = 0
-        for candidate in self.dictionary:
-            if abs(len(word) - len(candidate)) > len(word) / 2:
-                continue
-            similarity = self.calculate_jamo_similarity(word, candidate)
-            if (similarity > max_similarity or 
-                (similarity == max_similarity and len(candidate) > len(best_match or ""))):
-                max_similarity = similarity
-                best_match = candidate
+        best_match, max_similarity = self.dictionary_entries.best_match(
+            word, self.decompose_hangul(word), threshold
+        )
         if max_similarity >= threshold and max_similarity < 1:
             return best_match
         return None
 
+    def find_closest_words(self, words, threshold=0.70):
+        """여러 단어의 find_closest_word 결과 리스트 (작은 사전은 단어 × 사전 행렬을 한 번에 계산)"""
+        matches = self.dictionary_entries.best_matches(
+            words, [self.decompose_hangul(word) for word in words], threshold
+        )
+        return [
+            best_match if max_similarity >= threshold and max_similarity < 1 else None
+            for best_match, max_similarity in matches
+        ]
+
+    def correct_word(self, word):
+        """
+        사전 기준으로 보정한 단어를 반환합니다. (보정할 단어가 없으면 None)
+        같은 단어는 사전 버전이 바뀌기 전까지 캐시된 결과를 사용합니다.
+        """
+        return self.correct_words([word])[0]
+
+    def correct_words(self, words):
+        """
+        여러 단어를 한 번에 보정합니다. 캐시에 없는 단어만 모아 find_closest_words로 한 번에 비교합니다.
+        """
+        version = self.dictionary_version
+        corrections = {}
+        missing = {}
+        with self._corrections_lock:
+            for word in words:
+                key = (version, word)
+                if key in self._corrections:
+                    self._corrections.move_to_end(key)
+                    corrections[word] = self._corrections[key]
+                    self._correction_hits += 1
+                elif word in corrections or word in missing:
+                    # 같은 묶음 안에서 반복된 단어는 한 번만 비교
+                    self._correction_hits += 1
+                else:
+                    missing[word] = None
+                    self._correction_misses += 1
+
+        if missing:
+            missing = list(missing)
+            found = self.find_closest_words(missing)
+            with self._corrections_lock:
+                for word, closest_word in zip(missing, found):
+                    corrections[word] = closest_word
+                    self._corrections[(version, word)] = closest_word
+                while len(self._corrections) > self._correction_cache_size:
+                    self._corrections.popitem(last=False)
+        return [corrections[word] for word in words]
+
+    def correction_cache_stats(self):
+        """단어 보정 캐시 적중률 통계"""
+        with self._corrections_lock:
+            hits, misses, size = self._correction_hits, self._correction_misses, len(self._corrections)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total else 0.0,
+            'size': size,
+            'max_size': self._correction_cache_size,
+        }
+
     def normalize_number(self, text):
         if not text:
             return text
-        text = re.sub(r'(\d*)O(\d*)', r'\g<1>0\g<2>', text)
-        text = re.sub(r'(\d+)O\b', r'\g<1>0', text)
-        text = re.sub(r'\bO(\d+)', r'0\g<1>', text)
-        text = re.sub(r'(\d*[,\.])O(\d*)', r'\g<1>0\g<2>', text)
-        text = re.sub(r'(\d*)U(\d*)', r'\g<1>0\g<2>', text)
-        text = re.sub(r'(\d*)E(\d*)', r'\g<1>0\g<2>', text)
-        text = re.sub(r'(\d+)E\b', r'\g<1>0', text) 
-        text = re.sub(r'\bE(\d+)', r'0\g<1>', text) 
-        text = re.sub(r'(\d*[,\.])E(\d*)', r'\g<1>0\g<2>', text)
-        text = re.sub(r'(\d*)\((\d*)', r'\1\2', text)
-        text = re.sub(r'(\d*)\)(\d*)', r'\1\2', text)
-        text = re.sub(r'(\d+)\s*,\s*(\d+)', r'\1,\2', text)
-        text = re.sub(r'(\d+)\s*\.\s*(\d+)', r'\1.\2', text)
-        text = re.sub(r'(\d{1,3})\.(\d{3})(?!\d)', r'\1,\2', text)
-        def handle_number_spacing(match):
-            num1 = match.group(1)
-            num2 = match.group(2)
-            if len(num1) < 3 and len(num2) == 3:
-                return f"{num1},{num2}"
-            elif len(num1) == 3 and len(num2) == 3:
-                if num2 == "000":
-                    return f"{num1},{num2}"
-                else:
-                    return f"{num1} {num2}"
-            else:
-                return f"{num1},{num2}"
-        text = re.sub(r'(\d{1,3})\s+(\d{3})(?!\d)', handle_number_spacing, text)
-        return text
+        # O/U/E → 0, 괄호 제거 (글자 단위 치환이므로 한 번의 translate로 처리)
+        text = text.translate(_NUMBER_CHAR_TABLE)
+        if not _DIGIT.search(text):
+            return text
+        if ',' in text:
+            text = _COMMA_SPACING.sub(r'\1,\2', text)
+        if '.' in text:
+            text = _DOT_SPACING.sub(r'\1.\2', text)
+            text = _DOT_THOUSANDS.sub(r'\1,\2', text)
+        return _NUMBER_SPACING.sub(_handle_number_spacing, text)
+
+    def _prepare_words(self, text):
+        """공백/문자 보정 후 단어 리스트 (사전 보정 전 단계)"""
+        text = ' '.join(text.split())
+        if 'l' in text:
+            text = _DIGIT_L_DIGIT.sub(r'\g<1>1\g<2>', text)
+        if 'I' in text:
+            text = _DIGIT_I_DIGIT.sub(r'\g<1>1\g<2>', text)
+        if ';' in text:
+            text = text.replace(';', ':')
+        if ':' in text:
+            text = _COLON_BETWEEN.sub(r'\1 : \2', text)
+            text = _COLON_AFTER.sub(r'\1 :', text)
+            text = _COLON_BEFORE.sub(r': \1', text)
+        return text.split()
+
+    @staticmethod
+    def _correction_targets(words):
+        """사전 보정 대상 단어 (숫자가 없고 한글이 있는 2글자 이상 단어)"""
+        return [word for word in words if len(word) > 1 and not _DIGIT.search(word) and _HANGUL.search(word)]
+
+    @staticmethod
+    def _apply_corrections(words, corrections):
+        return ' '.join(corrections.get(word) or word for word in words)
 
     def clean_text(self, text):
         if not text:
             return text
-        text = re.sub(r'\s+', ' ', text).strip()
-        text = re.sub(r'(\d+)l(\d+)', r'\g<1>1\g<2>', text)
-        text = re.sub(r'(\d+)I(\d+)', r'\g<1>1\g<2>', text)
-        text = re.sub(r';', ':', text)
-        text = re.sub(r'([^\s]):([^\s])', r'\1 : \2', text)
-        text = re.sub(r'([^\s]):', r'\1 :', text)
-        text = re.sub(r':([^\s])', r': \1', text)
-        words = text.split()
-        for i, word in enumerate(words):
-            if not re.search(r'\d', word) and re.search(r'[가-힣]', word) and len(word) > 1:
-                closest_word = self.find_closest_word(word)
-                if closest_word:
-                    words[i] = closest_word
-        return ' '.join(words)
+        words = self._prepare_words(text)
+        targets = self._correction_targets(words)
+        return self._apply_corrections(words, dict(zip(targets, self.correct_words(targets))))
 
     def merge_number_line(self, lines):
         if len(lines) <= 1:
@@ -198,10 +367,17 @@ class TextPostProcessor:
     def process_lines(self, lines):
         """
         줄 리스트를 받아 후처리된 줄 리스트로 반환
+        영수증 전체의 보정 대상 단어는 모아서 한 번에 보정합니다.
         """
-        processed_lines = [self.process_line(line) for line in lines]
+        prepared = [self._prepare_words(line) if line.strip() else None for line in lines]
+        targets = [word for words in prepared if words for word in self._correction_targets(words)]
+        corrections = dict(zip(targets, self.correct_words(targets)))
+        processed_lines = [
+            self.normalize_number(self._apply_corrections(words, corrections)) if words is not None else line
+            for line, words in zip(lines, prepared)
+        ]
         processed_lines = self.merge_number_line(processed_lines)
-        print("✅ 텍스트 후처리 완료")
+        print(f"✅ 텍스트 후처리 완료 (단어 보정 캐시 적중률 {self.correction_cache_stats()['hit_rate']:.1%})")
         return processed_lines
 
     def process_line(self, line):
@@ -211,6 +387,36 @@ class TextPostProcessor:
         line = self.normalize_number(line)
         return line
 
+# 사전 파일 경로별 TextPostProcessor 레지스트리 (프로세스 전역)
+# {절대 경로: ((사전 파일 (mtime_ns, size), 컴파일 manifest (mtime_ns, size)), TextPostProcessor)}
+_processors = {}
+_processors_lock = threading.Lock()
+
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def get_processor(dict_path):
+    """
+    사전 파일에 해당하는 TextPostProcessor를 반환합니다.
+    사전은 프로세스에서 한 번만 읽어 공유하며, 파일이 수정된 경우에만 다시 읽습니다.
+    build_dictionary로 만든 컴파일 결과가 원본과 일치하면 원본 대신 메모리 맵으로 엽니다.
+    """
+    path = os.path.abspath(dict_path)
+    signature = (_file_signature(path), _file_signature(manifest_path(path)))
+    entry = _processors.get(path)
+    if entry is not None and entry[0] == signature:
+        return entry[1]
+    with _processors_lock:
+        entry = _processors.get(path)
+        if entry is None or entry[0] != signature:
+            entry = (signature, TextPostProcessor(dict_path=path, compiled=load_compiled(path)))
+            _processors[path] = entry
+    return entry[1]
+
 # 사용 예시:
-# processor = TextPostProcessor(dict_path="dictionary.txt")
+# processor = get_processor("dictionary.txt")
 # processed_lines = processor.process_lines(ocr_lines)
\ No newline at end of file
@@ -1,11 +1,12 @@
 from rest_framework import serializers
-from .models import Receipt, Participant, ReceiptInfo, Settlement
+from .models import Receipt, Participant, ReceiptInfo, Settlement, AnalyzeJob
 
 class ReceiptSerializer(serializers.ModelSerializer):
     """영수증 모델에 대한 시리얼라이저"""
     class Meta:
         model = Receipt
         fields = '__all__'
+        read_only_fields = ['analysis_status', 'analyzed_at', 'pipeline_version']
 
 class ParticipantSerializer(serializers.ModelSerializer):
     """참여자 정보에 대한 시리얼라이저"""
@@ -22,4 +23,19 @@ class ReceiptInfoSerializer(serializers.ModelSerializer):
 class SettlementSerializer(serializers.ModelSerializer):
     class Meta:
         model = Settlement
-        fields = ['id', 'receipt', 'participants', 'result', 'method', 'created_at']
\ No newline at end of file
+        fields = ['id', 'receipt', 'participants', 'result', 'method', 'created_at']
+
+class AnalyzeJobSerializer(serializers.ModelSerializer):
+    """영수증 분석 작업 시리얼라이저"""
+    class Meta:
+        model = AnalyzeJob
+        fields = '__all__'
+
+class DictionaryStoreSerializer(serializers.Serializer):
+    """가게/메뉴 사전에 추가할 가게 시리얼라이저"""
+    store_name = serializers.CharField(max_length=255)
+    items = serializers.ListField(child=serializers.CharField(max_length=255), required=False, default=list)
+
+class DictionaryItemsSerializer(serializers.Serializer):
+    """가게/메뉴 사전에 추가할 메뉴 시리얼라이저"""
+    items = serializers.ListField(child=serializers.CharField(max_length=255), allow_empty=False)
@@ -0,0 +1,285 @@
+import csv
+import json
+from itertools import chain, groupby
+from django.db import transaction
+from openpyxl import Workbook
+from .models import Receipt, ReceiptInfo, Participant, Settlement, SettlementParticipant
+
+class SettlementError(Exception):
+    """요청 값이 잘못되어 정산할 수 없는 경우 (400 응답)"""
+
+def item_key(item_name):
+    """품목 이름 비교용 키 (앞뒤 공백과 대소문자 차이는 같은 품목으로 봄)"""
+    return (item_name or '').strip().casefold()
+
+def load_receipt_items(receipt_ids):
+    """
+    영수증 id들에 해당하는 {영수증 id: {품목 키: [총액, ...]}}를 쿼리 두 번으로 읽습니다. (품목 키는 item_key)
+    존재하지 않는 영수증은 포함되지 않으며, 품목이 없는 영수증은 빈 dict입니다.
+    """
+    receipt_items = {
+        receipt_id: {} for receipt_id in Receipt.objects.filter(id__in=receipt_ids).values_list('id', flat=True)
+    }
+    rows = ReceiptInfo.objects.filter(receipt_id__in=list(receipt_items)).values_list(
+        'receipt_id', 'item_name', 'total_amount'
+    )
+    for receipt_id, item_name, total_amount in rows:
+        receipt_items[receipt_id].setdefault(item_key(item_name), []).append(total_amount)
+    return receipt_items
+
+def calculate_settlement(method, receipts, participant_names):
+    """
+    정산 요청(receipts: [{'receipt_id': ..., 'items': [{'item_name': ..., 'participants': [...]}]}])으로
+    (참가자별 금액, 정산에 사용한 영수증 id 리스트, 영수증별 품목 할당 리스트)를 계산합니다.
+
+    영수증과 품목은 처음에 한 번에 읽어 품목 이름별로 묶어 두므로, 영수증/할당 수와 관계없이 쿼리는 두 번입니다.
+    요청 값이 잘못되면 SettlementError를 발생시킵니다.
+    """
+    receipt_ids = [receipt_info.get("receipt_id") for receipt_info in receipts if receipt_info.get("receipt_id")]
+    receipt_items = load_receipt_items(receipt_ids)
+
+    overall_result = {}
+    used_receipts = []
+    all_item_assignments = []
+
+    for receipt_info in receipts:
+        receipt_id = receipt_info.get("receipt_id")
+        if not receipt_id:
+            continue
+
+        items = receipt_items.get(int(receipt_id))
+        if items is None:
+            continue
+        result = {}
+
+        if method == "equal":
+            if not participant_names:
+                raise SettlementError('1/N 정산은 participants 필수입니다.')
+
+            total = sum(sum(amounts) for amounts in items.values())
+            share = total // len(participant_names)
+            for name in participant_names:
+                result[name] = share
+
+        elif method == "item":
+            item_assignments = receipt_info.get("items", [])
+            if not item_assignments:
+                raise SettlementError(f'항목별 정산은 items 필수 (receipt_id: {receipt_id})')
+
+            # 개별 품목 할당 (이름이 같은 품목이 여러 개면 각각 나눔, 공백/대소문자 차이는 무시)
+            for assignment in item_assignments:
+                names = assignment.get("participants", [])
+                for amount in items.get(item_key(assignment.get("item_name")), []):
+                    share = amount // max(len(names), 1)
+                    for name in names:
+                        result[name] = result.get(name, 0) + share
+
+            # 할당 데이터 수집
+            all_item_assignments.append({
+                "receipt_id": receipt_id,
+                "items": item_assignments
+            })
+
+        else:
+            raise SettlementError('method는 "equal" 또는 "item"이어야 합니다.')
+
+        # 전체 합산
+        for name, amount in result.items():
+            overall_result[name] = overall_result.get(name, 0) + amount
+
+        used_receipts.append(receipt_id)
+
+    return overall_result, used_receipts, all_item_assignments
+
+def save_settlement(method, result, used_receipts, item_assignments):
+    """
+    정산 결과를 저장합니다. 영수증/참가자 연결은 중간 테이블에 bulk_create로 한 번씩 저장하며,
+    참가자 연결에는 정산 시점의 이름을 함께 기록합니다.
+    """
+    with transaction.atomic():
+        settlement = Settlement.objects.create(
+            result=result,
+            method=method,
+            item_assignments_data=json.dumps(item_assignments, ensure_ascii=False),
+        )
+        Settlement.receipts.through.objects.bulk_create([
+            Settlement.receipts.through(settlement_id=settlement.id, receipt_id=receipt_id)
+            for receipt_id in sorted({int(receipt_id) for receipt_id in used_receipts})
+        ])
+        # 모임(정산) 안에서는 이름마다 참가자 하나만 연결 (같은 이름이 여러 번 참가했으면 가장 최근 참가자)
+        participant_ids = {}
+        for participant_id, name in Participant.objects.filter(name__in=result.keys()).order_by('-id').values_list('id', 'name'):
+            participant_ids.setdefault(name, participant_id)
+        SettlementParticipant.objects.bulk_create([
+            SettlementParticipant(settlement_id=settlement.id, participant_id=participant_id, name=name)
+            for name, participant_id in participant_ids.items()
+        ])
+    return settlement
+
+def load_item_assignments(settlement):
+    """
+    저장된 품목 할당 정보를 {(영수증 id, 품목 키): 참가자 리스트}로 만듭니다. (품목 키는 item_key)
+    같은 영수증이나 품목이 여러 번 있으면 처음 것을 사용합니다.
+    """
+    data = settlement.item_assignments_data
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except json.JSONDecodeError:
+            data = []
+
+    assignments = {}
+    seen_receipts = set()
+    for record in data or []:
+        receipt_id = record.get('receipt_id')
+        if receipt_id in seen_receipts:
+            continue
+        seen_receipts.add(receipt_id)
+        for assignment in record.get('items') or []:
+            key = (receipt_id, item_key(assignment.get('item_name')))
+            assignments.setdefault(key, assignment.get('participants', []))
+    return assignments
+
+def iter_receipt_items(receipts):
+    """
+    영수증마다 (영수증, 품목 행 이터레이터)를 순서대로 반환합니다.
+    품목은 모든 영수증에 대해 한 번의 쿼리로 (store_name, item_name, quantity, unit_price, total_amount)만 읽으며,
+    청크 단위로 가져오므로 품목 수가 많아도 메모리에 모아 두지 않습니다.
+    """
+    rows = ReceiptInfo.objects.filter(receipt_id__in=[receipt.id for receipt in receipts]).order_by(
+        'receipt_id', 'id'
+    ).values_list('receipt_id', 'store_name', 'item_name', 'quantity', 'unit_price', 'total_amount')
+    groups = groupby(rows.iterator(chunk_size=2000), key=lambda row: row[0])
+
+    group = next(groups, None)
+    for receipt in receipts:
+        if group is not None and group[0] == receipt.id:
+            yield receipt, (row[1:] for row in group[1])
+            group = next(groups, None)
+        else:
+            yield receipt, iter(())
+
+def iter_settlement_records(settlement):
+    """
+    정산 내보내기(엑셀/CSV/NDJSON)에 공통으로 쓰는 레코드를 위에서부터 순서대로 만듭니다.
+
+    - {'type': 'receipt', 'index', 'receipt_id', 'store_name', 'upload_time'}
+    - {'type': 'item', 'receipt_id', 'item_name', 'quantity', 'unit_price', 'total_amount'(, 'participants')}
+    - {'type': 'receipt_total', 'receipt_id', 'total'}
+    - {'type': 'settlement', 'settlement_id', 'method', 'total'}
+    - {'type': 'result', 'name', 'amount'}
+
+    영수증과 품목을 한 번씩만 조회하고, 품목별 참여자(항목별 정산만)는 미리 만든 색인에서 찾습니다.
+    """
+    receipts = list(settlement.receipts.order_by('id'))
+    by_item = settlement.method == "item"
+    assignments = load_item_assignments(settlement) if by_item else {}
+
+    for idx, (receipt, items) in enumerate(iter_receipt_items(receipts), start=1):
+        first = next(items, None)
+        yield {
+            'type': 'receipt',
+            'index': idx,
+            'receipt_id': receipt.id,
+            'store_name': first[0] if first else None,
+            'upload_time': receipt.upload_time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+
+        total = 0
+        for store_name, item_name, quantity, unit_price, total_amount in chain([first] if first else [], items):
+            record = {
+                'type': 'item',
+                'receipt_id': receipt.id,
+                'item_name': item_name,
+                'quantity': quantity,
+                'unit_price': unit_price,
+                'total_amount': total_amount,
+            }
+            if by_item:
+                record['participants'] = assignments.get((receipt.id, item_key(item_name)), [])
+            total += total_amount
+            yield record
+
+        yield {'type': 'receipt_total', 'receipt_id': receipt.id, 'total': total}
+
+    yield {
+        'type': 'settlement',
+        'settlement_id': settlement.id,
+        'method': settlement.method,
+        'total': sum(settlement.result.values()),
+    }
+    for name, amount in settlement.result.items():
+        yield {'type': 'result', 'name': name, 'amount': amount}
+
+def iter_settlement_rows(settlement):
+    """정산 결과 시트의 행(셀 값 리스트)을 위에서부터 순서대로 만듭니다. (엑셀/CSV용)"""
+    headers = ["메뉴명", "수량", "단가", "총액"]
+    if settlement.method == "item":
+        headers.append("참여자")
+
+    for record in iter_settlement_records(settlement):
+        kind = record['type']
+        if kind == 'item':
+            row = [record['item_name'], record['quantity'], record['unit_price'], record['total_amount']]
+            if 'participants' in record:
+                row.append(', '.join(record['participants']))
+            yield row
+        elif kind == 'receipt':
+            yield [f"영수증 {record['index']}"]
+            yield ["상호명", record['store_name'] if record['store_name'] is not None else "정보 없음"]
+            yield ["업로드일", record['upload_time']]
+            yield []
+            yield headers
+        elif kind == 'receipt_total':
+            yield []
+            yield ["총 결제금액", record['total']]
+            yield []
+        elif kind == 'settlement':
+            yield ["전체 정산 총액", record['total']]
+            yield ["정산 방식", "1/N 정산" if record['method'] == "equal" else "항목별 정산"]
+            yield []
+            yield ["정산 결과"]
+            yield ["참여자", "정산 금액"]
+        elif kind == 'result':
+            yield [record['name'], record['amount']]
+
+def write_settlement_excel(settlement, file):
+    """
+    정산 결과를 write-only 워크북으로 file(경로 또는 바이너리 파일 객체)에 저장합니다.
+    행은 만들어지는 대로 임시 파일에 기록되므로 셀 객체를 메모리에 쌓지 않습니다.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("정산 결과")
+    for row in iter_settlement_rows(settlement):
+        ws.append(row)
+    wb.save(file)
+
+def _chunked(lines, chunk_size=64 * 1024):
+    # 줄마다 응답 청크를 보내지 않도록 chunk_size 바이트 정도씩 모아서 UTF-8로 반환
+    buffer = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield ''.join(buffer).encode('utf-8')
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+class _Echo:
+    # csv.writer가 쓴 한 줄을 그대로 반환하는 파일 대용 객체
+    def write(self, value):
+        return value
+
+def iter_settlement_csv(settlement):
+    """정산 결과 시트와 같은 행을 CSV로 만들어 바이트 청크로 반환합니다. (엑셀에서 한글이 깨지지 않도록 BOM 포함)"""
+    writer = csv.writer(_Echo())
+    return _chunked(chain(['\ufeff'], (writer.writerow(row) for row in iter_settlement_rows(settlement))))
+
+def iter_settlement_ndjson(settlement):
+    """정산 내보내기 레코드를 한 줄에 하나씩 JSON으로 만들어 바이트 청크로 반환합니다."""
+    return _chunked(
+        json.dumps(record, ensure_ascii=False) + '\n' for record in iter_settlement_records(settlement)
+    )
@@ -0,0 +1,70 @@
+import threading
+from itertools import groupby
+from django.db import transaction
+from .models import DictionaryChange, DictionaryRevision
+from api.ocr_pipeline.process_text import get_processor
+from api.ocr_pipeline.extract_item2 import STORE_ITEM_DICT_PATH
+
+# 같은 프로세스의 여러 스레드가 같은 변경을 두 번 반영하지 않도록 함
+_sync_lock = threading.Lock()
+
+def _apply(processor, action, store_name, item_names):
+    if action == 'add_store':
+        processor.add_store(store_name)
+    elif action == 'remove_store':
+        processor.remove_store(store_name)
+    elif action == 'add_item':
+        processor.add_items(store_name, item_names)
+    elif action == 'remove_item':
+        processor.remove_items(store_name, item_names)
+
+def sync(processor=None):
+    """
+    DB의 사전 변경 기록 중 이 프로세스의 가게/메뉴 사전에 아직 반영하지 않은 변경만 읽어 반영하고 processor를 반환합니다.
+    변경이 없으면 id 범위 조회 한 번으로 끝나므로 분석/관리 요청마다 호출합니다.
+    사전 파일이 바뀌어 processor가 다시 로드되면 리비전이 0이므로 모든 변경을 다시 반영합니다.
+    """
+    if processor is None:
+        processor = get_processor(STORE_ITEM_DICT_PATH)
+    with _sync_lock:
+        changes = []
+        # 리비전은 빈 번호 없이 매겨지므로 이어지는 부분까지만 반영 (중간 번호가 아직 안 보이면 다음 sync에서 반영)
+        for change in DictionaryChange.objects.filter(revision__gt=processor.revision).order_by('revision'):
+            if change.revision != processor.revision + len(changes) + 1:
+                break
+            changes.append(change)
+        # 같은 가게에 연속으로 추가/삭제된 메뉴는 한 번에 반영
+        for (action, store_name), group in groupby(changes, key=lambda change: (change.action, change.store_name)):
+            group = list(group)
+            _apply(processor, action, store_name, [change.item_name for change in group])
+            processor.revision = group[-1].revision
+    return processor
+
+def record(changes):
+    """
+    변경 기록(DictionaryChange 리스트)에 리비전을 매겨 저장하고 현재 프로세스의 사전에 바로 반영합니다.
+    리비전 행을 잠근 채 같은 트랜잭션에서 저장하므로, 동시에 기록해도 리비전은 커밋 순서대로 빈 번호 없이 이어집니다.
+    """
+    with transaction.atomic():
+        counter, _ = DictionaryRevision.objects.select_for_update().get_or_create(id=1)
+        for change in changes:
+            counter.revision += 1
+            change.revision = counter.revision
+        counter.save(update_fields=['revision'])
+        DictionaryChange.objects.bulk_create(changes)
+    return sync()
+
+def add_store(store_name, items=()):
+    return record(
+        [DictionaryChange(action='add_store', store_name=store_name)]
+        + [DictionaryChange(action='add_item', store_name=store_name, item_name=item) for item in items]
+    )
+
+def remove_store(store_name):
+    return record([DictionaryChange(action='remove_store', store_name=store_name)])
+
+def add_items(store_name, items):
+    return record([DictionaryChange(action='add_item', store_name=store_name, item_name=item) for item in items])
+
+def remove_item(store_name, item_name):
+    return record([DictionaryChange(action='remove_item', store_name=store_name, item_name=item_name)])
@@ -1,8 +1,43 @@
-from django.test import TestCase, Client
+from django.test import TestCase, TransactionTestCase, Client, override_settings
 from django.urls import reverse
-from api.models import Participant, Receipt, ReceiptInfo, Settlement
-from io import BytesIO
+from django.apps import apps
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from api.models import (
+    Participant, Receipt, ReceiptInfo, Settlement, SettlementParticipant, AnalyzeJob, OcrCacheEntry, DictionaryChange
+)
+from api import ocr_cache, store_dictionary
+from api.analysis import claim_next_job, process_analyze_job, run_receipt_analysis
+from api.apps import warm_ocr_on_boot
+from api.management.commands import participant_name_constraint
+from api.serializers import ReceiptInfoSerializer
+from api.settlement import iter_settlement_records
+from datetime import timedelta
+from io import BytesIO, StringIO
 from openpyxl import load_workbook
+from urllib.parse import urlencode
+from unittest import mock
+import os
+import csv
+import json
+import re
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import cv2
+import numpy as np
+from api.ocr_pipeline import (
+    analyze, compiled_dictionary, extract_item2, image_to_text, jamo_index, preprocessing, process_text
+)
 
 class ExportExcelTest(TestCase):
     def setUp(self):
@@ -29,6 +64,1483 @@ class ExportExcelTest(TestCase):
         response = client.get(url)
 
         self.assertEqual(response.status_code, 200)
+        content = b"".join(response.streaming_content)
 
         with open("test_output.xlsx", "wb") as f:
-            f.write(response.content)
+            f.write(content)
+
+    def export_rows(self, settlement):
+        response = Client().get(reverse("api:export_settlement_excel", kwargs={"settlement_id": settlement.id}))
+        self.assertTrue(response.streaming)
+        wb = load_workbook(BytesIO(b"".join(response.streaming_content)))
+        return [[cell for cell in row if cell is not None] for row in wb["정산 결과"].iter_rows(values_only=True)]
+
+    def test_export_rows(self):
+        empty = Receipt.objects.create(file_name="empty.jpg", image_path="receipts/empty.jpg")
+        self.settlement.receipts.add(empty)
+        self.settlement.item_assignments_data = json.dumps([
+            {"receipt_id": self.receipt.id, "items": [
+                {"item_name": " 김밥", "participants": ["최희수", "하승연"]},
+                {"item_name": "라면", "participants": ["하승연"]},
+            ]},
+            {"receipt_id": self.receipt.id, "items": [{"item_name": "김밥", "participants": ["무시됨"]}]},
+        ], ensure_ascii=False)
+        self.settlement.save()
+        uploaded = self.receipt.upload_time.strftime('%Y-%m-%d %H:%M:%S')
+
+        rows = self.export_rows(self.settlement)
+        self.assertEqual(rows[:11], [
+            ["영수증 1"], ["상호명", "상호1"], ["업로드일", uploaded], [],
+            ["메뉴명", "수량", "단가", "총액", "참여자"],
+            ["김밥", 1, 3000, 3000, "최희수, 하승연"],
+            ["라면", 1, 4000, 4000, "하승연"],
+            [], ["총 결제금액", 7000], [], ["영수증 2"],
+        ])
+        self.assertEqual(rows[11], ["상호명", "정보 없음"])
+        self.assertEqual(rows[-7:], [
+            ["전체 정산 총액", 7000], ["정산 방식", "항목별 정산"], [],
+            ["정산 결과"], ["참여자", "정산 금액"], ["최희수", 3000], ["하승연", 4000],
+        ])
+
+    def test_export_query_count_does_not_grow_with_items(self):
+        def create_settlement(item_count):
+            receipt = Receipt.objects.create(file_name="big.jpg", image_path="receipts/big.jpg")
+            ReceiptInfo.objects.bulk_create([
+                ReceiptInfo(receipt=receipt, store_name="상호2", item_name=f"품목{i}",
+                            quantity=1, unit_price=100, total_amount=100)
+                for i in range(item_count)
+            ])
+            settlement = Settlement.objects.create(result={"최희수": 100 * item_count}, method="equal")
+            settlement.receipts.set([receipt, self.receipt])
+            return settlement
+
+        small, large = create_settlement(1), create_settlement(500)
+        # 정산 1 + 영수증 1 + 품목 1
+        with self.assertNumQueries(3):
+            small_rows = self.export_rows(small)
+        with self.assertNumQueries(3):
+            large_rows = self.export_rows(large)
+        self.assertEqual(len(large_rows) - len(small_rows), 499)
+        self.assertIn(["메뉴명", "수량", "단가", "총액"], large_rows)
+
+    def stream(self, name, settlement):
+        response = Client().get(reverse(f"api:{name}", kwargs={"settlement_id": settlement.id}))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode("utf-8")
+
+    def test_csv_export_matches_excel_rows(self):
+        self.settlement.item_assignments_data = json.dumps(
+            [{"receipt_id": self.receipt.id, "items": [{"item_name": "김밥", "participants": ["최희수", "하승연"]}]}],
+            ensure_ascii=False,
+        )
+        self.settlement.save()
+
+        content = self.stream("export_settlement_csv", self.settlement)
+        self.assertTrue(content.startswith("\ufeff"))
+        # 엑셀에서는 빈 문자열 셀을 읽을 수 없으므로 빼고 비교
+        rows = [[int(cell) if cell.isdigit() else cell for cell in row if cell != ""]
+                for row in csv.reader(StringIO(content[1:]))]
+        self.assertEqual(rows, self.export_rows(self.settlement))
+        self.assertIn(["김밥", 1, 3000, 3000, "최희수, 하승연"], rows)
+
+    def test_ndjson_export_records(self):
+        content = self.stream("export_settlement_ndjson", self.settlement)
+        records = [json.loads(line) for line in content.splitlines()]
+
+        self.assertEqual([record["type"] for record in records],
+                         ["receipt", "item", "item", "receipt_total", "settlement", "result", "result"])
+        self.assertEqual(records[0]["store_name"], "상호1")
+        self.assertEqual(records[1], {"type": "item", "receipt_id": self.receipt.id, "item_name": "김밥", "quantity": 1,
+                                      "unit_price": 3000, "total_amount": 3000, "participants": []})
+        self.assertEqual(records[3]["total"], 7000)
+        self.assertEqual(records[4], {"type": "settlement", "settlement_id": self.settlement.id,
+                                      "method": "item", "total": 7000})
+        self.assertEqual({record["name"]: record["amount"] for record in records[5:]}, self.settlement.result)
+
+    def test_streaming_exports_query_count(self):
+        receipt = Receipt.objects.create(file_name="big.jpg", image_path="receipts/big.jpg")
+        ReceiptInfo.objects.bulk_create([
+            ReceiptInfo(receipt=receipt, store_name="상호2", item_name=f"품목{i}",
+                        quantity=1, unit_price=100, total_amount=100)
+            for i in range(5000)
+        ])
+        self.settlement.receipts.add(receipt)
+
+        for name in ("export_settlement_csv", "export_settlement_ndjson"):
+            with self.assertNumQueries(3):
+                content = self.stream(name, self.settlement)
+            self.assertIn("품목4999", content)
+
+class OcrReaderRegistryTest(TestCase):
+    def setUp(self):
+        image_to_text._readers.clear()
+        self.fake_easyocr = mock.MagicMock()
+        self.fake_easyocr.Reader.side_effect = lambda langs, gpu: object()
+
+    def tearDown(self):
+        image_to_text._readers.clear()
+
+    def test_reader_is_loaded_once_per_language_set(self):
+        with mock.patch.dict(sys.modules, {'easyocr': self.fake_easyocr}):
+            first = image_to_text.get_reader()
+            threads = [threading.Thread(target=image_to_text.get_reader) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self.assertIs(image_to_text.get_reader(['en', 'ko']), first)
+            self.assertIsNot(image_to_text.get_reader(['ko']), first)
+
+        self.assertEqual(self.fake_easyocr.Reader.call_count, 2)
+
+    @override_settings(OCR_WARM_ON_BOOT=True)
+    def test_warm_on_boot_only_from_server_and_worker_entry_points(self):
+        with mock.patch("api.apps.call_command") as fake_call, \
+                mock.patch.object(sys, "argv", ["manage.py", "migrate"]):
+            apps.get_app_config("api").ready()
+            self.assertFalse(fake_call.called)
+
+            call_command("run_analyze_jobs", "--once", stdout=StringIO())
+            fake_call.assert_called_once_with("warm_ocr")
+
+            fake_call.reset_mock()
+            with override_settings(OCR_WARM_ON_BOOT=False):
+                warm_ocr_on_boot()
+            self.assertFalse(fake_call.called)
+
+class ParallelAnalyzeTest(TestCase):
+    class FakePool:
+        """워커 대신 현재 프로세스에서 묶음별 OCR 결과를 만들고, fail_after개 묶음 뒤에는 워커가 죽은 것처럼 실패"""
+        def __init__(self, fail_after=None):
+            self.chunks = []
+            self.fail_after = fail_after
+
+        def map(self, fn, items):
+            for index, chunk in enumerate(items):
+                if index == self.fail_after:
+                    raise analyze.BrokenProcessPool("worker died")
+                self.chunks.append(chunk)
+                yield [[f"img{image}"] for image in chunk]
+
+    def analyze(self, images, pool, **kwargs):
+        """pool이 예외이면 풀 생성이 그 예외로 실패"""
+        serial = []
+
+        def analyze_chunk(chunk, **kwargs):
+            serial.append(chunk)
+            return [{"store_name": f"serial{image}", "items": []} for image in chunk]
+
+        with mock.patch.object(analyze, "_get_pool", return_value=pool,
+                               side_effect=pool if isinstance(pool, Exception) else None), \
+                mock.patch.object(analyze, "_discard_pool") as discard, \
+                mock.patch.object(analyze, "analyze_image_batch", analyze_chunk), \
+                mock.patch.object(analyze, "extract_items", lambda lines, **kwargs: {"store_name": lines[0], "items": []}), \
+                mock.patch("builtins.print"):
+            results = [result["store_name"] for result in analyze.iter_analyze_images(images, **kwargs)]
+        return results, serial, discard
+
+    def test_small_group_uses_the_pool(self):
+        pool = self.FakePool()
+        results, serial, _ = self.analyze([0, 1, 2], pool, max_workers=4, images_per_batch=4)
+        self.assertEqual(pool.chunks, [[0], [1], [2]])
+        self.assertEqual(results, ["img0", "img1", "img2"])
+        self.assertEqual(serial, [])
+
+    def test_results_keep_input_order_across_chunks(self):
+        pool = self.FakePool()
+        results, _, _ = self.analyze(list(range(10)), pool, max_workers=3, images_per_batch=2)
+        self.assertEqual(pool.chunks, [[0, 1], [2, 3], [4, 5], [6, 7], [8, 9]])
+        self.assertEqual(results, [f"img{i}" for i in range(10)])
+
+    def test_single_worker_does_not_start_a_pool(self):
+        results, serial, _ = self.analyze([0, 1, 2], AssertionError("pool started"), max_workers=1, images_per_batch=2)
+        self.assertEqual(results, ["serial0", "serial1", "serial2"])
+        self.assertEqual(serial, [[0, 1], [2]])
+
+    def test_broken_pool_falls_back_to_serial_for_remaining_chunks(self):
+        pool = self.FakePool(fail_after=1)
+        results, serial, discard = self.analyze([0, 1, 2, 3], pool, max_workers=2, images_per_batch=2)
+        # 완료된 묶음은 그대로 쓰고, 나머지 묶음만 순차 처리
+        self.assertEqual(results, ["img0", "img1", "serial2", "serial3"])
+        self.assertEqual(serial, [[2, 3]])
+        discard.assert_called_once()
+
+    def test_pool_start_failure_falls_back_to_serial(self):
+        results, serial, discard = self.analyze([0, 1], OSError("spawn failed"), max_workers=2, images_per_batch=1)
+        self.assertEqual(results, ["serial0", "serial1"])
+        self.assertEqual(serial, [[0], [1]])
+        discard.assert_called_once()
+
+class BatchedOcrTest(TestCase):
+    def test_chunks_are_spread_across_workers(self):
+        images = list(range(10))
+        sizes = lambda chunks: [len(chunk) for chunk in chunks]
+        self.assertEqual(sizes(analyze._chunk_images(images[:4], 4, 4)), [1, 1, 1, 1])
+        self.assertEqual(sizes(analyze._chunk_images(images, 4, 4)), [3, 3, 3, 1])
+        self.assertEqual(sizes(analyze._chunk_images(images, 2, 4)), [4, 4, 2])
+        self.assertEqual(sizes(analyze._chunk_images(images, 1, 4)), [4, 4, 2])
+        self.assertEqual(sum(analyze._chunk_images(images, 3, 4), []), images)
+
+    def test_readtext_batched_groups_by_width_and_keeps_image_order(self):
+        # 이미지별 검출 결과: (가로 영역, 자유 영역), 영역 이름의 숫자가 crop 폭
+        detections = {"a": (["a-100", "a-200"], ["a-100f"]), "b": (["b-200"], []), "c": ([], [])}
+        calls = []
+
+        def get_image_list(h_list, f_list, img, model_height):
+            box = (h_list or f_list)[0]
+            return [(box, f"crop:{box}")], float(box.split("-")[1].rstrip("f"))
+
+        def get_text(character, imgH, imgW, recognizer, converter, image_list, **kwargs):
+            calls.append((imgW, [box for box, _ in image_list], kwargs["batch_size"]))
+            return [(box, f"text:{box}", 0.9) for box, _ in image_list]
+
+        modules = {
+            "easyocr": mock.MagicMock(),
+            "easyocr.config": mock.MagicMock(imgH=64),
+            "easyocr.recognition": mock.MagicMock(get_text=get_text),
+            "easyocr.utils": mock.MagicMock(get_image_list=get_image_list,
+                                            reformat_input=lambda image: (image, image)),
+        }
+        reader = mock.MagicMock(character="abc", lang_char="ab", device="cpu")
+        reader.detect.side_effect = lambda img, reformat: ([detections[img][0]], [detections[img][1]])
+
+        with mock.patch.dict(sys.modules, modules):
+            results = image_to_text.readtext_batched(reader, ["a", "b", "c"], batch_size=16)
+
+        self.assertEqual([[text for _, text, _ in result] for result in results],
+                         [["text:a-100", "text:a-200", "text:a-100f"], ["text:b-200"], []])
+        self.assertEqual(sorted(calls), [
+            (100, ["a-100", "a-100f"], 16),
+            (200, ["a-200", "b-200"], 16),
+        ])
+
+class ReceiptCropTest(TestCase):
+    @staticmethod
+    def synthetic_receipt(width=3000, height=4000):
+        # 밝은 배경 위에 기울어진 영수증(사각형)과 글자 줄을 그린 이미지
+        image = np.full((height, width, 3), 235, np.uint8)
+        corners = np.array([[0.1, 0.06], [0.92, 0.1], [0.88, 0.95], [0.07, 0.91]]) * [width, height]
+        cv2.fillConvexPoly(image, corners.astype(np.int32), (40, 40, 40))
+        for y in range(int(height * 0.18), int(height * 0.85), max(1, height // 27)):
+            cv2.putText(image, "ITEM 3,500", (int(width * 0.2), y), cv2.FONT_HERSHEY_SIMPLEX,
+                        width / 1000, (235, 235, 235), max(1, width // 500))
+        return image
+
+    def test_downscaled_detection_matches_full_resolution_crop(self):
+        image = self.synthetic_receipt()
+        small, _ = preprocessing.detect_and_crop_mask(image, detect_width=1000)
+        full, _ = preprocessing.detect_and_crop_mask(image, detect_width=None)
+
+        # 꼭짓점은 축소 이미지에서 찾지만 크롭은 원본 해상도에서 하므로 크기와 내용이 거의 같음
+        self.assertGreater(full.shape[0], 3000)
+        for small_size, full_size in zip(small.shape[:2], full.shape[:2]):
+            self.assertLessEqual(abs(small_size - full_size), full_size * 0.01)
+        small_bin = cv2.resize(preprocessing.binarize_for_ocr(small), full.shape[1::-1], interpolation=cv2.INTER_NEAREST)
+        self.assertLess((small_bin != preprocessing.binarize_for_ocr(full)).mean(), 0.03)
+
+        # 검출 크기보다 좁은 이미지는 축소하지 않음
+        narrow = self.synthetic_receipt(800, 1000)
+        np.testing.assert_array_equal(
+            preprocessing.detect_and_crop_mask(narrow, detect_width=1000)[0],
+            preprocessing.detect_and_crop_mask(narrow, detect_width=None)[0],
+        )
+
+    def test_downscaled_corners_match_full_resolution_corners(self):
+        width, height, detect_width = 3000, 4000, 1000
+        image = self.synthetic_receipt(width, height)
+        expected = np.array([[0.1, 0.06], [0.92, 0.1], [0.88, 0.95], [0.07, 0.91]]) * [width, height]
+        small = cv2.resize(image, (detect_width, height * detect_width // width), interpolation=cv2.INTER_AREA)
+        scaled = preprocessing.find_receipt_corners(small) * [width / small.shape[1], height / small.shape[0]]
+        full = preprocessing.find_receipt_corners(image)
+
+        # 꼭짓점 순서는 검출 결과마다 다를 수 있으므로 실제 꼭짓점마다 가장 가까운 점과 비교
+        def nearest(points):
+            return points[np.argmin(np.linalg.norm(points[None] - expected[:, None], axis=2), axis=1)]
+
+        # 축소 배율(3배) 안팎의 오차로 원본 해상도 검출과 같은 꼭짓점을 찾음
+        self.assertLess(np.abs(nearest(scaled) - nearest(full)).max(), width / detect_width * 4)
+        self.assertLess(np.abs(nearest(full) - expected).max(), width * 0.01)
+
+    def test_detect_width_is_passed_to_preprocessing(self):
+        widths = []
+
+        def fake_preprocess(source, detect_width):
+            widths.append(detect_width)
+            return None
+
+        with mock.patch("api.ocr_pipeline.analyze.preprocess_image_to_memory", fake_preprocess), \
+                mock.patch("api.ocr_pipeline.analyze.ocr_images_from_memory", lambda imgs, batch_size: [[] for _ in imgs]):
+            analyze.analyze_images([b"a", b"b"], images_per_batch=2, detect_width=640)
+        self.assertEqual(widths, [640, 640])
+        # 검출 크기가 바뀌면 캐시된 OCR 결과는 다시 계산 대상
+        self.assertNotEqual(analyze.ocr_version(detect_width=640), analyze.ocr_version(detect_width=None))
+
+class AnalyzeJobTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.r1 = Receipt.objects.create(file_name="a.jpg", image_path="receipts/missing-a.jpg")
+        self.r2 = Receipt.objects.create(file_name="b.jpg", image_path="receipts/missing-b.jpg")
+
+    def test_job_is_queued_and_drained_by_worker(self):
+        response = self.client.post("/api/receiptinfo/analyze_jobs/")
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()["data"]["id"]
+        self.assertEqual(AnalyzeJob.objects.get(id=job_id).status, "pending")
+
+        call_command("run_analyze_jobs", "--once", stdout=StringIO())
+
+        data = self.client.get(f"/api/receiptinfo/analyze_jobs/{job_id}/").json()["data"]
+        self.assertEqual(data["status"], "done")
+        self.assertEqual(
+            [(p["receipt"], p["status"]) for p in data["progress"]],
+            [(self.r1.id, "skipped"), (self.r2.id, "skipped")],
+        )
+        self.assertEqual(data["results"], [])
+
+    def test_unknown_job_returns_404(self):
+        response = self.client.get("/api/receiptinfo/analyze_jobs/999/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_job_of_dead_worker_is_reclaimed(self):
+        now = timezone.now()
+        alive = AnalyzeJob.objects.create(receipt_ids=[self.r1.id], status="running", started_at=now,
+                                          heartbeat_at=now - timedelta(seconds=60), attempts=1)
+        dead = AnalyzeJob.objects.create(receipt_ids=[self.r2.id], status="running", started_at=now,
+                                         heartbeat_at=now - timedelta(hours=1), attempts=1)
+        gave_up = AnalyzeJob.objects.create(receipt_ids=[self.r2.id], status="running", started_at=now,
+                                            heartbeat_at=now - timedelta(hours=1), attempts=3)
+
+        with override_settings(ANALYZE_JOB_TIMEOUT=600, ANALYZE_JOB_MAX_ATTEMPTS=3), mock.patch("builtins.print"):
+            call_command("run_analyze_jobs", "--once", stdout=StringIO())
+
+        dead.refresh_from_db()
+        self.assertEqual((dead.status, dead.attempts), ("done", 2))
+        self.assertGreater(dead.heartbeat_at, now)
+        # 진행 기록이 최근인 작업은 그대로 두고, 여러 번 중단된 작업은 실패 처리
+        self.assertEqual(AnalyzeJob.objects.get(id=alive.id).status, "running")
+        gave_up.refresh_from_db()
+        self.assertEqual(gave_up.status, "failed")
+        self.assertIn("3번", gave_up.error)
+
+    def test_reclaim_is_claimed_by_one_worker(self):
+        job = AnalyzeJob.objects.create(receipt_ids=[self.r1.id], status="running",
+                                        heartbeat_at=timezone.now() - timedelta(hours=1), attempts=1)
+        with mock.patch("builtins.print"):
+            self.assertEqual(claim_next_job(timeout=600).id, job.id)
+            self.assertIsNone(claim_next_job(timeout=600))
+
+class AnalyzeJobOwnershipTest(TransactionTestCase):
+    def setUp(self):
+        self.receipts = [Receipt.objects.create(file_name=f"{name}.jpg", image_path=f"receipts/missing-{name}.jpg")
+                         for name in "ab"]
+        self.stale = timezone.now() - timedelta(hours=1)
+        self.job = AnalyzeJob.objects.create(receipt_ids=[r.id for r in self.receipts], status="running",
+                                             heartbeat_at=self.stale, attempts=1)
+
+    def test_heartbeat_is_refreshed_while_analysis_runs(self):
+        seen = []
+
+        def slow_analysis(receipts, on_progress=None, force=False):
+            # 영수증 하나도 끝나지 않은 긴 OCR 동안에도 진행 기록이 갱신되는지 확인
+            for _ in range(200):
+                heartbeat_at = AnalyzeJob.objects.get(id=self.job.id).heartbeat_at
+                if heartbeat_at > self.stale:
+                    seen.append(heartbeat_at)
+                    break
+                threading.Event().wait(0.01)
+            return []
+
+        with mock.patch("api.analysis.run_receipt_analysis", slow_analysis):
+            job = process_analyze_job(self.job, heartbeat_interval=0.01)
+
+        self.assertTrue(seen)
+        self.assertEqual(job.status, "done")
+        self.assertIsNone(claim_next_job(timeout=600))
+
+    def test_reclaimed_job_stops_without_overwriting(self):
+        calls = []
+
+        def analysis(receipts, on_progress=None, force=False):
+            # 분석 도중 다른 워커가 작업을 다시 가져감
+            AnalyzeJob.objects.filter(id=self.job.id).update(attempts=2, progress=[])
+            for receipt in receipts:
+                calls.append(receipt.id)
+                on_progress(receipt, "done", 1)
+            return []
+
+        with mock.patch("api.analysis.run_receipt_analysis", analysis), mock.patch("builtins.print"):
+            job = process_analyze_job(self.job, heartbeat_interval=60)
+
+        # 첫 진행 기록에서 멈추고, 새 워커의 작업 기록은 그대로 둠
+        self.assertEqual(calls, [self.receipts[0].id])
+        self.assertEqual(job.status, "running")
+        stored = AnalyzeJob.objects.get(id=self.job.id)
+        self.assertEqual((stored.status, stored.attempts, stored.progress), ("running", 2, []))
+
+    def test_final_result_is_not_saved_after_reclaim(self):
+        def analysis(receipts, on_progress=None, force=False):
+            AnalyzeJob.objects.filter(id=self.job.id).update(attempts=2)
+            return [{"item_name": "아메리카노"}]
+
+        with mock.patch("api.analysis.run_receipt_analysis", analysis), mock.patch("builtins.print"):
+            process_analyze_job(self.job, heartbeat_interval=60)
+
+        stored = AnalyzeJob.objects.get(id=self.job.id)
+        self.assertEqual((stored.status, stored.results, stored.finished_at), ("running", None, None))
+
+class OcrCacheTest(TestCase):
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.media.name, "receipts"))
+        for name, content in [("a.jpg", b"same"), ("b.jpg", b"same"), ("c.jpg", b"other")]:
+            with open(os.path.join(self.media.name, "receipts", name), "wb") as f:
+                f.write(content)
+            Receipt.objects.create(file_name=name, image_path=f"receipts/{name}")
+        self.ocr_calls = []
+
+    def tearDown(self):
+        self.media.cleanup()
+
+    def new_files(self):
+        return set(os.listdir(os.path.join(self.media.name, "receipts"))) - {"a.jpg", "b.jpg", "c.jpg"}
+
+    def fake_analyze(self, paths, **kwargs):
+        for path in paths:
+            self.ocr_calls.append(os.path.basename(path))
+            yield {"store_name": "상호1", "items": [
+                {"item_name": "김밥", "quantity": 1, "unit_price": 3000, "total_amount": 3000}
+            ], "lines": ["상호1", "김밥 3,000"]}
+
+    def test_duplicate_and_repeated_images_skip_ocr(self):
+        with override_settings(MEDIA_ROOT=self.media.name), \
+                mock.patch("api.analysis.iter_analyze_images", self.fake_analyze):
+            first = run_receipt_analysis(Receipt.objects.order_by("id"))
+            second = run_receipt_analysis(Receipt.objects.order_by("id"), force=True)
+
+        self.assertEqual(self.ocr_calls, ["a.jpg", "c.jpg"])
+        self.assertEqual(len(first), 3)
+        self.assertEqual([i["item_name"] for i in second], [i["item_name"] for i in first])
+        self.assertEqual(OcrCacheEntry.objects.count(), 2)
+        self.assertEqual(ReceiptInfo.objects.count(), 3)
+
+    def test_hits_are_counted_and_evict_runs_only_after_new_entries(self):
+        before = ocr_cache.get_stats()
+        with override_settings(MEDIA_ROOT=self.media.name), \
+                mock.patch("api.analysis.iter_analyze_images", self.fake_analyze), \
+                mock.patch("api.ocr_cache.evict", wraps=ocr_cache.evict) as evict, \
+                mock.patch("builtins.print") as printed:
+            run_receipt_analysis(Receipt.objects.order_by("id"))
+            self.assertEqual(evict.call_count, 1)
+            # 모두 캐시에서 가져오면 새 항목이 없으므로 정리하지 않음
+            run_receipt_analysis(Receipt.objects.order_by("id"), force=True)
+            self.assertEqual(evict.call_count, 1)
+
+        stats = ocr_cache.get_stats()
+        self.assertEqual((stats["hits"] - before["hits"], stats["misses"] - before["misses"]), (3, 3))
+        logged = [call.args[0] for call in printed.call_args_list if "적중률" in str(call.args[0])]
+        self.assertEqual(len(logged), 2)
+        self.assertIn(f"적중 {stats['hits']}회", logged[-1])
+
+    def test_incremental_analysis_only_processes_new_receipts(self):
+        with override_settings(MEDIA_ROOT=self.media.name, OCR_CACHE_ENABLED=False), \
+                mock.patch("api.analysis.iter_analyze_images", self.fake_analyze):
+            run_receipt_analysis(Receipt.objects.order_by("id"))
+            with open(os.path.join(self.media.name, "receipts", "d.jpg"), "wb") as f:
+                f.write(b"new")
+            new_receipt = Receipt.objects.create(file_name="d.jpg", image_path="receipts/d.jpg")
+            self.ocr_calls.clear()
+
+            items = run_receipt_analysis(Receipt.objects.order_by("id"))
+            self.assertEqual(self.ocr_calls, ["d.jpg"])
+            self.assertEqual(len(items), 4)
+            self.assertEqual(Receipt.objects.get(id=new_receipt.id).analysis_status, "done")
+
+            self.ocr_calls.clear()
+            run_receipt_analysis(Receipt.objects.order_by("id"), force=True)
+            self.assertEqual(len(self.ocr_calls), 4)
+
+    def test_analyze_on_upload_uses_in_memory_bytes(self):
+        upload = SimpleUploadedFile("new.jpg", b"uploaded-bytes", content_type="image/jpeg")
+        received = []
+
+        def fake_analyze(sources, **kwargs):
+            for source in sources:
+                received.append(source)
+                yield {"store_name": "상호1", "items": [
+                    {"item_name": "라면", "quantity": 1, "unit_price": 4000, "total_amount": 4000}
+                ], "lines": ["상호1", "라면 4,000"]}
+
+        with override_settings(MEDIA_ROOT=self.media.name, OCR_CACHE_ENABLED=False), \
+                mock.patch("api.analysis.iter_analyze_images", fake_analyze):
+            response = Client().post("/api/receipt/upload/", {"image": upload, "analyze": "true"})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(received, [b"uploaded-bytes"])
+        self.assertEqual([i["item_name"] for i in response.json()["results"]], ["라면"])
+        # 응답 전에 원본 저장이 끝나므로 바로 다음 요청도 완전한 파일을 읽음
+        image_path = response.json()["data"][0]["image_path"]
+        with open(os.path.join(self.media.name, image_path), "rb") as f:
+            self.assertEqual(f.read(), b"uploaded-bytes")
+        self.assertEqual(self.new_files(), {os.path.basename(image_path)})
+
+    def test_failed_background_write_removes_receipt(self):
+        upload = SimpleUploadedFile("new.jpg", b"uploaded-bytes", content_type="image/jpeg")
+
+        def fake_analyze(sources, **kwargs):
+            for _ in sources:
+                yield {"store_name": "상호1", "items": [
+                    {"item_name": "라면", "quantity": 1, "unit_price": 4000, "total_amount": 4000}
+                ], "lines": ["상호1"]}
+
+        before = set(Receipt.objects.values_list("id", flat=True))
+        with override_settings(MEDIA_ROOT=self.media.name, OCR_CACHE_ENABLED=False), \
+                mock.patch("api.analysis.iter_analyze_images", fake_analyze), \
+                mock.patch("api.views.os.replace", side_effect=OSError("disk full")), \
+                mock.patch("builtins.print"):
+            response = Client().post("/api/receipt/upload/", {"image": upload, "analyze": "true"})
+
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(response.json()["success"])
+        self.assertIn("new.jpg", response.json()["error"])
+        # 원본이 없는 영수증과 분석 결과는 남기지 않고, 쓰다 만 임시 파일도 삭제
+        self.assertEqual(set(Receipt.objects.values_list("id", flat=True)), before)
+        self.assertFalse(ReceiptInfo.objects.filter(item_name="라면").exists())
+        self.assertEqual(self.new_files(), set())
+
+class AnalysisPersistenceTest(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.media = media.name
+        os.makedirs(os.path.join(self.media, "receipts"))
+
+    def create_receipts(self, count):
+        receipts = []
+        for i in range(count):
+            name = f"r{Receipt.objects.count()}.jpg"
+            with open(os.path.join(self.media, "receipts", name), "wb") as f:
+                f.write(name.encode())
+            receipts.append(Receipt.objects.create(file_name=name, image_path=f"receipts/{name}"))
+        return receipts
+
+    @staticmethod
+    def fake_analyze(item_count):
+        def analyze(sources, **kwargs):
+            for _ in sources:
+                yield {"store_name": "상호1", "items": [
+                    {"item_name": f" 품목{i} ", "quantity": 1, "unit_price": 1000 * i, "total_amount": 1000 * i}
+                    for i in range(item_count)
+                ], "lines": ["상호1"]}
+        return analyze
+
+    def count_queries(self, receipt_count, item_count):
+        receipts = self.create_receipts(receipt_count)
+        with override_settings(MEDIA_ROOT=self.media, OCR_CACHE_ENABLED=False), \
+                mock.patch("api.analysis.iter_analyze_images", self.fake_analyze(item_count)), \
+                CaptureQueriesContext(connection) as queries:
+            results = run_receipt_analysis(receipts)
+        self.assertEqual(len(results), receipt_count * item_count)
+        return len(queries)
+
+    def test_query_count_grows_with_receipts_not_items(self):
+        few_items = self.count_queries(3, 1)
+        many_items = self.count_queries(3, 15)
+        more_receipts = self.count_queries(6, 15)
+        self.assertEqual(few_items, many_items)
+        # 영수증마다 일정한 수의 쿼리 (품목 INSERT 1 + 상태 UPDATE 1 + 세이브포인트 생성/해제 2)
+        self.assertLessEqual(more_receipts - many_items, 3 * 4)
+
+    def test_results_are_built_from_saved_rows(self):
+        receipts = self.create_receipts(2)
+        with override_settings(MEDIA_ROOT=self.media, OCR_CACHE_ENABLED=False), \
+                mock.patch("api.analysis.iter_analyze_images", self.fake_analyze(3)):
+            results = run_receipt_analysis(receipts)
+
+        saved = ReceiptInfo.objects.order_by("id")
+        self.assertEqual(results, ReceiptInfoSerializer(saved, many=True).data)
+        self.assertEqual([item["item_name"] for item in results[:3]], ["품목0", "품목1", "품목2"])
+
+    def test_ids_are_loaded_when_bulk_create_does_not_return_them(self):
+        receipts = self.create_receipts(2)
+        bulk_create = ReceiptInfo.objects.bulk_create
+
+        def bulk_create_without_ids(rows, **kwargs):
+            # MySQL처럼 생성된 id를 돌려주지 않는 백엔드
+            created = bulk_create(rows, **kwargs)
+            for row in rows:
+                row.pk = None
+            return created
+
+        with override_settings(MEDIA_ROOT=self.media, OCR_CACHE_ENABLED=False), \
+                mock.patch("api.analysis.iter_analyze_images", self.fake_analyze(3)), \
+                mock.patch.object(ReceiptInfo.objects, "bulk_create", bulk_create_without_ids):
+            results = run_receipt_analysis(receipts)
+
+        self.assertEqual([item["id"] for item in results], list(ReceiptInfo.objects.order_by("id").values_list("id", flat=True)))
+
+    def test_invalid_item_saves_nothing_for_the_receipt(self):
+        receipts = self.create_receipts(1)
+
+        def analyze(sources, **kwargs):
+            for _ in sources:
+                yield {"store_name": "상호1", "items": [
+                    {"item_name": "김밥", "quantity": 1, "unit_price": 3000, "total_amount": 3000},
+                    {"item_name": "라면", "quantity": "한 개", "unit_price": 4000, "total_amount": 4000},
+                ], "lines": ["상호1"]}
+
+        with override_settings(MEDIA_ROOT=self.media, OCR_CACHE_ENABLED=False), \
+                mock.patch("api.analysis.iter_analyze_images", analyze):
+            with self.assertRaises(ValidationError):
+                run_receipt_analysis(receipts)
+        self.assertFalse(ReceiptInfo.objects.exists())
+
+class SettlementCalculationTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.url = reverse("api:settlement-calculate-settlement")
+
+    def create_group(self, participant_count, receipt_count, item_count):
+        start = Participant.objects.count()
+        names = [f"참가자{start + i}" for i in range(participant_count)]
+        Participant.objects.bulk_create([Participant(name=name) for name in names])
+        receipts = []
+        for r in range(receipt_count):
+            receipt = Receipt.objects.create(file_name=f"r{r}.jpg", image_path=f"receipts/r{r}.jpg")
+            ReceiptInfo.objects.bulk_create([
+                ReceiptInfo(receipt=receipt, store_name="상호1", item_name=f"품목{i}",
+                            quantity=1, unit_price=1000 * (i + 1), total_amount=1000 * (i + 1))
+                for i in range(item_count)
+            ])
+            receipts.append(receipt)
+        return names, receipts
+
+    def post(self, data):
+        return self.client.post(self.url, data, content_type="application/json")
+
+    def equal_request(self, names, receipts):
+        return {"method": "equal", "participants": names,
+                "receipts": [{"receipt_id": receipt.id} for receipt in receipts]}
+
+    def item_request(self, names, receipts, item_count):
+        return {"method": "item", "receipts": [
+            {"receipt_id": receipt.id, "items": [
+                {"item_name": f" 품목{i} ", "participants": names[i % len(names):] or names}
+                for i in range(item_count)
+            ]}
+            for receipt in receipts
+        ]}
+
+    def count_queries(self, data):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post(data)
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_group_size(self):
+        small_names, small_receipts = self.create_group(2, 1, 2)
+        large_names, large_receipts = self.create_group(10, 8, 20)
+
+        for build in (self.equal_request, lambda names, receipts: self.item_request(names, receipts, 2)):
+            small = self.count_queries(build(small_names, small_receipts))
+            # 영수증/품목 조회 2 + 저장(세이브포인트 2, 정산 INSERT 1, 연결 INSERT 2, 참가자 조회 1)
+            with self.assertNumQueries(small):
+                response = self.post(build(large_names, large_receipts))
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(small, 8)
+
+    def test_equal_split_amounts(self):
+        names, receipts = self.create_group(3, 2, 2)
+        response = self.post(self.equal_request(names, receipts))
+
+        # 영수증마다 (1000 + 2000) // 3 = 1000
+        self.assertEqual(response.json()["result"], {name: 2000 for name in names})
+        settlement = Settlement.objects.get(id=response.json()["settlement_id"])
+        self.assertEqual(set(settlement.receipts.values_list("id", flat=True)), {receipt.id for receipt in receipts})
+        self.assertEqual(set(settlement.participants.values_list("name", flat=True)), set(names))
+
+    def test_item_split_amounts(self):
+        names, receipts = self.create_group(2, 1, 3)
+        ReceiptInfo.objects.create(receipt=receipts[0], store_name="상호1", item_name="품목0",
+                                   quantity=1, unit_price=500, total_amount=500)
+        response = self.post({"method": "item", "receipts": [{"receipt_id": receipts[0].id, "items": [
+            {"item_name": "품목0", "participants": names},
+            {"item_name": "품목2 ", "participants": names[:1]},
+            {"item_name": "없는 품목", "participants": names[1:]},
+        ]}]})
+
+        # 품목0은 같은 이름 두 개(1000, 500)를 각각 나눔
+        self.assertEqual(response.json()["result"], {names[0]: 500 + 250 + 3000, names[1]: 500 + 250})
+        settlement = Settlement.objects.get(id=response.json()["settlement_id"])
+        self.assertEqual(json.loads(settlement.item_assignments_data)[0]["receipt_id"], receipts[0].id)
+
+    def test_item_names_differing_only_in_case_match(self):
+        names, receipts = self.create_group(2, 1, 0)
+        ReceiptInfo.objects.create(receipt=receipts[0], store_name="상호1", item_name="ICE Americano ",
+                                   quantity=1, unit_price=4000, total_amount=4000)
+        response = self.post({"method": "item", "receipts": [{"receipt_id": receipts[0].id, "items": [
+            {"item_name": "ice americano", "participants": names},
+        ]}]})
+
+        self.assertEqual(response.json()["result"], {names[0]: 2000, names[1]: 2000})
+        # 내보내기에서도 같은 품목으로 보고 참여자를 표시
+        settlement = Settlement.objects.get(id=response.json()["settlement_id"])
+        items = [record for record in iter_settlement_records(settlement) if record["type"] == "item"]
+        self.assertEqual(items[0]["participants"], names)
+
+    def test_invalid_requests(self):
+        names, receipts = self.create_group(2, 1, 1)
+        self.assertEqual(self.post({"method": "equal", "receipts": [{"receipt_id": receipts[0].id}]}).status_code, 400)
+        self.assertEqual(self.post({"method": "item", "receipts": [{"receipt_id": receipts[0].id}]}).status_code, 400)
+        self.assertEqual(self.post({"method": "half", "receipts": [{"receipt_id": receipts[0].id}]}).status_code, 400)
+        self.assertFalse(Settlement.objects.exists())
+
+        # 없는 영수증은 건너뜀
+        response = self.post(self.equal_request(names, receipts) | {"receipts": [{"receipt_id": 999}, {"receipt_id": receipts[0].id}]})
+        self.assertEqual(response.json()["message"], "1개 영수증 정산 완료")
+
+class ParticipantNameTest(TestCase):
+    def test_same_name_can_join_again(self):
+        client = Client()
+        url = reverse("api:participant-create-participant")
+        self.assertEqual(client.post(url, {"name": "최희수"}, content_type="application/json").status_code, 201)
+        self.assertEqual(client.post(url, {"name": "최희수"}, content_type="application/json").status_code, 201)
+        self.assertEqual(Participant.objects.filter(name="최희수").count(), 2)
+
+    def test_settlement_links_one_participant_per_name(self):
+        old, new, other = (Participant.objects.create(name=name) for name in ["최희수", "최희수", "하승연"])
+        receipt = Receipt.objects.create(file_name="r.jpg", image_path="receipts/r.jpg")
+        ReceiptInfo.objects.create(receipt=receipt, store_name="상호1", item_name="품목",
+                                   quantity=1, unit_price=2000, total_amount=2000)
+
+        response = Client().post(reverse("api:settlement-calculate-settlement"), {
+            "method": "equal", "participants": ["최희수", "하승연"], "receipts": [{"receipt_id": receipt.id}],
+        }, content_type="application/json")
+
+        self.assertEqual(response.status_code, 200, response.content)
+        links = SettlementParticipant.objects.filter(settlement_id=response.json()["settlement_id"])
+        self.assertEqual(sorted(links.values_list("participant_id", "name")), [(new.id, "최희수"), (other.id, "하승연")])
+        # 이전 참가자는 그대로 남음
+        self.assertTrue(Participant.objects.filter(id=old.id).exists())
+
+class ParticipantNameConstraintTest(TransactionTestCase):
+    def link(self, settlement, name):
+        return SettlementParticipant.objects.create(
+            settlement=settlement, participant=Participant.objects.create(name=name), name=name
+        )
+
+    def test_enable_refuses_duplicates_without_deleting(self):
+        settlement = Settlement.objects.create(result={})
+        self.link(settlement, "최희수")
+        self.link(settlement, "최희수")
+
+        with self.assertRaises(CommandError):
+            call_command("participant_name_constraint", "enable", stdout=StringIO())
+        self.assertEqual(SettlementParticipant.objects.count(), 2)
+        self.assertEqual(Participant.objects.count(), 2)
+        self.assertFalse(participant_name_constraint.is_enabled())
+
+    def test_enable_and_disable(self):
+        first, second = Settlement.objects.create(result={}), Settlement.objects.create(result={})
+        self.link(first, "최희수")
+        # 다른 정산(모임)에서는 같은 이름을 써도 됨
+        self.link(second, "최희수")
+
+        call_command("participant_name_constraint", "enable", stdout=StringIO())
+        self.assertTrue(participant_name_constraint.is_enabled())
+        with self.assertRaises(IntegrityError):
+            self.link(first, "최희수")
+
+        call_command("participant_name_constraint", "disable", stdout=StringIO())
+        self.assertFalse(participant_name_constraint.is_enabled())
+        self.link(first, "최희수")
+
+class ParticipantNameMigrationTest(TransactionTestCase):
+    def migrate(self, target=None):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        target = target or executor.loader.graph.leaf_nodes("api")[0][1]
+        executor.migrate([("api", target)])
+        return executor.loader.project_state([("api", target)]).apps
+
+    def test_names_are_recorded_without_deleting_participants(self):
+        apps = self.migrate("0013_analyzejob_heartbeat")
+        OldParticipant = apps.get_model("api", "Participant")
+        OldSettlement = apps.get_model("api", "Settlement")
+        first, second, other = (OldParticipant.objects.create(name=name) for name in ["최희수", "최희수", "하승연"])
+        settlement = OldSettlement.objects.create(result={"최희수": 1000, "하승연": 1000})
+        settlement.participants.set([first, second, other])
+
+        self.migrate()
+
+        self.assertEqual(Participant.objects.count(), 3)
+        self.assertEqual(sorted(SettlementParticipant.objects.filter(settlement_id=settlement.id)
+                                .values_list("participant_id", "name")),
+                         [(first.id, "최희수"), (second.id, "최희수"), (other.id, "하승연")])
+
+        # 되돌릴 수 있음
+        self.migrate("0013_analyzejob_heartbeat")
+        self.migrate()
+        self.assertEqual(SettlementParticipant.objects.count(), 3)
+
+class LineGroupingTest(TestCase):
+    @staticmethod
+    def reference_groups(result, threshold=15):
+        # 벡터화 이전 구현 (순수 파이썬, 줄 안은 x최소 순)
+        def get_y_center(item):
+            y_values = [point[1] for point in item[0]]
+            return sum(y_values) / len(y_values)
+        groups, current, current_y = [], [], None
+        for item in sorted(result, key=get_y_center):
+            if current and abs(get_y_center(item) - current_y) <= threshold:
+                current.append(item)
+            else:
+                if current:
+                    groups.append(current)
+                current, current_y = [item], get_y_center(item)
+        if current:
+            groups.append(current)
+        return [sorted(group, key=lambda x: min(point[0] for point in x[0])) for group in groups]
+
+    def reference_lines(self, result, threshold=15):
+        lines = []
+        for group in self.reference_groups(result, threshold):
+            text = re.sub(r'\b\d{10,}\b', '', " ".join(item[1] for item in group)).strip()
+            if text:
+                lines.append(text)
+        return lines
+
+    def test_vectorized_grouping_matches_reference(self):
+        rng = random.Random(0)
+        for _ in range(50):
+            result = []
+            for i in range(rng.randint(1, 120)):
+                x, y = rng.randint(0, 800), rng.choice([rng.randint(0, 2000), 15 * rng.randint(0, 100)])
+                w, h = rng.randint(5, 200), rng.randint(5, 30)
+                text = rng.choice(["김밥", "3,000", "1234567890123", f"t{i}"])
+                result.append(([[x, y], [x + w, y], [x + w, y + h], [x, y + h]], text, rng.random()))
+            self.assertEqual(image_to_text.lines_from_ocr_result(result), self.reference_lines(result))
+            self.assertEqual(image_to_text.group_by_y_coordinates(result), self.reference_groups(result))
+
+    def test_group_lines_exposes_bbox_and_confidence(self):
+        result = [
+            ([[50, 10], [90, 10], [90, 30], [50, 30]], "3,000", 0.8),
+            ([[0, 12], [40, 12], [40, 28], [0, 28]], "김밥", 0.6),
+        ]
+        [line] = image_to_text.group_lines(result)
+        self.assertEqual(line["text"], "김밥 3,000")
+        self.assertEqual(line["bbox"], (0.0, 10.0, 90.0, 30.0))
+        self.assertAlmostEqual(line["confidence"], 0.7)
+
+class ProcessorRegistryTest(TestCase):
+    def test_dictionary_is_loaded_once_and_reloaded_on_change(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "dictionary.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("합계\n")
+
+            first = process_text.get_processor(path)
+            self.assertIs(process_text.get_processor(path), first)
+
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("합계\n카드\n")
+            os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+
+            reloaded = process_text.get_processor(path)
+            self.assertIsNot(reloaded, first)
+            self.assertEqual(reloaded.dictionary, ["합계", "카드"])
+
+class FuzzyMatchTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        base = os.path.join(os.path.dirname(process_text.__file__))
+        cls.text_proc = process_text.TextPostProcessor(os.path.join(base, "dictionary.txt"))
+        cls.json_proc = process_text.TextPostProcessor(os.path.join(base, "dictionary_store_item.json"))
+        cls.queries = [
+            "합게", "카드", "부가세액", "결제금엑", "승인번흐", "콘치즈솥밥", "삼겹김치", "야채김밤",
+            "동국대학교소비자생활협동조함", "폴바셋", "리김밥", "coopsket", "ICE 카페라데", "가", "영수", "",
+        ]
+
+    @staticmethod
+    def reference_best(proc, target, candidates, threshold):
+        # 후보마다 양쪽을 다시 분해하는 기존 선형 탐색
+        best, best_score = None, 0
+        for candidate in candidates:
+            if abs(len(target) - len(candidate)) > len(target) / 2:
+                continue
+            score = proc.calculate_jamo_similarity(target, candidate)
+            if score > best_score or (score == best_score and len(candidate) > len(best or "")):
+                best, best_score = candidate, score
+        return best, best_score
+
+    def test_decompose_hangul_table(self):
+        def reference(text):
+            result = []
+            for char in text:
+                if '가' <= char <= '힣':
+                    code = ord(char) - ord('가')
+                    result.append(process_text.CHOSUNG_LIST[code // (21 * 28)])
+                    result.append(process_text.JUNGSUNG_LIST[(code % (21 * 28)) // 28])
+                    if code % 28:
+                        result.append(process_text.JONGSUNG_LIST[code % 28])
+                else:
+                    result.append(char)
+            return ''.join(result)
+
+        syllables = ''.join(chr(code) for code in range(ord('가'), ord('힣') + 1))
+        self.assertEqual(self.text_proc.decompose_hangul(syllables), reference(syllables))
+        for text in ["ICE 카페라떼 4,500", "ㄱㅏ 힣", "", "coop"]:
+            self.assertEqual(self.text_proc.decompose_hangul(text), reference(text))
+
+    def test_closest_word_matches_linear_scan(self):
+        for query in self.queries:
+            best, score = self.reference_best(self.text_proc, query, self.text_proc.dictionary, 0.7)
+            expected = best if 0.7 <= score < 1 else None
+            self.assertEqual(self.text_proc.find_closest_word(query), expected, query)
+
+    def test_store_and_item_match_linear_scan(self):
+        stores = self.json_proc.stores_dict
+        for query in self.queries:
+            best, score = self.reference_best(self.json_proc, query, list(stores), 0.4)
+            expected = (best, score) if score >= 0.4 else (None, 0)
+            self.assertEqual(self.json_proc.find_best_store_match(query), expected, query)
+            for store_name, info in stores.items():
+                best, score = self.reference_best(self.json_proc, query, info["items"], 0.4)
+                expected = (best, score) if score >= 0.4 else (None, 0)
+                self.assertEqual(self.json_proc.find_best_item_match(query, store_name), expected, query)
+
+    def test_candidate_index_matches_linear_scan(self):
+        rng = random.Random(0)
+        syllables = [chr(0xAC00 + rng.randrange(11172)) for _ in range(40)] + list("AB 1")
+        words = [''.join(rng.choice(syllables) for _ in range(rng.randint(1, 8))) for _ in range(600)]
+        entries = [jamo_index.DictEntry(word, process_text.decompose_hangul(word), len(word)) for word in words]
+        indexed = jamo_index.JamoIndex(entries, min_entries=0)
+        linear = jamo_index.JamoIndex(entries, min_entries=len(entries) + 1)
+        self.assertTrue(indexed.indexed)
+        self.assertFalse(linear.indexed)
+
+        queries = [''.join(rng.choice(syllables) for _ in range(rng.randint(1, 8))) for _ in range(200)]
+        queries += words[:50] + [""]
+        for threshold in (0.4, 0.7):
+            for query in queries:
+                query_jamo = process_text.decompose_hangul(query)
+                self.assertEqual(
+                    indexed.best_match(query, query_jamo, threshold),
+                    linear.best_match(query, query_jamo, threshold),
+                    query,
+                )
+
+class BatchScorerTest(TestCase):
+    def test_batch_scores_match_per_candidate_similarity(self):
+        rng = random.Random(0)
+        syllables = [chr(0xAC00 + rng.randrange(11172)) for _ in range(40)] + list("AB 1")
+        def random_word():
+            return ''.join(rng.choice(syllables) for _ in range(rng.randint(1, 8)))
+        entries = [jamo_index.DictEntry(w, process_text.decompose_hangul(w), len(w)) for w in (random_word() for _ in range(80))]
+        scorer = jamo_index.BatchScorer(entries)
+
+        queries = [random_word() for _ in range(100)] + [entries[0].word, ""]
+        query_jamos = [process_text.decompose_hangul(query) for query in queries]
+        matrix = scorer.matrix(queries, query_jamos)
+        for row, (query, query_jamo) in enumerate(zip(queries, query_jamos)):
+            expected = [jamo_index.jamo_similarity(len(query), query_jamo, entry) for entry in entries]
+            self.assertEqual(matrix[row].tolist(), expected)
+            self.assertEqual(scorer.scores(query, query_jamo).tolist(), expected)
+
+        for threshold in (0.0, 0.4, 0.7):
+            self.assertEqual(
+                scorer.best_matches(queries, query_jamos, threshold),
+                [jamo_index.linear_best_match(entries, q, j, threshold) for q, j in zip(queries, query_jamos)],
+            )
+
+    def test_receipt_lines_are_corrected_in_one_batch(self):
+        path = os.path.join(os.path.dirname(process_text.__file__), "dictionary.txt")
+        lines = ["합게 : 12,OOO", "", "부가세엑 1 234", "카드 결제금엑 12.000", "  ", "합게"]
+        expected = [process_text.TextPostProcessor(path).process_line(line) for line in lines]
+        expected = process_text.TextPostProcessor(path).merge_number_line(expected)
+
+        processor = process_text.TextPostProcessor(path)
+        with mock.patch.object(processor, "find_closest_words", wraps=processor.find_closest_words) as find:
+            self.assertEqual(processor.process_lines(list(lines)), expected)
+        find.assert_called_once()
+
+class StoreDetectionTest(TestCase):
+    @staticmethod
+    def dense_shortlist(entries, target_jamo, size):
+        # 사전 크기만큼의 배열에 공통 n-gram 수를 세던 이전 구현
+        grams = jamo_index._ngrams(target_jamo)
+        shared = np.array([len(grams & jamo_index._ngrams(entry.jamo)) for entry in entries], dtype=np.float64)
+        counts = np.array([len(jamo_index._ngrams(entry.jamo)) for entry in entries], dtype=np.float64)
+        candidates = np.flatnonzero(shared)
+        if len(candidates) > size:
+            dice = 2 * shared[candidates] / (counts[candidates] + len(grams))
+            candidates = np.sort(candidates[np.argsort(-dice, kind='stable')[:size]])
+        return candidates.tolist()
+
+    def test_ngram_shortlist_finds_store_among_many(self):
+        rng = random.Random(0)
+        syllables = [chr(0xAC00 + rng.randrange(11172)) for _ in range(300)]
+        stores = list(dict.fromkeys(''.join(rng.choice(syllables) for _ in range(rng.randint(3, 10))) for _ in range(2000)))
+        entries = [jamo_index.DictEntry(store, process_text.decompose_hangul(store), len(store)) for store in stores]
+        index = jamo_index.NgramIndex(entries, shortlist_size=10)
+
+        for store in rng.sample(stores, 100):
+            chars = list(store)
+            chars[rng.randrange(len(chars))] = rng.choice(syllables)
+            query = ''.join(chars)
+            query_jamo = process_text.decompose_hangul(query)
+            self.assertLessEqual(len(index.shortlist(query_jamo)), 10)
+            self.assertEqual(index.shortlist(query_jamo), self.dense_shortlist(entries, query_jamo, 10))
+            self.assertEqual(
+                index.best_match(query, query_jamo, 0.4),
+                jamo_index.linear_best_match(entries, query, query_jamo, 0.4),
+            )
+
+        # 후보 수 이하의 사전은 전체를 비교
+        small = jamo_index.NgramIndex(entries[:10], shortlist_size=10)
+        query = stores[3][::-1]
+        self.assertEqual(
+            small.best_match(query, process_text.decompose_hangul(query), 0.0),
+            jamo_index.linear_best_match(entries[:10], query, process_text.decompose_hangul(query), 0.0),
+        )
+
+    def check_incremental_store_updates(self, store_count, compiled=False):
+        rng = random.Random(0)
+        syllables = [chr(0xAC00 + rng.randrange(11172)) for _ in range(40)]
+        def random_word(low, high):
+            return ''.join(rng.choice(syllables) for _ in range(rng.randint(low, high)))
+
+        stores = {random_word(2, 8): {"items": [random_word(1, 6) for _ in range(5)]} for _ in range(store_count)}
+        decoded = []
+        decode = compiled_dictionary.StringTable.__getitem__
+        def counting_decode(table, i):
+            decoded.append(i)
+            return decode(table, i)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "dictionary_store_item.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"stores": stores}, f, ensure_ascii=False)
+            if compiled:
+                compiled_dictionary.compile_dictionary(path)
+                processor = process_text.TextPostProcessor(path, compiled=compiled_dictionary.load_compiled(path))
+            else:
+                processor = process_text.TextPostProcessor(path)
+            base = processor.stores_dict
+            processor.find_best_item_match(random_word(1, 6), rng.choice(list(stores)))
+
+            changes = 0
+            for _ in range(60):
+                store_name = rng.choice(list(stores))
+                action = rng.randrange(4)
+                with mock.patch.object(compiled_dictionary.StringTable, "__getitem__", counting_decode):
+                    if action == 0:
+                        store_name, items = random_word(2, 8), [random_word(1, 6) for _ in range(3)]
+                        processor.add_store(store_name, items)
+                        stores.setdefault(store_name, {"items": []})["items"] += [
+                            item for item in dict.fromkeys(items) if item not in stores[store_name]["items"]
+                        ]
+                    elif action == 1:
+                        processor.remove_store(store_name)
+                        del stores[store_name]
+                    elif action == 2:
+                        item = random_word(1, 6)
+                        processor.add_items(store_name, [item])
+                        if item not in stores[store_name]["items"]:
+                            stores[store_name]["items"].append(item)
+                    elif stores[store_name]["items"]:
+                        item = rng.choice(stores[store_name]["items"])
+                        processor.remove_items(store_name, [item])
+                        stores[store_name]["items"].remove(item)
+                changes += 1
+                # 색인을 미리 만들어 두어 변경 시 해당 가게만 다시 만드는지 확인
+                processor.find_best_item_match(random_word(1, 6), rng.choice(list(stores)))
+
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"stores": stores}, f, ensure_ascii=False)
+            rebuilt = process_text.TextPostProcessor(path)
+
+        # 변경분만 원본 위에 기록하고, 변경마다 바뀐 가게의 메뉴 외에는 원본 사전을 읽지 않음
+        self.assertIs(processor.stores_dict._base, base)
+        self.assertLessEqual(len(decoded), changes * 10)
+        self.assertEqual(dict(processor.stores_dict), rebuilt.stores_dict)
+        self.assertEqual(list(processor.stores_dict), list(rebuilt.stores_dict))
+        for _ in range(200):
+            query = random_word(1, 8)
+            self.assertEqual(processor.find_best_store_match(query), rebuilt.find_best_store_match(query))
+            for store_name in rng.sample(list(stores), 3):
+                self.assertEqual(
+                    processor.find_best_item_match(query, store_name), rebuilt.find_best_item_match(query, store_name)
+                )
+
+    def test_incremental_store_updates_match_rebuilt_dictionary(self):
+        self.check_incremental_store_updates(60)
+
+    def test_incremental_updates_on_compiled_dictionary_keep_base(self):
+        self.check_incremental_store_updates(500, compiled=True)
+
+    def test_store_search_is_limited_to_header_window(self):
+        lines = ["영수증", "2025-06-01 12:30", "동국대학교소비자생활협동조합", "야채김밥 3,500 1 3,500"]
+        self.assertIsNotNone(extract_item2.extract_menu_items_from_lines(lines)["store_name"])
+        self.assertIsNone(extract_item2.extract_menu_items_from_lines(lines, header_lines=2)["store_name"])
+
+    def test_header_window_comes_from_settings(self):
+        calls = []
+
+        def fake_analyze(sources, **kwargs):
+            calls.append((kwargs["header_lines"], kwargs["detect_width"]))
+            return iter([{"store_name": None, "items": [], "lines": []} for _ in sources])
+
+        receipt = Receipt.objects.create(file_name="r.jpg", image_path="receipts/r.jpg")
+        with override_settings(OCR_STORE_HEADER_LINES=3, OCR_DETECT_WIDTH=800, OCR_CACHE_ENABLED=False), \
+                mock.patch("api.analysis.iter_analyze_images", fake_analyze), \
+                mock.patch("api.analysis.pipeline_version", wraps=analyze.pipeline_version) as version:
+            run_receipt_analysis([receipt], sources={receipt.id: b"image"})
+        self.assertEqual(calls, [(3, 800)])
+        version.assert_called_once_with(3, 800)
+        # 탐색 범위가 바뀌면 기존 분석/캐시 결과는 다시 계산 대상
+        self.assertNotEqual(analyze.postprocess_version(3), analyze.postprocess_version(None))
+
+class PrefixMatcherTest(TestCase):
+    @staticmethod
+    def reference_prefix_match(index, words, threshold):
+        # 누적 구문마다 전체 메뉴를 비교하던 기존 방식
+        best_match, best_score, best_end_index = None, 0, -1
+        for k in range(len(words)):
+            phrase = " ".join(words[:k + 1])
+            match, score = index.best_match(phrase, process_text.decompose_hangul(phrase), threshold)
+            if match and score > best_score:
+                best_match, best_score, best_end_index = match, score, k
+        return best_match, best_score, best_end_index
+
+    def test_prefix_matcher_matches_per_prefix_search(self):
+        rng = random.Random(0)
+        syllables = [chr(0xAC00 + rng.randrange(11172)) for _ in range(30)] + list("AB1")
+        def random_word(low, high):
+            return ''.join(rng.choice(syllables) for _ in range(rng.randint(low, high)))
+        # 2글자 이하(Jaro), 일반, 자모 64자 이상(직접 비교) 메뉴를 섞음
+        items = [random_word(1, 2) for _ in range(20)] + [random_word(3, 12) for _ in range(150)]
+        items += [" ".join(random_word(5, 8) for _ in range(4)) for _ in range(5)]
+        entries = [jamo_index.DictEntry(item, process_text.decompose_hangul(item), len(item)) for item in items]
+        index = jamo_index.JamoIndex(entries, min_entries=len(entries) + 1)
+        matcher = jamo_index.PrefixMatcher(index, min_entries=0)
+        self.assertTrue(matcher.bit_parallel)
+
+        for _ in range(300):
+            if rng.random() < 0.5:
+                words = rng.choice(items).split() + [random_word(1, 4) for _ in range(rng.randint(0, 3))]
+            else:
+                words = [random_word(1, 6) for _ in range(rng.randint(1, 6))]
+            for threshold in (0.4, 0.7):
+                self.assertEqual(
+                    matcher.best_prefix_match(words, [process_text.decompose_hangul(w) for w in words], threshold),
+                    self.reference_prefix_match(index, words, threshold),
+                    words,
+                )
+
+    def test_processor_prefix_match(self):
+        processor = process_text.TextPostProcessor(
+            os.path.join(os.path.dirname(process_text.__file__), "dictionary_store_item.json")
+        )
+        for store_name, index in processor.store_item_entries.items():
+            for line in ["콘치즈 솥밥 9,000", "ICE 카페라데 4,500 1", "야채 김밥 3,500", "가 나 다"] + [entry.word for entry in index.entries]:
+                words = line.split()
+                self.assertEqual(
+                    processor.find_best_item_prefix_match(words, store_name),
+                    self.reference_prefix_match(index, words, 0.4),
+                )
+        self.assertEqual(processor.find_best_item_prefix_match(["김밥"], "없는 가게"), (None, 0, -1))
+
+class CompiledDictionaryTest(TestCase):
+    def test_index_arrays_round_trip(self):
+        rng = random.Random(0)
+        syllables = [chr(0xAC00 + rng.randrange(11172)) for _ in range(40)] + list("AB 1")
+        words = [''.join(rng.choice(syllables) for _ in range(rng.randint(1, 8))) for _ in range(300)]
+        entries = [jamo_index.DictEntry(word, process_text.decompose_hangul(word), len(word)) for word in words]
+        index = jamo_index.JamoIndex(entries, min_entries=0)
+        restored = jamo_index.JamoIndex.from_arrays(entries, index.arrays())
+        stores = jamo_index.NgramIndex(entries, shortlist_size=5)
+        restored_stores = jamo_index.NgramIndex.from_arrays(entries, stores.arrays(), shortlist_size=5)
+
+        queries = [''.join(rng.choice(syllables) for _ in range(rng.randint(1, 8))) for _ in range(100)] + [""]
+        for query in queries:
+            jamo = process_text.decompose_hangul(query)
+            for threshold in (0.4, 0.7):
+                self.assertEqual(restored.best_match(query, jamo, threshold), index.best_match(query, jamo, threshold))
+                self.assertEqual(
+                    restored_stores.best_match(query, jamo, threshold), stores.best_match(query, jamo, threshold)
+                )
+
+    def test_build_dictionary_and_memory_mapped_load(self):
+        base = os.path.dirname(process_text.__file__)
+        with tempfile.TemporaryDirectory() as tmp:
+            text_path = shutil.copy(os.path.join(base, "dictionary.txt"), tmp)
+            json_path = shutil.copy(os.path.join(base, "dictionary_store_item.json"), tmp)
+            call_command("build_dictionary", text_path, json_path, stdout=StringIO())
+
+            text_proc = process_text.get_processor(text_path)
+            json_proc = process_text.get_processor(json_path)
+            self.assertIsNotNone(text_proc.compiled)
+            self.assertIsNotNone(json_proc.compiled)
+            self.assertIsInstance(json_proc.compiled.arrays["item_words"].base, np.memmap)
+
+            text_ref = process_text.TextPostProcessor(text_path)
+            json_ref = process_text.TextPostProcessor(json_path)
+            self.assertEqual(list(text_proc.dictionary), text_ref.dictionary)
+            self.assertEqual(dict(json_proc.stores_dict), json_ref.stores_dict)
+            for query in ["합게", "부가세액", "결제금엑", "콘치즈솥밥", "야채김밤", "폴바셋", "ICE 카페라데", "가", ""]:
+                self.assertEqual(text_proc.find_closest_word(query), text_ref.find_closest_word(query))
+                self.assertEqual(json_proc.find_best_store_match(query), json_ref.find_best_store_match(query))
+                for store_name in json_ref.stores_dict:
+                    self.assertEqual(
+                        json_proc.find_best_item_match(query, store_name), json_ref.find_best_item_match(query, store_name)
+                    )
+                    self.assertEqual(
+                        json_proc.find_best_item_prefix_match(query.split(), store_name),
+                        json_ref.find_best_item_prefix_match(query.split(), store_name),
+                    )
+
+            # 원본 사전이 바뀌면 다시 컴파일하기 전까지 원본을 읽음
+            with open(text_path, "a", encoding="utf-8") as f:
+                f.write("\n새단어\n")
+            os.utime(text_path, ns=(0, os.stat(text_path).st_mtime_ns + 1_000_000))
+            with mock.patch("builtins.print"):
+                reloaded = process_text.get_processor(text_path)
+            self.assertIsNone(reloaded.compiled)
+            self.assertIn("새단어", reloaded.dictionary)
+
+    def test_unchanged_source_is_not_hashed_on_load(self):
+        base = os.path.dirname(process_text.__file__)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = shutil.copy(os.path.join(base, "dictionary.txt"), tmp)
+            compiled_dictionary.compile_dictionary(path)
+
+            with mock.patch.object(compiled_dictionary, "file_sha256", wraps=compiled_dictionary.file_sha256) as sha:
+                self.assertIsNotNone(compiled_dictionary.load_compiled(path))
+                self.assertEqual(sha.call_count, 0)
+
+                # 수정 시각만 바뀌고 내용이 같으면 해시로 확인한 뒤 그대로 사용
+                os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+                self.assertIsNotNone(compiled_dictionary.load_compiled(path))
+                self.assertEqual(sha.call_count, 1)
+
+                # 크기가 같아도 내용이 다르면 원본 사용
+                with open(path, "r+b") as f:
+                    first = f.read(1)
+                    f.seek(0)
+                    f.write(b"#" if first != b"#" else b"$")
+                with mock.patch("builtins.print"):
+                    self.assertIsNone(compiled_dictionary.load_compiled(path))
+                self.assertEqual(sha.call_count, 2)
+
+class DictionaryAdminApiTest(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = shutil.copy(
+            os.path.join(os.path.dirname(process_text.__file__), "dictionary_store_item.json"), tmp.name
+        )
+        patcher = mock.patch("api.store_dictionary.STORE_ITEM_DICT_PATH", self.path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.admin = User.objects.create_user("admin", password="password", is_staff=True)
+        self.client.force_login(self.admin)
+        self.stores_url = reverse("api:dictionary-stores")
+
+    def store_url(self, store_name):
+        return reverse("api:dictionary-remove-store", kwargs={"store_name": store_name})
+
+    def items_url(self, store_name):
+        return reverse("api:dictionary-add-items", kwargs={"store_name": store_name})
+
+    def item_url(self, store_name, item_name):
+        return reverse("api:dictionary-remove-item", kwargs={"store_name": store_name, "item_name": item_name})
+
+    def test_requires_admin(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(self.stores_url).status_code, 403)
+        self.client.force_login(User.objects.create_user("member", password="password"))
+        self.assertEqual(self.client.post(self.stores_url, {"store_name": "행복분식"}).status_code, 403)
+
+    def test_changes_update_matching_indexes_in_place(self):
+        processor = process_text.get_processor(self.path)
+        self.assertNotEqual(processor.find_best_store_match("행복분식")[0], "행복분식")
+
+        response = self.client.post(
+            self.stores_url, {"store_name": "행복분식", "items": ["떡볶이", "순대"]}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["data"]["items"], ["떡볶이", "순대"])
+        self.assertEqual(self.client.post(self.stores_url, {"store_name": "행복분식"}).status_code, 400)
+
+        # 사전을 다시 읽지 않고 같은 processor의 색인에 반영
+        self.assertIs(process_text.get_processor(self.path), processor)
+        self.assertEqual(processor.find_best_store_match("행복분식"), ("행복분식", 1.0))
+        self.assertEqual(processor.find_best_item_prefix_match(["떡볶이", "4,000"], "행복분식")[0], "떡볶이")
+
+        response = self.client.post(self.items_url("행복분식"), {"items": ["김말이", "순대"]}, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["data"]["items"], ["떡볶이", "순대", "김말이"])
+        response = self.client.delete(self.item_url("행복분식", "순대"))
+        self.assertEqual(response.json()["data"]["items"], ["떡볶이", "김말이"])
+        self.assertEqual(self.client.delete(self.item_url("행복분식", "순대")).status_code, 404)
+        self.assertEqual(processor.find_best_item_match("순대", "행복분식"), (None, 0))
+
+        self.assertEqual(self.client.delete(self.store_url("행복분식")).status_code, 200)
+        self.assertNotEqual(processor.find_best_store_match("행복분식")[0], "행복분식")
+        self.assertEqual(self.client.delete(self.store_url("행복분식")).status_code, 404)
+
+    def test_names_with_slash_are_passed_as_query_parameters(self):
+        items_url = reverse("api:dictionary-items")
+        self.client.post(self.stores_url, {"store_name": "카페 A/B"}, content_type="application/json")
+        response = self.client.post(items_url, {"store_name": "카페 A/B", "items": ["아메리카노 R/L", "라떼"]},
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["data"]["items"], ["아메리카노 R/L", "라떼"])
+
+        query = urlencode({"store_name": "카페 A/B", "item_name": "아메리카노 R/L"})
+        response = self.client.delete(f"{items_url}?{query}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["items"], ["라떼"])
+        self.assertEqual(self.client.delete(f"{items_url}?{query}").status_code, 404)
+        self.assertEqual(self.client.delete(f"{items_url}?{urlencode({'store_name': '카페 A/B'})}").status_code, 400)
+
+        # 본문으로 이름을 보내도 됨
+        response = self.client.delete(self.stores_url, {"store_name": "카페 A/B"}, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("카페 A/B", process_text.get_processor(self.path).stores_dict)
+        self.assertEqual(self.client.delete(f"{self.stores_url}?{urlencode({'store_name': '카페 A/B'})}").status_code, 404)
+        self.assertEqual(self.client.delete(self.stores_url).status_code, 400)
+
+    def test_other_processes_pick_up_new_revisions(self):
+        self.client.post(self.stores_url, {"store_name": "행복분식", "items": ["떡볶이"]}, content_type="application/json")
+        self.client.delete(self.store_url(next(iter(process_text.get_processor(self.path).stores_dict))))
+        current = process_text.get_processor(self.path)
+
+        # 다른 워커 프로세스: 사전 파일을 읽은 뒤 DB의 변경 기록만 이어서 반영
+        other = process_text.TextPostProcessor(self.path)
+        store_dictionary.sync(other)
+        self.assertEqual(other.revision, current.revision)
+        self.assertEqual(dict(other.stores_dict), dict(current.stores_dict))
+
+        # 새 변경이 없으면 조회 한 번으로 끝남
+        with self.assertNumQueries(1):
+            store_dictionary.sync(other)
+
+    def test_later_revision_visible_first_is_not_skipped(self):
+        processor = process_text.get_processor(self.path)
+        store_dictionary.add_store("행복분식")
+        self.assertEqual(list(DictionaryChange.objects.values_list("revision", flat=True)), [1])
+
+        # 동시에 기록된 두 변경 중 리비전 3이 2보다 먼저 커밋되어 보이는 경우
+        DictionaryChange.objects.create(action="add_store", store_name="나중분식", revision=3)
+        store_dictionary.sync(processor)
+        self.assertEqual(processor.revision, 1)
+        self.assertNotIn("나중분식", processor.stores_dict)
+
+        DictionaryChange.objects.create(action="add_store", store_name="먼저분식", revision=2)
+        store_dictionary.sync(processor)
+        self.assertEqual(processor.revision, 3)
+        self.assertIn("먼저분식", processor.stores_dict)
+        self.assertIn("나중분식", processor.stores_dict)
+
+class NormalizeTextTest(TestCase):
+    @staticmethod
+    def reference_normalize_number(text):
+        # 패턴 컴파일/단일 치환 이전 구현
+        if not text:
+            return text
+        text = re.sub(r'(\d*)O(\d*)', r'\g<1>0\g<2>', text)
+        text = re.sub(r'(\d+)O\b', r'\g<1>0', text)
+        text = re.sub(r'\bO(\d+)', r'0\g<1>', text)
+        text = re.sub(r'(\d*[,\.])O(\d*)', r'\g<1>0\g<2>', text)
+        text = re.sub(r'(\d*)U(\d*)', r'\g<1>0\g<2>', text)
+        text = re.sub(r'(\d*)E(\d*)', r'\g<1>0\g<2>', text)
+        text = re.sub(r'(\d+)E\b', r'\g<1>0', text)
+        text = re.sub(r'\bE(\d+)', r'0\g<1>', text)
+        text = re.sub(r'(\d*[,\.])E(\d*)', r'\g<1>0\g<2>', text)
+        text = re.sub(r'(\d*)\((\d*)', r'\1\2', text)
+        text = re.sub(r'(\d*)\)(\d*)', r'\1\2', text)
+        text = re.sub(r'(\d+)\s*,\s*(\d+)', r'\1,\2', text)
+        text = re.sub(r'(\d+)\s*\.\s*(\d+)', r'\1.\2', text)
+        text = re.sub(r'(\d{1,3})\.(\d{3})(?!\d)', r'\1,\2', text)
+        def handle_number_spacing(match):
+            num1 = match.group(1)
+            num2 = match.group(2)
+            if len(num1) < 3 and len(num2) == 3:
+                return f"{num1},{num2}"
+            elif len(num1) == 3 and len(num2) == 3:
+                if num2 == "000":
+                    return f"{num1},{num2}"
+                else:
+                    return f"{num1} {num2}"
+            else:
+                return f"{num1},{num2}"
+        return re.sub(r'(\d{1,3})\s+(\d{3})(?!\d)', handle_number_spacing, text)
+
+    @staticmethod
+    def reference_clean_text(processor, text):
+        if not text:
+            return text
+        text = re.sub(r'\s+', ' ', text).strip()
+        text = re.sub(r'(\d+)l(\d+)', r'\g<1>1\g<2>', text)
+        text = re.sub(r'(\d+)I(\d+)', r'\g<1>1\g<2>', text)
+        text = re.sub(r';', ':', text)
+        text = re.sub(r'([^\s]):([^\s])', r'\1 : \2', text)
+        text = re.sub(r'([^\s]):', r'\1 :', text)
+        text = re.sub(r':([^\s])', r': \1', text)
+        words = text.split()
+        for i, word in enumerate(words):
+            if not re.search(r'\d', word) and re.search(r'[가-힣]', word) and len(word) > 1:
+                closest_word = processor.find_closest_word(word)
+                if closest_word:
+                    words[i] = closest_word
+        return ' '.join(words)
+
+    def golden_corpus(self):
+        corpus = [
+            "", " ", "합계 : 12,000", "카드결제;3O,OOO원", "김밥 (2) 3.500 7 000", "1l2I3 l I",
+            "부가세액 1 234 567", "ICE 카페라떼 4,5OO 1 4,5OO", "승인번호:1234 5678", "COOP SKET 10 . 000",
+            "총 구매액\t12 , 300\n", "1.234.567", "123 456 000", "12 345", "TEL: 02-2260-3114", "::a::b::",
+            "\u3000전체\u00a0합계\x1c100", "USB (OE) 1O", "E1 1E O1 1O", "1,2 , 3 , 4",
+        ]
+        rng = random.Random(0)
+        alphabet = list("0123456789OUEIl,.:;() \t") + ["합계", "카드", "김밥", "원", "A", "\u3000"]
+        for _ in range(3000):
+            corpus.append(''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 30))))
+        return corpus
+
+    def test_normalizer_is_byte_identical_to_reference(self):
+        processor = process_text.TextPostProcessor(
+            os.path.join(os.path.dirname(process_text.__file__), "dictionary.txt")
+        )
+        for line in self.golden_corpus():
+            self.assertEqual(processor.normalize_number(line), self.reference_normalize_number(line), repr(line))
+            cleaned = self.reference_clean_text(processor, line)
+            self.assertEqual(processor.clean_text(line), cleaned, repr(line))
+            if line.strip():
+                self.assertEqual(processor.process_line(line), self.reference_normalize_number(cleaned), repr(line))
+
+    def test_word_correction_is_memoized_per_dictionary_version(self):
+        processor = process_text.TextPostProcessor(
+            os.path.join(os.path.dirname(process_text.__file__), "dictionary.txt"), correction_cache_size=2
+        )
+        with mock.patch.object(processor, "find_closest_words", wraps=processor.find_closest_words) as find:
+            first = processor.clean_text("합게 영수증 합게")
+            self.assertEqual(processor.clean_text("합게 영수증"), first.rsplit(" ", 1)[0])
+            # 보정 결과가 없는 단어(영수증)도 캐시되고, 한 줄에서 반복된 단어는 한 번만 비교
+            find.assert_called_once_with(["합게", "영수증"])
+            self.assertEqual(processor.correction_cache_stats()["hits"], 3)
+            self.assertEqual(processor.correction_cache_stats()["size"], 2)
+
+            # 사전이 다시 만들어지면 이전 결과를 쓰지 않음
+            processor._build_entries()
+            processor.clean_text("합게")
+            self.assertEqual(find.call_count, 2)
+
+        stats = processor.correction_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["max_size"]), (3, 3, 2))
+        self.assertAlmostEqual(stats["hit_rate"], 0.5)
+
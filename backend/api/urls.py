@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
-from .views import export_settlement_excel
+from .views import export_settlement_excel, export_settlement_csv, export_settlement_ndjson
 
 app_name = 'api'
 
@@ -10,8 +10,11 @@ router.register('receipt', views.ReceiptViewSet, 'receipt')
 router.register('participant', views.ParticipantViewSet, 'participant')
 router.register('receiptinfo', views.ReceiptInfoViewSet, 'receiptinfo')
 router.register('settlement', views.SettlementViewSet, 'settlement')
+router.register('dictionary', views.DictionaryViewSet, 'dictionary')
 
 urlpatterns = [
     path('', include(router.urls)),  # 영수증 업로드 API
     path('settlement/export_excel/<int:settlement_id>/', export_settlement_excel, name='export_settlement_excel'),#엑셀 추출
+    path('settlement/export_csv/<int:settlement_id>/', export_settlement_csv, name='export_settlement_csv'),#CSV 추출
+    path('settlement/export_ndjson/<int:settlement_id>/', export_settlement_ndjson, name='export_settlement_ndjson'),#NDJSON 추출
 ]
\ No newline at end of file
@@ -3,22 +3,61 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework import viewsets
+from rest_framework.permissions import IsAdminUser
 from drf_yasg.utils import swagger_auto_schema
 from django.conf import settings
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
-from .models import Receipt, Participant, ReceiptInfo, Settlement 
-from django.http import HttpResponse
-from openpyxl import Workbook
-from .serializers import ReceiptSerializer, ParticipantSerializer, ReceiptInfoSerializer, SettlementSerializer
-from api.ocr_pipeline.preprocessing import preprocess_image_to_memory
-from api.ocr_pipeline.image_to_text import ocr_image_from_memory
-from api.ocr_pipeline.process_text import TextPostProcessor
-from api.ocr_pipeline.extract_item2 import extract_menu_items_from_lines
+from .models import Receipt, Participant, ReceiptInfo, Settlement, AnalyzeJob
+from django.http import StreamingHttpResponse
+from .serializers import (
+    ReceiptSerializer, ParticipantSerializer, ReceiptInfoSerializer, SettlementSerializer, AnalyzeJobSerializer,
+    DictionaryStoreSerializer, DictionaryItemsSerializer,
+)
+from .analysis import run_receipt_analysis
+from .settlement import (
+    SettlementError, calculate_settlement, save_settlement,
+    write_settlement_excel, iter_settlement_csv, iter_settlement_ndjson,
+)
+from . import store_dictionary
 import os
 import uuid
 import shutil
 import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+# 업로드 즉시 분석 시 원본 이미지를 백그라운드에서 저장하는 스레드 풀
+_upload_writer = ThreadPoolExecutor(max_workers=2, thread_name_prefix='receipt-upload')
+
+def _write_upload(full_path, data):
+    """
+    이미지 바이트를 임시 파일에 모두 쓴 뒤 이름을 바꿔 저장합니다.
+    다른 요청(분석 API 등)은 쓰는 중인 파일을 보지 못하고, 파일이 있으면 항상 완전한 이미지입니다.
+    """
+    partial_path = f"{full_path}.part"
+    try:
+        with open(partial_path, 'wb') as destination:
+            destination.write(data)
+        os.replace(partial_path, full_path)
+    except Exception:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+def _wait_for_uploads(pending_writes):
+    """
+    백그라운드 저장이 끝날 때까지 기다린 뒤, 저장에 실패한 영수증 리스트를 반환합니다.
+    pending_writes: [(영수증, 저장 Future), ...]
+    """
+    failed = []
+    for receipt, future in pending_writes:
+        try:
+            future.result()
+        except Exception as e:
+            print(f"❌ 영수증 이미지 저장 실패 ({receipt.image_path}): {e}")
+            failed.append(receipt)
+    return failed
 
 class ReceiptViewSet(viewsets.ViewSet):
     """
@@ -40,6 +79,7 @@ class ReceiptViewSet(viewsets.ViewSet):
 
         ### Request Body
         - `image`: 영수증 이미지 파일 (필수, JPEG/PNG)
+        - `analyze`: `true`이면 업로드된 이미지를 파일로 다시 읽지 않고 메모리에서 바로 OCR 분석 (선택, 기본값 false)
 
         ### Responses
         - 201: 성공적으로 업로드됨
@@ -47,7 +87,8 @@ class ReceiptViewSet(viewsets.ViewSet):
             {
                 "success": true,
                 "message": "영수증이 성공적으로 업로드되었습니다.",
-                "data": { ... }
+                "data": { ... },
+                "results": [ ... ]  // analyze=true일 때만 포함, 추출된 품목 리스트
             }
             ```
         - 400: 잘못된 요청 (이미지 없음 또는 형식 오류)
@@ -76,6 +117,12 @@ class ReceiptViewSet(viewsets.ViewSet):
                 return Response({'error': '이미지 파일이 필요합니다.'}, status=status.HTTP_400_BAD_REQUEST)
 
             uploaded_receipts_data = [] # 업로드된 영수증 정보들을 담을 리스트
+            analyze_on_upload = str(
+                request.data.get('analyze', request.query_params.get('analyze', ''))
+            ).lower() in ('1', 'true')
+            uploaded_receipts = []
+            image_sources = {} # 업로드 즉시 분석할 영수증 ID → 이미지 바이트
+            pending_writes = [] # (영수증, 원본 이미지 백그라운드 저장 Future)
 
             for image in images: # 각 이미지 파일을 반복 처리
                 # media 디렉터리 확인 및 생성
@@ -92,9 +139,14 @@ class ReceiptViewSet(viewsets.ViewSet):
                 full_path = os.path.join(settings.MEDIA_ROOT, file_path)
                 
                 # 파일 저장
-                with open(full_path, 'wb+') as destination:
-                    for chunk in image.chunks():
-                        destination.write(chunk)
+                if analyze_on_upload:
+                    # 분석은 메모리의 바이트로 바로 진행하고, 원본 저장은 백그라운드에서 처리
+                    image_bytes = image.read()
+                    write = _upload_writer.submit(_write_upload, full_path, image_bytes)
+                else:
+                    with open(full_path, 'wb+') as destination:
+                        for chunk in image.chunks():
+                            destination.write(chunk)
                 
                 # serializer를 사용해 저장
                 data = {
@@ -105,12 +157,33 @@ class ReceiptViewSet(viewsets.ViewSet):
                 serializer.is_valid(raise_exception=True)
                 receipt = serializer.save()
                 uploaded_receipts_data.append(serializer.data)
-            
-            return Response({
+                if analyze_on_upload:
+                    uploaded_receipts.append(receipt)
+                    image_sources[receipt.id] = image_bytes
+                    pending_writes.append((receipt, write))
+
+            response_data = {
                 'success': True,
                 'message': f'{len(uploaded_receipts_data)}개의 영수증이 성공적으로 업로드되었습니다.',
                 'data': uploaded_receipts_data # 여러 영수증 정보를 리스트로 반환
-            }, status=status.HTTP_201_CREATED)
+            }
+            if analyze_on_upload:
+                try:
+                    results = run_receipt_analysis(uploaded_receipts, sources=image_sources)
+                finally:
+                    # 분석과 겹쳐 진행한 원본 저장이 끝난 뒤에 응답 (응답을 받은 뒤의 요청은 항상 저장된 파일을 읽음)
+                    failed = _wait_for_uploads(pending_writes)
+                if failed:
+                    # 원본 이미지가 없는 영수증은 다시 분석/조회할 수 없으므로 분석 결과와 함께 삭제
+                    Receipt.objects.filter(id__in=[receipt.id for receipt in failed]).delete()
+                    return Response({
+                        'success': False,
+                        'error': f'영수증 이미지 {len(failed)}개를 저장하지 못했습니다: '
+                                 f'{", ".join(receipt.file_name for receipt in failed)}'
+                    }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                response_data['results'] = results
+
+            return Response(response_data, status=status.HTTP_201_CREATED)
         
         except Exception as e:
             return Response({
@@ -150,6 +223,9 @@ class ReceiptViewSet(viewsets.ViewSet):
             ReceiptInfo.objects.all().delete()
             print("✅ 모든 ReceiptInfo 데이터 삭제 완료.")
 
+            # 1-1. 모든 분석 작업 데이터 삭제
+            AnalyzeJob.objects.all().delete()
+
             # 2. 모든 Settlement 데이터 삭제
             Settlement.objects.all().delete()
             print("✅ 모든 Settlement 데이터 삭제 완료.")
@@ -240,7 +316,9 @@ class ParticipantViewSet(viewsets.ViewSet):
         """
         try:
             serializer = ParticipantSerializer(data=request.data)
-            serializer.is_valid(raise_exception=True)
+            if not serializer.is_valid():
+                # 이름 누락, 형식 오류 등
+                return Response({'success': False, 'error': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
             participant = serializer.save()
             
             return Response({
@@ -337,10 +415,14 @@ class ReceiptInfoViewSet(viewsets.ViewSet):
         ---
         업로드된 Receipt 객체의 이미지 각각에 대해 OCR 파이프라인을 실행하고,
         추출된 품목 정보를 ReceiptInfo로 저장 및 직렬화해 반환합니다.
+        이미 분석된 영수증은 다시 분석하지 않고 저장된 품목을 함께 반환합니다.
 
         ### Request Body
         - (body 없음) GET 요청이므로 별도의 body를 받지 않습니다.
 
+        ### Query Parameters
+        - `force`: `true`이면 모든 영수증을 처음부터 다시 분석 (선택, 기본값 false)
+
         ### Responses
         - 200: 성공, 추출된 품목 리스트 반환
             ```json
@@ -375,53 +457,14 @@ class ReceiptInfoViewSet(viewsets.ViewSet):
             ```
         """
         try:
-            #누적된 이전 분석 결과 모두 삭제
-            ReceiptInfo.objects.all().delete()
-
             # Receipt 테이블에서 모든 영수증 객체 불러오기
             receipts = Receipt.objects.all()
             if not receipts.exists():
                 return Response({'success': False, 'error': '분석할 영수증이 없습니다.'}, status=400)
 
-            processor = TextPostProcessor(dict_path=os.path.join(settings.BASE_DIR, 'api', 'ocr_pipeline', 'dictionary.txt'))
-            serialized_items = []
-
-            for receipt in receipts:
-                image_path = os.path.join(settings.MEDIA_ROOT, receipt.image_path)
-                if not os.path.exists(image_path):
-                    continue  # 이미지 파일이 없으면 건너뜀
-                
-                print(f"🔎 [{receipt.id}] 이미지 처리 시작: {image_path}")
-
-                # 1. 전처리
-                bin_imgs = preprocess_image_to_memory(image_path)
-
-                # 2. OCR
-                ocr_results = ocr_image_from_memory(bin_imgs)
-
-                # 3. 후처리
-                processed_lines = processor.process_lines(ocr_results)
-                
-                # 4. 품목 추출
-                result = extract_menu_items_from_lines(processed_lines)
-
-                # 5. 가게명/음식명 각각 find_closest_word 적용
-                store_name = result.get("store_name", "")
-                items = result.get("items") or []  # None이면 빈 리스트로 대체
-
-                for item in items:
-                    data = {
-                        "receipt": receipt.id,
-                        "store_name": store_name,
-                        "item_name": item["item_name"].strip(), # 품목 이름 양쪽 공백 제거
-                        "quantity": item["quantity"],
-                        "unit_price": item["unit_price"],
-                        "total_amount": item["total_amount"],
-                    }
-                    serializer = ReceiptInfoSerializer(data=data)
-                    serializer.is_valid(raise_exception=True)
-                    instance = serializer.save()
-                    serialized_items.append(ReceiptInfoSerializer(instance).data)
+            # 업로드 순서대로 분석 후 ReceiptInfo로 저장 (새로 올라왔거나 실패한 영수증만 분석)
+            force = request.query_params.get('force', '').lower() in ('1', 'true')
+            serialized_items = run_receipt_analysis(receipts.order_by('upload_time', 'id'), force=force)
 
             return Response({
                 'success': True,
@@ -434,7 +477,127 @@ class ReceiptInfoViewSet(viewsets.ViewSet):
                 'success': False,
                 'error': f'분석 중 오류가 발생했습니다: {str(e)}'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        
+
+    @method_decorator(csrf_exempt, name='dispatch')
+    @action(detail=False, methods=['post'], url_path='analyze_jobs')
+    def create_analyze_job(self, request):
+        """
+        영수증 비동기 분석 작업 생성 API
+
+        ---
+        업로드된 모든 영수증에 대한 OCR 분석 작업을 큐에 등록하고 작업 ID를 즉시 반환합니다.
+        실제 분석은 `python manage.py run_analyze_jobs` 워커가 수행합니다.
+
+        ### Request Body
+        - `force`: `true`이면 이미 분석된 영수증도 다시 분석 (선택, 기본값 false)
+
+        ### Responses
+        - 202: 작업 등록 성공
+            ```json
+            {
+                "success": true,
+                "message": "영수증 분석 작업이 등록되었습니다.",
+                "data": {
+                    "id": 1,
+                    "status": "pending",
+                    "receipt_ids": [1, 2],
+                    "progress": [
+                        {"receipt": 1, "status": "pending", "item_count": 0},
+                        {"receipt": 2, "status": "pending", "item_count": 0}
+                    ],
+                    ...
+                }
+            }
+            ```
+        - 400: 분석할 영수증 없음
+            ```json
+            {
+                "success": false,
+                "error": "분석할 영수증이 없습니다."
+            }
+            ```
+        - 500: 서버 오류
+            ```json
+            {
+                "success": false,
+                "error": "분석 작업 등록 중 오류가 발생했습니다: ...에러메시지..."
+            }
+            ```
+        """
+        try:
+            receipt_ids = list(
+                Receipt.objects.order_by('upload_time', 'id').values_list('id', flat=True)
+            )
+            if not receipt_ids:
+                return Response({'success': False, 'error': '분석할 영수증이 없습니다.'}, status=400)
+
+            force = str(request.data.get('force', '')).lower() in ('1', 'true')
+            job = AnalyzeJob.objects.create(
+                receipt_ids=receipt_ids,
+                force=force,
+                progress=[
+                    {'receipt': receipt_id, 'status': 'pending', 'item_count': 0}
+                    for receipt_id in receipt_ids
+                ],
+            )
+
+            return Response({
+                'success': True,
+                'message': '영수증 분석 작업이 등록되었습니다.',
+                'data': AnalyzeJobSerializer(job).data
+            }, status=status.HTTP_202_ACCEPTED)
+
+        except Exception as e:
+            return Response({
+                'success': False,
+                'error': f'분석 작업 등록 중 오류가 발생했습니다: {str(e)}'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @method_decorator(csrf_exempt, name='dispatch')
+    @action(detail=False, methods=['get'], url_path=r'analyze_jobs/(?P<job_id>\d+)')
+    def get_analyze_job(self, request, job_id=None):
+        """
+        영수증 분석 작업 상태 조회 API
+
+        ---
+        분석 작업의 상태(`pending`, `running`, `done`, `failed`)와 영수증별 진행 상황을 조회합니다.
+        작업이 완료되면 `results`에 추출된 품목 리스트가 포함됩니다.
+
+        ### Responses
+        - 200: 조회 성공
+            ```json
+            {
+                "success": true,
+                "data": {
+                    "id": 1,
+                    "status": "running",
+                    "progress": [
+                        {"receipt": 1, "status": "done", "item_count": 3},
+                        {"receipt": 2, "status": "pending", "item_count": 0}
+                    ],
+                    "results": null,
+                    ...
+                }
+            }
+            ```
+        - 404: 작업 없음
+            ```json
+            {
+                "success": false,
+                "error": "분석 작업을 찾을 수 없습니다."
+            }
+            ```
+        """
+        try:
+            job = AnalyzeJob.objects.get(id=job_id)
+        except AnalyzeJob.DoesNotExist:
+            return Response({'success': False, 'error': '분석 작업을 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({
+            'success': True,
+            'data': AnalyzeJobSerializer(job).data
+        }, status=status.HTTP_200_OK)
+
 class SettlementViewSet(viewsets.ViewSet):
     """
     정산 API ViewSet
@@ -508,76 +671,15 @@ class SettlementViewSet(viewsets.ViewSet):
             if not receipts or not method:
                 return Response({'error': 'method와 receipts는 필수입니다.'}, status=400)
 
-            overall_result = {}
-            used_receipts = []
-            all_item_assignments = []
-
-            for receipt_info in receipts:
-                receipt_id = receipt_info.get("receipt_id")
-                if not receipt_id:
-                    continue
-
-                try:
-                    receipt = Receipt.objects.get(id=receipt_id)
-                except Receipt.DoesNotExist:
-                    continue
-
-                items = receipt.items.all()
-                result = {}
-
-                if method == "equal":
-                    if not participant_names:
-                        return Response({'error': '1/N 정산은 participants 필수입니다.'}, status=400)
-
-                    total = sum(item.total_amount for item in items)
-                    share = total // len(participant_names)
-                    for name in participant_names:
-                        result[name] = share
-
-                elif method == "item":
-                    item_assignments = receipt_info.get("items", [])
-                    if not item_assignments:
-                        return Response(
-                            {'error': f'항목별 정산은 items 필수 (receipt_id: {receipt_id})'},
-                            status=400
-                        )
-
-                    # 개별 품목 할당
-                    for assignment in item_assignments:
-                        item_name = assignment.get("item_name").strip()
-                        names = assignment.get("participants", [])
-                        matched_items = items.filter(item_name=item_name)
-                        if not matched_items.exists():
-                            continue
-
-                        for item in matched_items:
-                            share = item.total_amount // max(len(names), 1)
-                            for name in names:
-                                result[name] = result.get(name, 0) + share
-
-                    # 할당 데이터 수집
-                    all_item_assignments.append({
-                        "receipt_id": receipt_id,
-                        "items": item_assignments
-                    })
-
-                else:
-                    return Response({'error': 'method는 "equal" 또는 "item"이어야 합니다.'}, status=400)
-
-                # 전체 합산
-                for name, amount in result.items():
-                    overall_result[name] = overall_result.get(name, 0) + amount
-
-                used_receipts.append(receipt_id)
+            try:
+                overall_result, used_receipts, all_item_assignments = calculate_settlement(
+                    method, receipts, participant_names
+                )
+            except SettlementError as e:
+                return Response({'error': str(e)}, status=400)
 
-            # Settlement 객체는 루프 후 한 번만 생성
-            settlement = Settlement.objects.create(
-                result=overall_result,
-                method=method,
-                item_assignments_data=json.dumps(all_item_assignments, ensure_ascii=False)
-            )
-            settlement.receipts.set(Receipt.objects.filter(id__in=used_receipts))
-            settlement.participants.set(Participant.objects.filter(name__in=overall_result.keys()))
+            # Settlement 객체는 계산 후 한 번만 생성
+            settlement = save_settlement(method, overall_result, used_receipts, all_item_assignments)
 
             return Response({
                 "success": True,
@@ -589,81 +691,282 @@ class SettlementViewSet(viewsets.ViewSet):
         except Exception as e:
             return Response({'success': False, 'error': str(e)}, status=500)
 
+class DictionaryViewSet(viewsets.ViewSet):
+    """
+    가게/메뉴 사전 관리 API ViewSet
+
+    품목 추출에 사용하는 가게/메뉴 사전을 서버 재시작 없이 추가/삭제합니다. (관리자 전용)
+    변경은 DB에 기록되고 매칭 색인에 바로 반영되며, 다른 프로세스는 다음 분석 요청 시 새 변경만 읽어 반영합니다.
+    """
+    permission_classes = [IsAdminUser]
+
+    @staticmethod
+    def _store_data(processor, store_name):
+        return {
+            'store_name': store_name,
+            'items': list(processor.stores_dict[store_name].get('items', [])),
+            'revision': processor.revision,
+        }
+
+    @staticmethod
+    def _name_param(request, field):
+        # '/'가 들어간 이름(예: "아메리카노 R/L")은 경로에 넣을 수 없으므로 쿼리 파라미터 또는 본문으로 받음
+        name = request.query_params.get(field) or request.data.get(field)
+        return name if isinstance(name, str) and name else None
+
+    @action(detail=False, methods=['get', 'post', 'delete'], url_path='stores')
+    def stores(self, request):
+        """
+        가게 목록 조회 / 가게 추가 / 가게 삭제 API
+
+        ---
+        GET: 사전에 등록된 가게와 메뉴 목록을 조회합니다.
+        POST: 가게(와 메뉴)를 사전에 추가합니다.
+        DELETE: `store_name` 쿼리 파라미터(또는 본문)의 가게와 가게의 메뉴를 사전에서 삭제합니다.
+        이름에 '/'가 들어간 가게도 삭제할 수 있습니다. (예: `DELETE /api/dictionary/stores/?store_name=A/B`)
+
+        ### Request Body (POST)
+        - `store_name`: 가게명 (필수, 문자열)
+        - `items`: 메뉴 이름 리스트 (선택)
+
+        ### Request Example
+        ```json
+        {
+            "store_name": "동국대학교 소비자생활협동조합",
+            "items": ["야채김밥", "참치김밥"]
+        }
+        ```
+
+        ### Responses
+        - 200: 조회 성공
+            ```json
+            {
+                "success": true,
+                "data": {
+                    "revision": 3,
+                    "stores": [{"store_name": "예시가게", "items": ["김밥"]}]
+                }
+            }
+            ```
+        - 201: 가게 추가 성공
+            ```json
+            {
+                "success": true,
+                "message": "가게가 사전에 추가되었습니다.",
+                "data": {"store_name": "예시가게", "items": ["김밥"], "revision": 4}
+            }
+            ```
+        - 200: 삭제 성공 (DELETE, `data.revision`: 삭제가 반영된 사전 리비전)
+        - 400: 잘못된 요청, 이미 등록된 가게 또는 store_name 누락(DELETE)
+        - 403: 관리자 인증 필요
+        - 404: 사전에 없는 가게 (DELETE)
+        """
+        if request.method == 'DELETE':
+            store_name = self._name_param(request, 'store_name')
+            if store_name is None:
+                return Response({'success': False, 'error': 'store_name은 필수입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+            return self._remove_store(store_name)
+
+        processor = store_dictionary.sync()
+        if request.method == 'GET':
+            return Response({
+                'success': True,
+                'data': {
+                    'revision': processor.revision,
+                    'stores': [
+                        {'store_name': store_name, 'items': list(info.get('items', []))}
+                        for store_name, info in processor.stores_dict.items()
+                    ],
+                }
+            }, status=status.HTTP_200_OK)
+
+        serializer = DictionaryStoreSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({'success': False, 'error': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        store_name = serializer.validated_data['store_name']
+        if store_name in processor.stores_dict:
+            return Response({'success': False, 'error': '이미 등록된 가게입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        processor = store_dictionary.add_store(store_name, serializer.validated_data['items'])
+        return Response({
+            'success': True,
+            'message': '가게가 사전에 추가되었습니다.',
+            'data': self._store_data(processor, store_name)
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['delete'], url_path=r'stores/(?P<store_name>[^/]+)')
+    def remove_store(self, request, store_name=None):
+        """
+        가게 삭제 API
+
+        ---
+        가게와 가게의 메뉴를 사전에서 삭제합니다.
+        이름에 '/'가 들어간 가게는 `DELETE /api/dictionary/stores/?store_name=...`을 사용하세요.
+
+        ### Responses
+        - 200: 삭제 성공 (`data.revision`: 삭제가 반영된 사전 리비전)
+        - 403: 관리자 인증 필요
+        - 404: 사전에 없는 가게
+        """
+        return self._remove_store(store_name)
+
+    def _remove_store(self, store_name):
+        if store_name not in store_dictionary.sync().stores_dict:
+            return Response({'success': False, 'error': '사전에 없는 가게입니다.'}, status=status.HTTP_404_NOT_FOUND)
+
+        processor = store_dictionary.remove_store(store_name)
+        return Response({
+            'success': True,
+            'message': '가게가 사전에서 삭제되었습니다.',
+            'data': {'store_name': store_name, 'revision': processor.revision}
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path=r'stores/(?P<store_name>[^/]+)/items')
+    def add_items(self, request, store_name=None):
+        """
+        메뉴 추가 API
+
+        ---
+        사전에 등록된 가게에 메뉴를 추가합니다. 이미 있는 메뉴는 건너뜁니다.
+        이름에 '/'가 들어간 가게는 `POST /api/dictionary/items/`를 사용하세요.
+
+        ### Request Body
+        - `items`: 메뉴 이름 리스트 (필수)
+
+        ### Responses
+        - 201: 추가 성공 (`data`: 가게의 전체 메뉴와 사전 리비전)
+        - 400: 잘못된 요청 또는 모두 이미 등록된 메뉴
+        - 403: 관리자 인증 필요
+        - 404: 사전에 없는 가게
+        """
+        return self._add_items(request, store_name)
+
+    def _add_items(self, request, store_name):
+        processor = store_dictionary.sync()
+        if store_name not in processor.stores_dict:
+            return Response({'success': False, 'error': '사전에 없는 가게입니다.'}, status=status.HTTP_404_NOT_FOUND)
+        serializer = DictionaryItemsSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({'success': False, 'error': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        current = set(processor.stores_dict[store_name].get('items', []))
+        items = [item for item in dict.fromkeys(serializer.validated_data['items']) if item not in current]
+        if not items:
+            return Response({'success': False, 'error': '이미 등록된 메뉴입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        processor = store_dictionary.add_items(store_name, items)
+        return Response({
+            'success': True,
+            'message': f'메뉴 {len(items)}개가 사전에 추가되었습니다.',
+            'data': self._store_data(processor, store_name)
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['delete'], url_path=r'stores/(?P<store_name>[^/]+)/items/(?P<item_name>[^/]+)')
+    def remove_item(self, request, store_name=None, item_name=None):
+        """
+        메뉴 삭제 API
+
+        ---
+        가게의 메뉴를 사전에서 삭제합니다.
+        이름에 '/'가 들어간 가게나 메뉴는 `DELETE /api/dictionary/items/?store_name=...&item_name=...`을 사용하세요.
+
+        ### Responses
+        - 200: 삭제 성공 (`data`: 가게의 남은 메뉴와 사전 리비전)
+        - 403: 관리자 인증 필요
+        - 404: 사전에 없는 가게 또는 메뉴
+        """
+        return self._remove_item(store_name, item_name)
+
+    def _remove_item(self, store_name, item_name):
+        processor = store_dictionary.sync()
+        if item_name not in processor.stores_dict.get(store_name, {}).get('items', []):
+            return Response({'success': False, 'error': '사전에 없는 메뉴입니다.'}, status=status.HTTP_404_NOT_FOUND)
+
+        processor = store_dictionary.remove_item(store_name, item_name)
+        return Response({
+            'success': True,
+            'message': '메뉴가 사전에서 삭제되었습니다.',
+            'data': self._store_data(processor, store_name)
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post', 'delete'], url_path='items')
+    def items(self, request):
+        """
+        메뉴 추가 / 메뉴 삭제 API (이름을 경로 대신 쿼리 파라미터 또는 본문으로 전달)
+
+        ---
+        이름에 '/'가 들어간 가게나 메뉴(예: "아메리카노 R/L")도 추가/삭제할 수 있습니다.
+        POST: `store_name` 가게에 메뉴를 추가합니다. 이미 있는 메뉴는 건너뜁니다.
+        DELETE: `store_name` 가게의 `item_name` 메뉴를 삭제합니다.
+
+        ### Request Example
+        ```
+        POST /api/dictionary/items/  {"store_name": "예시가게", "items": ["아메리카노 R/L"]}
+        DELETE /api/dictionary/items/?store_name=예시가게&item_name=아메리카노%20R%2FL
+        ```
+
+        ### Responses
+        - 200: 삭제 성공 (`data`: 가게의 남은 메뉴와 사전 리비전)
+        - 201: 추가 성공 (`data`: 가게의 전체 메뉴와 사전 리비전)
+        - 400: 잘못된 요청, 이름 누락 또는 모두 이미 등록된 메뉴
+        - 403: 관리자 인증 필요
+        - 404: 사전에 없는 가게 또는 메뉴
+        """
+        store_name = self._name_param(request, 'store_name')
+        if store_name is None:
+            return Response({'success': False, 'error': 'store_name은 필수입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        if request.method == 'POST':
+            return self._add_items(request, store_name)
+
+        item_name = self._name_param(request, 'item_name')
+        if item_name is None:
+            return Response({'success': False, 'error': 'item_name은 필수입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        return self._remove_item(store_name, item_name)
+
+def _iter_file(file, chunk_size=64 * 1024):
+    # 응답을 다 보내면 임시 파일을 닫아 삭제
+    try:
+        while chunk := file.read(chunk_size):
+            yield chunk
+    finally:
+        file.close()
+
 def export_settlement_excel(request, settlement_id):
     settlement = Settlement.objects.get(id=settlement_id)
-    receipts = settlement.receipts.all()
 
-     # ✅ 로그 출력 (엑셀에 들어갈 데이터 확인용)
+    # ✅ 로그 출력 (품목별 출력은 대용량 정산에서 느려지므로 요약만)
     print("✅ 정산 방식:", settlement.method)
     print("✅ 정산 결과:", settlement.result)
-    print("✅ 포함된 영수증 ID 목록:", [r.id for r in receipts])
-    for receipt in receipts:
-        print(f"📄 영수증 ID {receipt.id} - 업로드일: {receipt.upload_time}")
-        for info in receipt.items.all():
-            print(f"  - 품목: {info.item_name}, 수량: {info.quantity}, 금액: {info.total_amount}")
-
 
-    # JSON 문자열을 파이썬 객체로 변환
-    item_assignments_list = []
-    if settlement.item_assignments_data:
-        try:
-            item_assignments_list = json.loads(settlement.item_assignments_data)
-        except json.JSONDecodeError:
-            item_assignments_list = []
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "정산 결과"
-
-    for idx, receipt in enumerate(receipts, start=1):
-        receipt_infos = receipt.items.all()
-        first_info = receipt_infos.first()
-
-        ws.append([f"영수증 {idx}"])
-        ws.append(["상호명", first_info.store_name if first_info else "정보 없음"])
-        ws.append(["업로드일", receipt.upload_time.strftime('%Y-%m-%d %H:%M:%S')])
-        ws.append([])
-
-        headers = ["메뉴명", "수량", "단가", "총액"]
-        if settlement.method == "item":
-            headers.append("참여자")
-        ws.append(headers)
-
-        for info in receipt_infos:
-            row_data = [info.item_name, info.quantity, info.unit_price, info.total_amount]
-            if settlement.method == "item":
-                participants_list = []
-                current = next(
-                    (r for r in item_assignments_list if r.get('receipt_id') == receipt.id),
-                    None
-                )
-                if current and current.get('items'):
-                    for a in current['items']:
-                        if a.get('item_name').strip() == info.item_name.strip():
-                            participants_list = a.get('participants', [])
-                            break
-                row_data.append(', '.join(participants_list))
-            ws.append(row_data)
-
-        ws.append([])
-        total = sum(info.total_amount for info in receipt_infos)
-        ws.append(["총 결제금액", total])
-        ws.append([])
-
-    overall_total_settlement = sum(settlement.result.values())
-    ws.append(["전체 정산 총액", overall_total_settlement])
-    ws.append(["정산 방식", "1/N 정산" if settlement.method == "equal" else "항목별 정산"])
-    ws.append([])
-
-    ws.append(["정산 결과"])
-    ws.append(["참여자", "정산 금액"])
-    for name, amount in settlement.result.items():
-        ws.append([name, amount])
-
-    response = HttpResponse(
+    # write-only 워크북을 임시 파일에 만든 뒤 청크 단위로 전송
+    file = tempfile.TemporaryFile()
+    try:
+        write_settlement_excel(settlement, file)
+    except Exception:
+        file.close()
+        raise
+    file.seek(0)
+
+    response = StreamingHttpResponse(
+        _iter_file(file),
         content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
     )
     filename = f"settlement_{settlement_id}.xlsx"
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
-    wb.save(response)
-    return response
\ No newline at end of file
+    return response
+
+def export_settlement_csv(request, settlement_id):
+    settlement = Settlement.objects.get(id=settlement_id)
+
+    # 엑셀과 같은 행을 조회하는 대로 바로 전송
+    response = StreamingHttpResponse(iter_settlement_csv(settlement), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="settlement_{settlement_id}.csv"'
+    return response
+
+def export_settlement_ndjson(request, settlement_id):
+    settlement = Settlement.objects.get(id=settlement_id)
+
+    # 영수증/품목/합계/정산 결과를 한 줄에 하나씩 JSON 레코드로 전송
+    response = StreamingHttpResponse(iter_settlement_ndjson(settlement), content_type='application/x-ndjson')
+    response['Content-Disposition'] = f'attachment; filename="settlement_{settlement_id}.ndjson"'
+    return response
@@ -0,0 +1,65 @@
+"""
+일괄 유사도 계산(BatchScorer) 벤치마크
+
+후보마다 jamo_similarity를 호출하는 기존 방식(linear_best_match)과
+질의 하나를 후보 전체와 한 번에 비교하는 방식(best_match),
+영수증 한 장의 단어 전체를 후보 전체와 행렬로 비교하는 방식(best_matches)의
+단어당 처리 시간을 후보 수별로 비교하고, 결과가 같은지 확인합니다.
+
+실행 (backend 폴더에서):
+    python benchmarks/bench_batch_scorer.py
+    python benchmarks/bench_batch_scorer.py --sizes 50 500 --tokens 200
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.ocr_pipeline.jamo_index import BatchScorer, DictEntry, linear_best_match
+from api.ocr_pipeline.process_text import decompose_hangul
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 50, 100, 500, 2000])
+    parser.add_argument('--tokens', type=int, default=100, help='영수증 한 장의 보정 대상 단어 수')
+    parser.add_argument('--threshold', type=float, default=0.7)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    syllables = [chr(0xAC00 + rng.randrange(11172)) for _ in range(500)]
+
+    def random_word():
+        return ''.join(rng.choice(syllables) for _ in range(rng.randint(2, 8)))
+
+    print(f"단어 {args.tokens}개, 기준 유사도 {args.threshold}")
+    for size in args.sizes:
+        entries = [DictEntry(word, decompose_hangul(word), len(word)) for word in (random_word() for _ in range(size))]
+        scorer = BatchScorer(entries)
+        tokens = [random_word() for _ in range(args.tokens)]
+        jamos = [decompose_hangul(token) for token in tokens]
+        pairs = list(zip(tokens, jamos))
+
+        linear_elapsed, expected = timed(lambda: [linear_best_match(entries, t, j, args.threshold) for t, j in pairs])
+        single_elapsed, single = timed(lambda: [scorer.best_match(t, j, args.threshold) for t, j in pairs])
+        matrix_elapsed, matrix = timed(lambda: scorer.best_matches(tokens, jamos, args.threshold))
+
+        per_token = lambda elapsed: elapsed / len(tokens) * 1e6
+        print(f"후보 {size:>5}개: 후보별 {per_token(linear_elapsed):8.1f} us, "
+              f"질의별 일괄 {per_token(single_elapsed):8.1f} us, "
+              f"행렬 {per_token(matrix_elapsed):8.1f} us/단어, "
+              f"결과 일치: {expected == single == matrix}")
+
+
+if __name__ == '__main__':
+    main()
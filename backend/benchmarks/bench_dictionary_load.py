@@ -0,0 +1,106 @@
+"""
+사전 로딩(원본 파싱 vs 컴파일 결과 메모리 맵) 벤치마크
+
+임의의 단어로 만든 텍스트 사전과 가게 → 메뉴 JSON 사전을
+원본 파일을 읽어 자모 분해/색인을 새로 만드는 기존 방식과
+build_dictionary로 컴파일한 결과를 메모리 맵으로 여는 방식으로 각각 로딩해
+로딩 시간과 파이썬 힙 사용량(tracemalloc 최대치)을 비교하고, 두 방식의 검색 결과가 같은지 확인합니다.
+
+실행 (backend 폴더에서):
+    python benchmarks/bench_dictionary_load.py
+    python benchmarks/bench_dictionary_load.py --words 100000 --stores 10000 --queries 200
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.ocr_pipeline.compiled_dictionary import compile_dictionary, load_compiled
+from api.ocr_pipeline.process_text import TextPostProcessor
+
+
+def make_words(rng, syllables, count):
+    return [''.join(rng.choice(syllables) for _ in range(rng.randint(2, 10))) for _ in range(count)]
+
+
+def measure(load):
+    # 시간과 힙 사용량은 따로 측정 (tracemalloc이 할당마다 비용을 더함)
+    started = time.perf_counter()
+    processor = load()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    load()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return processor, elapsed, peak
+
+
+def lookups(processor, queries, store_names):
+    started = time.perf_counter()
+    results = []
+    for query in queries:
+        if processor.store_item_path:
+            store_name = processor.find_best_store_match(query)[0]
+            results.append(store_name)
+            for name in store_names:
+                results.append(processor.find_best_item_prefix_match(query.split(), name))
+        else:
+            results.append(processor.find_closest_word(query))
+    return time.perf_counter() - started, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--words', type=int, default=100000)
+    parser.add_argument('--stores', type=int, default=10000)
+    parser.add_argument('--items-per-store', type=int, default=10)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    syllables = [chr(0xAC00 + rng.randrange(11172)) for _ in range(1000)]
+    words = make_words(rng, syllables, args.words)
+    stores = {
+        name: {"items": make_words(rng, syllables, args.items_per_store)}
+        for name in make_words(rng, syllables, args.stores)
+    }
+    queries = make_words(rng, syllables, args.queries)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        text_path = os.path.join(tmp, 'dictionary.txt')
+        with open(text_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(words))
+        json_path = os.path.join(tmp, 'dictionary_store_item.json')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({"stores": stores}, f, ensure_ascii=False)
+
+        for label, path in [(f"텍스트 사전 {len(words)}단어", text_path),
+                            (f"가게 {len(stores)}곳 × 메뉴 {args.items_per_store}개", json_path)]:
+            started = time.perf_counter()
+            compile_dictionary(path)
+            build_elapsed = time.perf_counter() - started
+
+            parsed, parse_elapsed, parse_peak = measure(lambda: TextPostProcessor(path))
+            compiled, load_elapsed, load_peak = measure(lambda: TextPostProcessor(path, compiled=load_compiled(path)))
+            store_names = list(parsed.stores_dict)[:3]
+
+            parsed_lookup, parsed_results = lookups(parsed, queries, store_names)
+            compiled_lookup, compiled_results = lookups(compiled, queries, store_names)
+
+            print(f"{label} (컴파일 {build_elapsed:.2f} s)")
+            print(f"  원본 파싱 : 로딩 {parse_elapsed * 1000:8.1f} ms, 힙 최대 {parse_peak / 2**20:6.1f} MiB, "
+                  f"검색 {parsed_lookup / len(queries) * 1000:6.2f} ms/질의")
+            print(f"  메모리 맵 : 로딩 {load_elapsed * 1000:8.1f} ms, 힙 최대 {load_peak / 2**20:6.1f} MiB, "
+                  f"검색 {compiled_lookup / len(queries) * 1000:6.2f} ms/질의")
+            print(f"  결과 일치: {parsed_results == compiled_results}")
+
+
+if __name__ == '__main__':
+    main()
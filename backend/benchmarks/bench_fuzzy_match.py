@@ -0,0 +1,91 @@
+"""
+사전 유사 단어 검색(find_closest_word) 벤치마크
+
+비교할 때마다 질의와 사전 단어를 모두 자모 분해하는 기존 방식과
+사전 로딩 시 미리 분해해 둔 자모 레코드를 사용하는 방식의 초당 검색 수를 비교하고,
+두 방식의 검색 결과가 같은지 확인합니다.
+사전은 실제 dictionary.txt 단어에 임의의 한글 단어를 더해 원하는 크기로 만듭니다.
+
+실행 (backend 폴더에서):
+    python benchmarks/bench_fuzzy_match.py
+    python benchmarks/bench_fuzzy_match.py --size 5000 --queries 500
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.ocr_pipeline.analyze import DICT_PATH
+from api.ocr_pipeline.process_text import TextPostProcessor
+
+
+def random_word(rng):
+    return ''.join(chr(0xAC00 + rng.randrange(11172)) for _ in range(rng.randint(2, 8)))
+
+
+def mutate(rng, word):
+    # OCR 오인식처럼 글자 하나를 임의의 한글로 바꿈
+    chars = list(word)
+    chars[rng.randrange(len(chars))] = chr(0xAC00 + rng.randrange(11172))
+    return ''.join(chars)
+
+
+def legacy_closest_word(processor, word, threshold=0.70):
+    max_similarity = 0
+    best_match = None
+    for dict_word in processor.dictionary:
+        if abs(len(word) - len(dict_word)) > len(word) / 2:
+            continue
+        similarity = processor.calculate_jamo_similarity(word, dict_word)
+        if (similarity > max_similarity or
+            (similarity == max_similarity and len(dict_word) > len(best_match or ""))):
+            max_similarity = similarity
+            best_match = dict_word
+    if max_similarity >= threshold and max_similarity < 1:
+        return best_match
+    return None
+
+
+def bench(lookup, queries):
+    started = time.perf_counter()
+    results = [lookup(query) for query in queries]
+    return time.perf_counter() - started, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=2000)
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with open(DICT_PATH, encoding='utf-8') as f:
+        words = [line.strip() for line in f if line.strip()]
+    while len(words) < args.size:
+        words.append(random_word(rng))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'dictionary.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(words))
+        processor = TextPostProcessor(path)
+
+    queries = [mutate(rng, rng.choice(words)) for _ in range(args.queries)]
+
+    legacy_elapsed, legacy = bench(lambda q: legacy_closest_word(processor, q), queries)
+    indexed_elapsed, indexed = bench(processor.find_closest_word, queries)
+
+    print(f"사전 {len(words)}단어, 질의 {len(queries)}개")
+    print(f"매 비교 자모 분해 : {legacy_elapsed:7.3f} s ({len(queries) / legacy_elapsed:8.1f} 검색/s)")
+    print(f"미리 분해한 레코드: {indexed_elapsed:7.3f} s ({len(queries) / indexed_elapsed:8.1f} 검색/s)")
+    print(f"속도 향상: {legacy_elapsed / indexed_elapsed:.1f}x")
+    print(f"결과 일치: {legacy == indexed}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+사전 후보 색인(JamoIndex) 규모별 벤치마크
+
+사전 크기(기본 1천/1만/10만 단어)별로 전체 사전을 순서대로 비교하는 선형 탐색과
+길이 버킷 + 자모 색인으로 후보를 줄이는 방식의 검색 시간을 비교하고,
+두 방식의 결과가 같은지 확인합니다.
+사전은 실제 가게/메뉴 이름처럼 자주 쓰이는 음절로 만든 임의의 단어이며,
+질의는 사전 단어의 글자 하나를 바꾼 OCR 오인식 단어와 임의의 단어를 섞어 사용합니다.
+
+실행 (backend 폴더에서):
+    python benchmarks/bench_jamo_index.py
+    python benchmarks/bench_jamo_index.py --sizes 1000 10000 --queries 200 --threshold 0.4
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.ocr_pipeline.jamo_index import DictEntry, JamoIndex
+from api.ocr_pipeline.process_text import decompose_hangul
+
+
+def make_words(rng, syllables, count):
+    return [''.join(rng.choice(syllables) for _ in range(rng.randint(2, 10))) for _ in range(count)]
+
+
+def make_queries(rng, syllables, words, count):
+    queries = []
+    for i in range(count):
+        if i % 4 == 3:
+            queries.extend(make_words(rng, syllables, 1))
+            continue
+        chars = list(rng.choice(words))
+        chars[rng.randrange(len(chars))] = rng.choice(syllables)
+        queries.append(''.join(chars))
+    return queries
+
+
+def bench(index, queries, threshold):
+    jamos = [decompose_hangul(query) for query in queries]
+    started = time.perf_counter()
+    results = [index.best_match(query, jamo, threshold) for query, jamo in zip(queries, jamos)]
+    return time.perf_counter() - started, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--threshold', type=float, default=0.7)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    # 자주 쓰이는 음절 1,000개 (실제 사전처럼 자모가 많이 겹치도록)
+    syllables = [chr(0xAC00 + rng.randrange(11172)) for _ in range(1000)]
+
+    print(f"질의 {args.queries}개, 기준 유사도 {args.threshold}")
+    for size in args.sizes:
+        words = make_words(rng, syllables, size)
+        entries = [DictEntry(word, decompose_hangul(word), len(word)) for word in words]
+        queries = make_queries(rng, syllables, words, args.queries)
+
+        started = time.perf_counter()
+        indexed = JamoIndex(entries, min_entries=0)
+        build_elapsed = time.perf_counter() - started
+        linear = JamoIndex(entries, min_entries=len(entries) + 1)
+
+        linear_elapsed, linear_results = bench(linear, queries, args.threshold)
+        indexed_elapsed, indexed_results = bench(indexed, queries, args.threshold)
+
+        print(f"사전 {size:>7}단어: 선형 {linear_elapsed / len(queries) * 1000:8.2f} ms/검색, "
+              f"색인 {indexed_elapsed / len(queries) * 1000:8.2f} ms/검색 "
+              f"(색인 생성 {build_elapsed:6.2f} s), "
+              f"속도 향상 {linear_elapsed / indexed_elapsed:5.1f}x, "
+              f"결과 일치: {linear_results == indexed_results}")
+
+
+if __name__ == '__main__':
+    main()
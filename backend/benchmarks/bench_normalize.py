@@ -0,0 +1,116 @@
+"""
+줄 단위 텍스트 정규화(normalize_number, clean_text) 벤치마크
+
+줄마다 re.sub를 순서대로 적용하던 기존 방식과
+글자 치환(translate) + 미리 컴파일한 패턴 + 해당 문자가 있을 때만 패턴을 적용하는 방식의
+줄당 처리 시간을 비교하고, 두 방식의 결과가 같은지 확인합니다.
+사전 보정(find_closest_word)은 두 방식에 공통이므로 측정에서 제외합니다.
+
+실행 (backend 폴더에서):
+    python benchmarks/bench_normalize.py
+    python benchmarks/bench_normalize.py --lines 20000 --repeat 5
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.ocr_pipeline.process_text import TextPostProcessor
+
+
+def legacy_normalize_number(text):
+    if not text:
+        return text
+    text = re.sub(r'(\d*)O(\d*)', r'\g<1>0\g<2>', text)
+    text = re.sub(r'(\d+)O\b', r'\g<1>0', text)
+    text = re.sub(r'\bO(\d+)', r'0\g<1>', text)
+    text = re.sub(r'(\d*[,\.])O(\d*)', r'\g<1>0\g<2>', text)
+    text = re.sub(r'(\d*)U(\d*)', r'\g<1>0\g<2>', text)
+    text = re.sub(r'(\d*)E(\d*)', r'\g<1>0\g<2>', text)
+    text = re.sub(r'(\d+)E\b', r'\g<1>0', text)
+    text = re.sub(r'\bE(\d+)', r'0\g<1>', text)
+    text = re.sub(r'(\d*[,\.])E(\d*)', r'\g<1>0\g<2>', text)
+    text = re.sub(r'(\d*)\((\d*)', r'\1\2', text)
+    text = re.sub(r'(\d*)\)(\d*)', r'\1\2', text)
+    text = re.sub(r'(\d+)\s*,\s*(\d+)', r'\1,\2', text)
+    text = re.sub(r'(\d+)\s*\.\s*(\d+)', r'\1.\2', text)
+    text = re.sub(r'(\d{1,3})\.(\d{3})(?!\d)', r'\1,\2', text)
+    def handle_number_spacing(match):
+        num1 = match.group(1)
+        num2 = match.group(2)
+        if len(num1) < 3 and len(num2) == 3:
+            return f"{num1},{num2}"
+        elif len(num1) == 3 and len(num2) == 3:
+            if num2 == "000":
+                return f"{num1},{num2}"
+            else:
+                return f"{num1} {num2}"
+        else:
+            return f"{num1},{num2}"
+    text = re.sub(r'(\d{1,3})\s+(\d{3})(?!\d)', handle_number_spacing, text)
+    return text
+
+
+def legacy_clean_text(text):
+    if not text:
+        return text
+    text = re.sub(r'\s+', ' ', text).strip()
+    text = re.sub(r'(\d+)l(\d+)', r'\g<1>1\g<2>', text)
+    text = re.sub(r'(\d+)I(\d+)', r'\g<1>1\g<2>', text)
+    text = re.sub(r';', ':', text)
+    text = re.sub(r'([^\s]):([^\s])', r'\1 : \2', text)
+    text = re.sub(r'([^\s]):', r'\1 :', text)
+    text = re.sub(r':([^\s])', r': \1', text)
+    return ' '.join(text.split())
+
+
+def make_lines(rng, count):
+    names = ["콘치즈솥밥", "ICE 카페라떼", "야채김밥", "삼겹김치", "COOP SKET", "아메리카노(R)"]
+    templates = [
+        lambda: f"{rng.choice(names)} {rng.randint(1, 30)},{rng.choice(['000', '5OO', '500'])} {rng.randint(1, 5)} {rng.randint(1, 90)} 000",
+        lambda: f"합계 : {rng.randint(1, 200)}.{rng.randint(0, 999):03d}",
+        lambda: f"승인번호;{rng.randint(10000000, 99999999)}",
+        lambda: f"TEL: 02-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+        lambda: rng.choice(["동국대학교 소비자생활협동조합", "감사합니다", "카드 결제", "부가세 포함"]),
+    ]
+    return [rng.choice(templates)() for _ in range(count)]
+
+
+def bench(func, lines, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = [func(line) for line in lines]
+        timings.append(time.perf_counter() - started)
+    return min(timings), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    lines = make_lines(random.Random(args.seed), args.lines)
+    # 사전 보정을 제외하기 위해 빈 사전 사용
+    processor = TextPostProcessor(os.devnull)
+
+    legacy_elapsed, legacy = bench(lambda line: legacy_normalize_number(legacy_clean_text(line)), lines, args.repeat)
+    compiled_elapsed, compiled = bench(
+        lambda line: processor.normalize_number(processor.clean_text(line)), lines, args.repeat
+    )
+
+    print(f"{len(lines)}줄, {args.repeat}회 중 최소")
+    print(f"re.sub 순차 적용  : {legacy_elapsed / len(lines) * 1e6:6.2f} us/줄")
+    print(f"컴파일된 정규화기 : {compiled_elapsed / len(lines) * 1e6:6.2f} us/줄")
+    print(f"속도 향상: {legacy_elapsed / compiled_elapsed:.1f}x")
+    print(f"결과 일치: {legacy == compiled}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+OCR 일괄 인식(ocr_images_from_memory) 벤치마크
+
+이미지마다 readtext를 호출하는 기존 방식(ocr_image_from_memory)과
+여러 영수증의 글자 영역을 모아 배치로 인식하는 방식의 처리량을 비교하고,
+두 방식의 줄 단위 결과가 같은지 확인합니다. EasyOCR 모델이 필요합니다.
+
+실행 (backend 폴더에서):
+    python benchmarks/bench_ocr_batch.py
+    python benchmarks/bench_ocr_batch.py --images 8 --batch-size 64
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.ocr_pipeline.image_to_text import (
+    DEFAULT_BATCH_SIZE, ocr_image_from_memory, ocr_images_from_memory, warm_reader
+)
+
+
+def make_binarized_receipt(seed, lines=30):
+    rng = np.random.default_rng(seed)
+    img = np.full((60 + lines * 40, 900), 255, dtype=np.uint8)
+    for i in range(lines):
+        price = int(rng.integers(1, 30)) * 500
+        qty = int(rng.integers(1, 4))
+        text = f"ITEM{i:02d} {price:,} {qty} {price * qty:,}"
+        cv2.putText(img, text, (30, 60 + i * 40), cv2.FONT_HERSHEY_SIMPLEX, 0.9, 0, 2)
+    return img
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--images', type=int, default=8)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    images = [make_binarized_receipt(seed) for seed in range(args.images)]
+    warm_reader()
+
+    started = time.perf_counter()
+    single = [ocr_image_from_memory(img) for img in images]
+    single_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batched = ocr_images_from_memory(images, batch_size=args.batch_size)
+    batched_elapsed = time.perf_counter() - started
+
+    print(f"영수증 {args.images}장, 인식 배치 크기 {args.batch_size}")
+    print(f"이미지별 readtext : {single_elapsed:7.2f} s ({args.images / single_elapsed:5.2f} 장/s)")
+    print(f"일괄 인식         : {batched_elapsed:7.2f} s ({args.images / batched_elapsed:5.2f} 장/s)")
+    print(f"속도 향상: {single_elapsed / batched_elapsed:.1f}x")
+    print(f"결과 일치: {single == batched}")
+
+
+if __name__ == '__main__':
+    main()
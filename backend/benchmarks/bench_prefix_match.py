@@ -0,0 +1,79 @@
+"""
+메뉴 누적 구문 매칭(find_best_item_prefix_match) 벤치마크
+
+한 줄의 누적 구문(첫 단어, 첫 두 단어, ...)마다 메뉴 전체를 비교하던 기존 방식과
+비트 병렬 LCS로 모든 누적 구문을 한 번에 비교하는 PrefixMatcher의 줄당 처리 시간을
+메뉴 크기별로 비교하고, 두 방식의 결과가 같은지 확인합니다.
+(실제 분석에서는 일괄 비교가 유리한 메뉴 크기 구간에서만 PrefixMatcher의 일괄 비교를 사용)
+
+실행 (backend 폴더에서):
+    python benchmarks/bench_prefix_match.py
+    python benchmarks/bench_prefix_match.py --sizes 10 100 1000 --lines 500
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.ocr_pipeline.jamo_index import DictEntry, JamoIndex, PrefixMatcher
+from api.ocr_pipeline.process_text import decompose_hangul
+
+
+def make_lines(rng, syllables, items, count):
+    lines = []
+    for _ in range(count):
+        chars = list(rng.choice(items))
+        chars[rng.randrange(len(chars))] = rng.choice(syllables)
+        words = ''.join(chars).split() + [rng.choice(syllables) * rng.randint(1, 3)]
+        lines.append(words)
+    return lines
+
+
+def per_prefix_match(index, words, threshold=0.4):
+    best_match, best_score, best_end_index = None, 0, -1
+    for k in range(len(words)):
+        phrase = " ".join(words[:k + 1])
+        match, score = index.best_match(phrase, decompose_hangul(phrase), threshold)
+        if match and score > best_score:
+            best_match, best_score, best_end_index = match, score, k
+    return best_match, best_score, best_end_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--lines', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    syllables = [chr(0xAC00 + rng.randrange(11172)) for _ in range(500)]
+
+    for size in args.sizes:
+        items = [
+            ' '.join(''.join(rng.choice(syllables) for _ in range(rng.randint(2, 5))) for _ in range(rng.randint(1, 3)))
+            for _ in range(size)
+        ]
+        entries = [DictEntry(item, decompose_hangul(item), len(item)) for item in items]
+        index = JamoIndex(entries)
+        matcher = PrefixMatcher(index, min_entries=0, max_entries=size + 1)
+        lines = make_lines(rng, syllables, items, args.lines)
+
+        started = time.perf_counter()
+        expected = [per_prefix_match(index, words) for words in lines]
+        per_prefix_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        actual = [matcher.best_prefix_match(words, [decompose_hangul(w) for w in words], 0.4) for words in lines]
+        matcher_elapsed = time.perf_counter() - started
+
+        print(f"메뉴 {size:>6}개: 누적 구문별 비교 {per_prefix_elapsed / len(lines) * 1e6:9.1f} us/줄, "
+              f"PrefixMatcher {matcher_elapsed / len(lines) * 1e6:9.1f} us/줄, "
+              f"속도 향상 {per_prefix_elapsed / matcher_elapsed:5.1f}x, 결과 일치: {expected == actual}")
+
+
+if __name__ == '__main__':
+    main()
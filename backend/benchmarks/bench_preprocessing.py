@@ -0,0 +1,74 @@
+"""
+영수증 전처리(detect_and_crop_mask) 벤치마크
+
+원본 해상도 검출과 축소 이미지(피라미드) 검출의 이미지당 처리 시간을 비교합니다.
+합성 영수증 사진(밝은 배경 위의 기울어진 영수증 + 텍스트 줄)을 사용합니다.
+
+실행 (backend 폴더에서):
+    python benchmarks/bench_preprocessing.py
+    python benchmarks/bench_preprocessing.py --width 4000 --height 3000 --repeat 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.ocr_pipeline.preprocessing import DETECT_WIDTH, detect_and_crop_mask
+
+
+def make_receipt_photo(width, height):
+    img = np.full((height, width, 3), 245, dtype=np.uint8)
+    corners = np.array([
+        [width * 0.10, height * 0.04],
+        [width * 0.88, height * 0.08],
+        [width * 0.92, height * 0.96],
+        [width * 0.06, height * 0.93],
+    ], dtype=np.int32)
+    cv2.fillConvexPoly(img, corners, (150, 150, 150))
+    for i in range(40):
+        y = int(height * (0.12 + i * 0.02))
+        x = int(width * 0.15)
+        cv2.putText(img, f"ITEM {i:02d}   3,000   1   3,000", (x, y),
+                    cv2.FONT_HERSHEY_SIMPLEX, width / 3000, (20, 20, 20), max(1, width // 1500))
+    return img
+
+
+def bench(path, detect_width, repeat):
+    timings = []
+    cropped = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        cropped, _ = detect_and_crop_mask(path, detect_width=detect_width)
+        timings.append(time.perf_counter() - started)
+    return min(timings), sum(timings) / len(timings), cropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--width', type=int, default=4000)
+    parser.add_argument('--height', type=int, default=3000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--detect-width', type=int, default=DETECT_WIDTH)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'receipt.jpg')
+        cv2.imwrite(path, make_receipt_photo(args.width, args.height))
+
+        full_best, full_avg, full_crop = bench(path, None, args.repeat)
+        pyr_best, pyr_avg, pyr_crop = bench(path, args.detect_width, args.repeat)
+
+    print(f"이미지 크기: {args.width}x{args.height}, 반복: {args.repeat}회")
+    print(f"원본 해상도 검출     : 최소 {full_best * 1000:8.1f} ms, 평균 {full_avg * 1000:8.1f} ms, 크롭 {full_crop.shape[1]}x{full_crop.shape[0]}")
+    print(f"축소 검출 (w={args.detect_width:<5}): 최소 {pyr_best * 1000:8.1f} ms, 평균 {pyr_avg * 1000:8.1f} ms, 크롭 {pyr_crop.shape[1]}x{pyr_crop.shape[0]}")
+    print(f"속도 향상: {full_avg / pyr_avg:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+자주 쓰는 조회의 색인 적용 전/후 실행 계획과 시간 벤치마크
+
+테스트 DB를 새로 만들어 색인 추가 전(0009) 스키마로 되돌린 뒤 영수증/품목/참가자/정산 데이터를 채우고,
+다음 조회의 실행 계획(EXPLAIN)과 평균 시간을 기록합니다. 이어서 최신 마이그레이션(0010 색인 이후)을
+적용하고 같은 조회를 다시 측정합니다. 테스트 DB는 끝나면 삭제하므로 실제 데이터에는 영향이 없습니다.
+
+- 영수증별 품목 이름 조회: ReceiptInfo (receipt_id, item_name)
+- 참가자 이름 조회: Participant name__in (정산 저장 시 참가자 연결)
+- 최근 정산 목록: Settlement created_at 역순 상위 20개
+
+실행 (backend 폴더에서):
+    python benchmarks/bench_query_indexes.py
+    python benchmarks/bench_query_indexes.py --receipts 20000 --items-per-receipt 20 --settings config.settings
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BEFORE = '0009_dictionarychange'
+
+
+def seed(args, rng):
+    from django.utils import timezone
+    from api.models import Participant, Receipt, ReceiptInfo, Settlement
+
+    Receipt.objects.bulk_create(
+        [Receipt(file_name=f"r{i}.jpg", image_path=f"receipts/r{i}.jpg") for i in range(args.receipts)],
+        batch_size=5000,
+    )
+    receipt_ids = list(Receipt.objects.values_list('id', flat=True))
+
+    rows = []
+    for receipt_id in receipt_ids:
+        for i in range(args.items_per_receipt):
+            price = rng.randrange(1000, 30000, 100)
+            rows.append(ReceiptInfo(receipt_id=receipt_id, store_name="상호", item_name=f"메뉴{rng.randrange(500)}",
+                                    quantity=1, unit_price=price, total_amount=price))
+        if len(rows) >= 50000:
+            ReceiptInfo.objects.bulk_create(rows, batch_size=5000)
+            rows = []
+    ReceiptInfo.objects.bulk_create(rows, batch_size=5000)
+
+    Participant.objects.bulk_create([Participant(name=f"참가자{i}") for i in range(args.participants)], batch_size=5000)
+
+    now = timezone.now()
+    Settlement.objects.bulk_create([
+        Settlement(result={}, method='equal', created_at=now - timedelta(minutes=rng.randrange(10 ** 6)))
+        for _ in range(args.settlements)
+    ], batch_size=5000)
+    return receipt_ids
+
+
+def queries(receipt_ids, args, rng):
+    from api.models import Participant, ReceiptInfo, Settlement
+
+    return [
+        ("영수증별 품목 이름 조회",
+         lambda: ReceiptInfo.objects.filter(
+             receipt_id=rng.choice(receipt_ids), item_name=f"메뉴{rng.randrange(500)}"
+         ).values_list('total_amount', flat=True)),
+        ("참가자 이름 조회",
+         lambda: Participant.objects.filter(
+             name__in=[f"참가자{rng.randrange(args.participants)}" for _ in range(10)]
+         ).values_list('id', flat=True)),
+        ("최근 정산 목록",
+         lambda: Settlement.objects.order_by('-created_at').values_list('id', 'created_at')[:20]),
+    ]
+
+
+def measure(label, receipt_ids, args, rng):
+    print(f"\n=== {label} ===")
+    for name, make in queries(receipt_ids, args, rng):
+        plan = make().explain()
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            list(make())
+        elapsed = (time.perf_counter() - started) / args.repeat
+        print(f"{name}: {elapsed * 1000:.3f} ms/조회")
+        for line in plan.splitlines():
+            print(f"    {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--receipts', type=int, default=10000)
+    parser.add_argument('--items-per-receipt', type=int, default=20)
+    parser.add_argument('--participants', type=int, default=10000)
+    parser.add_argument('--settlements', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--settings', default=os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings'))
+    args = parser.parse_args()
+
+    os.environ['DJANGO_SETTINGS_MODULE'] = args.settings
+    import django
+    django.setup()
+    from django.core.management import call_command
+    from django.db import connection
+
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        call_command('migrate', 'api', BEFORE, verbosity=0)
+        started = time.perf_counter()
+        receipt_ids = seed(args, random.Random(args.seed))
+        print(f"데이터 생성: 영수증 {args.receipts}장, 품목 {args.receipts * args.items_per_receipt}개, "
+              f"참가자 {args.participants}명, 정산 {args.settlements}건 ({time.perf_counter() - started:.1f} s)")
+
+        measure(f"색인 적용 전 ({BEFORE})", receipt_ids, args, random.Random(args.seed))
+
+        started = time.perf_counter()
+        call_command('migrate', 'api', verbosity=0)
+        print(f"\n마이그레이션 적용: {time.perf_counter() - started:.1f} s")
+
+        measure("색인 적용 후 (최신)", receipt_ids, args, random.Random(args.seed))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
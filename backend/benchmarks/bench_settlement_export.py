@@ -0,0 +1,172 @@
+"""
+정산 내보내기(엑셀/CSV/NDJSON) 벤치마크
+
+테스트 DB를 새로 만들어 영수증 여러 장에 걸친 품목 10,000개짜리 항목별 정산을 저장한 뒤,
+기존 방식(메모리 워크북 + 영수증/품목별 쿼리)과 write-only 엑셀, CSV, NDJSON 스트리밍 내보내기의
+생성 시간, 파이썬 힙 사용량(tracemalloc 최대치), 쿼리 수, 결과 크기를 비교합니다.
+테스트 DB는 끝나면 삭제하므로 실제 데이터에는 영향이 없습니다.
+
+실행 (backend 폴더에서):
+    python benchmarks/bench_settlement_export.py
+    python benchmarks/bench_settlement_export.py --items 10000 --receipts 20 --settings config.settings
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def legacy_export_excel(settlement):
+    # 기존 export_settlement_excel에서 로그 출력만 뺀 것
+    from openpyxl import Workbook
+
+    receipts = settlement.receipts.all()
+    item_assignments_list = json.loads(settlement.item_assignments_data) if settlement.item_assignments_data else []
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "정산 결과"
+    for idx, receipt in enumerate(receipts, start=1):
+        receipt_infos = receipt.items.all()
+        first_info = receipt_infos.first()
+        ws.append([f"영수증 {idx}"])
+        ws.append(["상호명", first_info.store_name if first_info else "정보 없음"])
+        ws.append(["업로드일", receipt.upload_time.strftime('%Y-%m-%d %H:%M:%S')])
+        ws.append([])
+        headers = ["메뉴명", "수량", "단가", "총액"]
+        if settlement.method == "item":
+            headers.append("참여자")
+        ws.append(headers)
+        for info in receipt_infos:
+            row_data = [info.item_name, info.quantity, info.unit_price, info.total_amount]
+            if settlement.method == "item":
+                participants_list = []
+                current = next((r for r in item_assignments_list if r.get('receipt_id') == receipt.id), None)
+                if current and current.get('items'):
+                    for a in current['items']:
+                        if a.get('item_name').strip() == info.item_name.strip():
+                            participants_list = a.get('participants', [])
+                            break
+                row_data.append(', '.join(participants_list))
+            ws.append(row_data)
+        ws.append([])
+        ws.append(["총 결제금액", sum(info.total_amount for info in receipt_infos)])
+        ws.append([])
+    ws.append(["전체 정산 총액", sum(settlement.result.values())])
+    ws.append(["정산 방식", "1/N 정산" if settlement.method == "equal" else "항목별 정산"])
+    ws.append([])
+    ws.append(["정산 결과"])
+    ws.append(["참여자", "정산 금액"])
+    for name, amount in settlement.result.items():
+        ws.append([name, amount])
+
+    output = BytesIO()
+    wb.save(output)
+    return len(output.getvalue())
+
+
+def excel_export(settlement):
+    from api.settlement import write_settlement_excel
+
+    with tempfile.TemporaryFile() as f:
+        write_settlement_excel(settlement, f)
+        return f.tell()
+
+
+def stream_export(iterate):
+    def run(settlement):
+        return sum(len(chunk) for chunk in iterate(settlement))
+    return run
+
+
+def seed(items, receipts, participants, rng):
+    from api.models import Participant, Receipt, ReceiptInfo, Settlement
+
+    names = [f"참가자{i}" for i in range(participants)]
+    Participant.objects.bulk_create([Participant(name=name) for name in names])
+    receipt_objs = [Receipt.objects.create(file_name=f"r{i}.jpg", image_path=f"receipts/r{i}.jpg") for i in range(receipts)]
+
+    rows = []
+    assignments = []
+    for r, receipt in enumerate(receipt_objs):
+        count = items // receipts + (1 if r < items % receipts else 0)
+        receipt_items = []
+        for i in range(count):
+            price = rng.randrange(1000, 30000, 100)
+            quantity = rng.randint(1, 3)
+            rows.append(ReceiptInfo(receipt=receipt, store_name=f"상호{r}", item_name=f"메뉴{i}",
+                                    quantity=quantity, unit_price=price, total_amount=price * quantity))
+            receipt_items.append({"item_name": f"메뉴{i}", "participants": rng.sample(names, rng.randint(1, len(names)))})
+        assignments.append({"receipt_id": receipt.id, "items": receipt_items})
+    ReceiptInfo.objects.bulk_create(rows, batch_size=1000)
+
+    settlement = Settlement.objects.create(
+        result={name: rng.randrange(10000, 1000000) for name in names},
+        method="item",
+        item_assignments_data=json.dumps(assignments, ensure_ascii=False),
+    )
+    settlement.receipts.set(receipt_objs)
+    return settlement
+
+
+def measure(export, settlement):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    # 시간과 힙 사용량은 따로 측정 (tracemalloc이 할당마다 비용을 더함)
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        size = export(settlement)
+        elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    export(settlement)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, len(queries), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=10000)
+    parser.add_argument('--receipts', type=int, default=20)
+    parser.add_argument('--participants', type=int, default=6)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--settings', default=os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings'))
+    args = parser.parse_args()
+
+    os.environ['DJANGO_SETTINGS_MODULE'] = args.settings
+    import django
+    django.setup()
+    from django.db import connection
+    from api.models import Settlement
+    from api.settlement import iter_settlement_csv, iter_settlement_ndjson
+
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        settlement = seed(args.items, args.receipts, args.participants, random.Random(args.seed))
+        settlement = Settlement.objects.get(id=settlement.id)
+        print(f"항목별 정산: 영수증 {args.receipts}장, 품목 {args.items}개, 참가자 {args.participants}명")
+
+        for label, export in [
+            ("기존 엑셀 (메모리 워크북)", legacy_export_excel),
+            ("엑셀 (write-only)", excel_export),
+            ("CSV 스트리밍", stream_export(iter_settlement_csv)),
+            ("NDJSON 스트리밍", stream_export(iter_settlement_ndjson)),
+        ]:
+            elapsed, peak, queries, size = measure(export, settlement)
+            print(f"  {elapsed * 1000:8.1f} ms, 힙 최대 {peak / 2**20:6.1f} MiB, "
+                  f"쿼리 {queries:4d}개, 크기 {size / 2**10:8.1f} KiB  {label}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
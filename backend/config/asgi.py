@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_asgi_application()
+
+# OCR_WARM_ON_BOOT 설정 시 요청을 받기 전에 OCR 모델 로드 (관리 명령에서는 로드하지 않음)
+from api.apps import warm_ocr_on_boot  # noqa: E402
+
+warm_ocr_on_boot()
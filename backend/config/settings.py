@@ -134,4 +134,27 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # CORS 설정
-CORS_ORIGIN_ALLOW_ALL = True  # 모든 도메인에서의 요청 허용
\ No newline at end of file
+CORS_ORIGIN_ALLOW_ALL = True  # 모든 도메인에서의 요청 허용
+
+# OCR 설정
+# True이면 서버 시작 시 EasyOCR 모델을 미리 로드 (기본값: 첫 OCR 요청 시 로드)
+OCR_WARM_ON_BOOT = config('OCR_WARM_ON_BOOT', default=False, cast=bool)
+# 여러 영수증을 동시에 분석할 워커 프로세스 수 (1이면 순차 처리)
+OCR_MAX_WORKERS = config('OCR_MAX_WORKERS', default=1, cast=int)
+# 글자 인식을 한 번에 묶어 처리할 영수증 수와 인식 배치 크기 (OCR_BATCH_SIZE=1이면 이미지별 readtext 사용)
+OCR_IMAGES_PER_BATCH = config('OCR_IMAGES_PER_BATCH', default=4, cast=int)
+OCR_BATCH_SIZE = config('OCR_BATCH_SIZE', default=32, cast=int)
+# 이미지 SHA-256 + 파이프라인 버전 기반 OCR 결과 캐시 (중복/재분석 시 OCR 생략)
+OCR_CACHE_ENABLED = config('OCR_CACHE_ENABLED', default=True, cast=bool)
+# 캐시 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목부터 삭제)
+OCR_CACHE_MAX_ENTRIES = config('OCR_CACHE_MAX_ENTRIES', default=1000, cast=int)
+# 분석 작업 진행 기록(heartbeat)이 이 시간(초) 넘게 없으면 워커가 죽은 것으로 보고 다른 워커가 다시 가져감
+ANALYZE_JOB_TIMEOUT = config('ANALYZE_JOB_TIMEOUT', default=600, cast=int)
+# 작업 실행 중 heartbeat_at을 갱신하는 간격(초, ANALYZE_JOB_TIMEOUT보다 충분히 짧게)
+ANALYZE_JOB_HEARTBEAT_INTERVAL = config('ANALYZE_JOB_HEARTBEAT_INTERVAL', default=30, cast=float)
+# 같은 작업을 가져갈 수 있는 최대 횟수 (넘으면 failed, 워커를 죽게 만드는 작업이 반복되지 않도록)
+ANALYZE_JOB_MAX_ATTEMPTS = config('ANALYZE_JOB_MAX_ATTEMPTS', default=3, cast=int)
+# 가게명을 찾을 때 확인할 영수증 앞쪽 줄 수 (0이면 영수증 전체, 사전에 없는 가게의 영수증에서 전체 줄을 비교하지 않도록 제한)
+OCR_STORE_HEADER_LINES = config('OCR_STORE_HEADER_LINES', default=10, cast=int) or None
+# 영수증 윤곽을 찾을 때 축소할 이미지의 가로 크기 (0이면 원본 해상도에서 검출, 크롭은 항상 원본 해상도)
+OCR_DETECT_WIDTH = config('OCR_DETECT_WIDTH', default=1000, cast=int) or None